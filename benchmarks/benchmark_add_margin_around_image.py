@@ -0,0 +1,99 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# benchmark_add_margin_around_image.py
+# 余白の付加について，従来の方向ごとに保存し直す方法と
+# 1回だけ保存する方法の1枚あたりの処理時間を比較する
+#
+# 実行例: python benchmarks/benchmark_add_margin_around_image.py
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from PIL import Image
+import os
+import sys
+import tempfile
+import time
+
+# リポジトリ直下のパッケージ(image_tools)を読み込めるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from benchmark_utils import make_test_image  # noqa: E402
+from image_tools.add_margin_around_image import add_margin_to_image  # noqa: E402
+
+# 白色のRGB
+white_rgb = (255, 255, 255)
+
+
+def add_margin_multipass(image_src, image_dst, margin, margin_size):
+    """add_margin_multipass 従来の方法(方向ごとに読み込み・保存し直す)で余白を付加する
+
+    Args:
+        image_src (str): 余白を付加したい画像ファイル
+        image_dst (str): 余白を付加した画像ファイル
+        margin (dict): 各方向(上下左右)に余白を付加するかどうか
+        margin_size (dict): 各方向(上下左右)の余白の大きさ
+    """
+    Image.open(image_src).copy().save(image_dst)
+    # 各方向について(元の画像を貼り付ける位置を求める関数)を定義
+    offsets = {
+        "top": lambda s: (0, s),
+        "bottom": lambda s: (0, 0),
+        "left": lambda s: (s, 0),
+        "right": lambda s: (0, 0),
+    }
+    for direction in ["top", "bottom", "left", "right"]:
+        if margin[direction] is True:
+            image_PIL = Image.open(image_dst)
+            s = margin_size[direction]
+            if direction in ["top", "bottom"]:
+                size = (image_PIL.width, image_PIL.height + s)
+            else:
+                size = (image_PIL.width + s, image_PIL.height)
+            canvas = Image.new('RGB', size, white_rgb)
+            canvas.paste(image_PIL, offsets[direction](s))
+            canvas.save(image_dst)
+
+
+def add_margin_singlepass(image_src, image_dst, margin, margin_size):
+    """add_margin_singlepass 新しい方法(1回だけ保存する)で余白を付加する
+
+    Args:
+        image_src (str): 余白を付加したい画像ファイル
+        image_dst (str): 余白を付加した画像ファイル
+        margin (dict): 各方向(上下左右)に余白を付加するかどうか
+        margin_size (dict): 各方向(上下左右)の余白の大きさ
+    """
+    image_PIL = Image.open(image_src)
+    add_margin_to_image(image_PIL, margin, margin_size).save(image_dst)
+
+
+def measure(func, image_src, image_dst, margin, margin_size, repeat):
+    """measure 1枚あたりの処理時間の最小値[s]を測定する"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(image_src, image_dst, margin, margin_size)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    repeat = 3
+    margin = {"top": True, "bottom": True, "left": True, "right": True}
+    margin_size = {"top": 10, "bottom": 10, "left": 10, "right": 10}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        image_src = os.path.join(tmpdir, "src.png")
+        make_test_image(image_src, size=(2704, 2255))
+        image_multi = os.path.join(tmpdir, "multi.png")
+        image_single = os.path.join(tmpdir, "single.png")
+        t_multi = measure(add_margin_multipass, image_src, image_multi,
+                          margin, margin_size, repeat)
+        t_single = measure(add_margin_singlepass, image_src, image_single,
+                           margin, margin_size, repeat)
+        # 両方の方法で同じ画像が得られることを確認
+        same = \
+            Image.open(image_multi).tobytes() == \
+            Image.open(image_single).tobytes()
+    print("multi-pass : {:.1f} ms/image".format(t_multi * 1000))
+    print("single-pass: {:.1f} ms/image".format(t_single * 1000))
+    print("speedup    : {:.2f}x".format(t_multi / t_single))
+    print("identical  :", same)
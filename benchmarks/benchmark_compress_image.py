@@ -0,0 +1,93 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# benchmark_compress_image.py
+# 画像の圧縮について，元の解像度でデコードしてから縮小する方法と
+# 縮小した解像度でデコードする方法(fast_decode)の処理時間と最大メモリ使用量を比較する
+# また，複数の大きさ(shrink=2, 4, 8, 16)を出力する場合について，大きさごとに圧縮し直す方法と
+# 1回だけデコードして1つ前の大きさから順に縮小する方法(ピラミッド)の処理時間を比較する
+#
+# 実行例: python benchmarks/benchmark_compress_image.py
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# リポジトリ直下のパッケージ(image_tools)を読み込めるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from benchmark_utils import make_test_image  # noqa: E402
+from benchmark_utils import peak_rss_mb  # noqa: E402
+from image_tools.compress_image import compress_one_image  # noqa: E402
+from image_tools.compress_image import \
+    compress_one_image_to_pyramid  # noqa: E402
+
+
+def run_child(image_src, image_dst, shrink, fast_decode):
+    """run_child 別のプロセスで1回だけ圧縮し，処理時間[s]と最大メモリ使用量[MB]を返す
+
+    注意点:
+        最大メモリ使用量はプロセス全体の値なので，条件ごとにプロセスを分ける
+    """
+    command = [sys.executable, __file__, "--child", image_src, image_dst,
+               str(shrink), str(fast_decode)]
+    output = subprocess.run(command, check=True, capture_output=True,
+                            text=True).stdout.split()
+    return float(output[0]), float(output[1])
+
+
+def time_pyramid(image_src, tmpdir, shrinks):
+    """time_pyramid 大きさごとに圧縮し直す場合とピラミッドの場合の処理時間[s]を返す"""
+    image_dsts = [os.path.join(tmpdir, "pyramid" + str(shrink)
+                               + os.path.splitext(image_src)[1])
+                  for shrink in shrinks]
+    start = time.perf_counter()
+    for shrink, image_dst in zip(shrinks, image_dsts):
+        compress_one_image(image_src, image_dst, shrink, 50)
+    t_separate = time.perf_counter() - start
+    start = time.perf_counter()
+    compress_one_image_to_pyramid(image_src, image_dsts, shrinks, 50)
+    t_pyramid = time.perf_counter() - start
+    return t_separate, t_pyramid
+
+
+if __name__ == "__main__":
+    # ------------------------------------------------------------------
+    # 子プロセスとして呼ばれた場合は1回だけ圧縮して結果を表示する
+    # ------------------------------------------------------------------
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        image_src, image_dst = sys.argv[2], sys.argv[3]
+        shrink, fast_decode = int(sys.argv[4]), sys.argv[5] == "True"
+        start = time.perf_counter()
+        compress_one_image(image_src, image_dst, shrink, 50, fast_decode)
+        elapsed = time.perf_counter() - start
+        print(elapsed, peak_rss_mb())
+        sys.exit(0)
+    # ------------------------------------------------------------------
+    # JPEGとPNGのそれぞれについて，fast_decodeの有無で比較する
+    # ------------------------------------------------------------------
+    shrink = 6
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for extension in ["jpg", "png"]:
+            image_src = os.path.join(tmpdir, "src." + extension)
+            make_test_image(image_src)
+            image_dst = os.path.join(tmpdir, "dst." + extension)
+            t_full, rss_full = run_child(image_src, image_dst, shrink, False)
+            t_fast, rss_fast = run_child(image_src, image_dst, shrink, True)
+            print("-" * 70)
+            print(extension + " (6000x4000, shrink=" + str(shrink) + ")")
+            print(" full decode: {:.1f} ms, {:.0f} MB".format(
+                t_full * 1000, rss_full))
+            print(" fast decode: {:.1f} ms, {:.0f} MB".format(
+                t_fast * 1000, rss_fast))
+            print(" speedup    : {:.2f}x".format(t_full / t_fast))
+            # 複数の大きさを出力する場合の比較
+            shrinks = [2, 4, 8, 16]
+            t_separate, t_pyramid = time_pyramid(image_src, tmpdir, shrinks)
+            print(" shrink=" + str(shrinks) + " separately: {:.1f} ms".format(
+                t_separate * 1000))
+            print(" shrink=" + str(shrinks) + " pyramid   : {:.1f} ms".format(
+                t_pyramid * 1000))
+            print(" speedup    : {:.2f}x".format(t_separate / t_pyramid))
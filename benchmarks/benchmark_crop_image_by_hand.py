@@ -0,0 +1,72 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# benchmark_crop_image_by_hand.py
+# 画像の切り抜きについて，画像全体をデコードしてから切り抜く方法と
+# 切り抜く領域を含む部分だけをデコードする方法(region_decode)の処理時間と最大メモリ使用量を比較する
+#
+# 実行例: python benchmarks/benchmark_crop_image_by_hand.py
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# リポジトリ直下のパッケージ(image_tools)を読み込めるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from benchmark_utils import make_test_image  # noqa: E402
+from benchmark_utils import peak_rss_mb  # noqa: E402
+from image_tools.crop_image_by_hand import crop_one_image  # noqa: E402
+
+
+def run_child(image_src, image_dst, image_area_rectangle, region_decode):
+    """run_child 別のプロセスで1回だけ切り抜き，処理時間[s]と最大メモリ使用量[MB]を返す
+
+    注意点:
+        最大メモリ使用量はプロセス全体の値なので，条件ごとにプロセスを分ける
+    """
+    command = [sys.executable, __file__, "--child", image_src, image_dst,
+               ",".join(str(x) for x in image_area_rectangle),
+               str(region_decode)]
+    output = subprocess.run(command, check=True, capture_output=True,
+                            text=True).stdout.split()
+    return float(output[0]), float(output[1])
+
+
+if __name__ == "__main__":
+    # ------------------------------------------------------------------
+    # 子プロセスとして呼ばれた場合は1回だけ切り抜いて結果を表示する
+    # ------------------------------------------------------------------
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        image_src, image_dst = sys.argv[2], sys.argv[3]
+        image_area_rectangle = tuple(int(x) for x in sys.argv[4].split(","))
+        region_decode = sys.argv[5] == "True"
+        start = time.perf_counter()
+        crop_one_image(image_src, image_dst, image_area_rectangle,
+                       region_decode)
+        elapsed = time.perf_counter() - start
+        print(elapsed, peak_rss_mb())
+        sys.exit(0)
+    # ------------------------------------------------------------------
+    # PNG，JPEG，TIFFのそれぞれについて，画像の上部の帯を切り抜く場合を比較する
+    # ------------------------------------------------------------------
+    image_area_rectangle = (1000, 200, 5000, 600)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for extension in ["png", "jpg", "tif"]:
+            image_src = os.path.join(tmpdir, "src." + extension)
+            make_test_image(image_src)
+            image_dst = os.path.join(tmpdir, "dst.bmp")
+            t_full, rss_full = run_child(image_src, image_dst,
+                                         image_area_rectangle, False)
+            t_region, rss_region = run_child(image_src, image_dst,
+                                             image_area_rectangle, True)
+            print("-" * 70)
+            print(extension + " (6000x4000, crop="
+                  + str(image_area_rectangle) + ")")
+            print(" full decode  : {:.1f} ms, {:.0f} MB".format(
+                t_full * 1000, rss_full))
+            print(" region decode: {:.1f} ms, {:.0f} MB".format(
+                t_region * 1000, rss_region))
+            print(" speedup      : {:.2f}x".format(t_full / t_region))
@@ -0,0 +1,123 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# benchmark_server.py
+# 1枚ずつの圧縮について，要求ごとにPythonを起動する方法と
+# 常駐するサーバー(image-tools serve)に要求を送る方法の1枚あたりの時間を比較する
+#
+# 実行例: python benchmarks/benchmark_server.py --requests 200 --clients 4
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# リポジトリ直下のパッケージ(image_tools)を読み込めるようにする
+repo_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, repo_root)
+from PIL import Image  # noqa: E402
+from image_tools.instrumentation import percentile  # noqa: E402
+from image_tools.server import ServerClient  # noqa: E402
+
+# 要求ごとにPythonを起動して1枚だけ圧縮するコード
+child_code = """
+import sys
+from image_tools.compress_image import compress_one_image
+compress_one_image(sys.argv[1], sys.argv[2], 2, 80)
+"""
+
+
+def run_subprocesses(image_src, image_dst, n):
+    """run_subprocesses 1枚ごとにPythonを起動して圧縮し，1枚あたりの時間[ms]のリストを返す"""
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", child_code, image_src,
+                        image_dst], cwd=repo_root, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run_clients(socket_path, image_src, image_dst, n, clients):
+    """run_clients clients本の接続から合計n件の圧縮を要求する
+
+    Returns:
+        tuple: (1件あたりの時間[ms]のリスト, busyで再送した回数, 全体の時間[s])
+    """
+    times, retries = [], []
+    lock = threading.Lock()
+
+    def client(count):
+        with ServerClient(socket_path) as c:
+            for _ in range(count):
+                start = time.perf_counter()
+                while True:
+                    response = c.call("compress", image_src, image_dst,
+                                      shrink=2, quality=80)
+                    if response.get("error") != "busy":
+                        break
+                    with lock:
+                        retries.append(1)
+                    time.sleep(0.001)
+                if response["ok"] is False:
+                    raise RuntimeError(response["error"])
+                with lock:
+                    times.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(n // clients,))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return times, len(retries), time.perf_counter() - start
+
+
+def print_row(name, times):
+    """print_row 1件あたりの時間の中央値とパーセンタイルを表示する"""
+    times = sorted(times)
+    print("{:24s}{:8d}{:10.2f}{:10.2f}{:10.2f}".format(
+        name, len(times), statistics.median(times), percentile(times, 90),
+        percentile(times, 99)))
+
+
+# ----------------------------------------------------------------------
+# 小さな画像の圧縮で，Pythonの起動を含む時間とサーバー経由の時間を比べる
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--subprocesses", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        image_src = os.path.join(tmpdir, "src.png")
+        Image.effect_noise((640, 480), 40).convert("RGB").save(image_src)
+        socket_path = os.path.join(tmpdir, "server.sock")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "image_tools", "serve", socket_path,
+             "-j", str(args.clients)], cwd=repo_root,
+            stdout=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(socket_path):
+                time.sleep(0.05)
+            print("{:24s}{:>8s}{:>10s}{:>10s}{:>10s}".format(
+                "method", "count", "p50[ms]", "p90[ms]", "p99[ms]"))
+            print_row("python per image", run_subprocesses(
+                image_src, os.path.join(tmpdir, "sub.jpg"),
+                args.subprocesses))
+            times, retries, elapsed = run_clients(
+                socket_path, image_src, os.path.join(tmpdir, "srv.jpg"),
+                args.requests, args.clients)
+            print_row("server", times)
+            print("server: {:.1f} images/s with {} clients ({} busy retries)"
+                  .format(len(times) / elapsed, args.clients, retries))
+        finally:
+            server.terminate()
+            server.wait()
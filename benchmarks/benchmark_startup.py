@@ -0,0 +1,87 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# benchmark_startup.py
+# image-toolsのサブコマンドの起動時間(インタプリタの起動とモジュールの読み込み)と，
+# 起動時に読み込まれる重いモジュール(PIL，cv2，numpy，img2pdfなど)を測る
+#
+# 実行例: python benchmarks/benchmark_startup.py --repeat 20
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# リポジトリ直下のパッケージ(image_tools)を読み込めるようにする
+repo_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# 測るコマンド(python -m image_tools に続く引数，空ならインタプリタだけ)
+startup_commands = [
+    [],
+    ["--help"],
+    ["size", "--help"],
+    ["compress", "--help"],
+    ["pdf", "--help"],
+    ["coordinate", "--help"],
+]
+
+# 起動時に読み込まれたかを調べる重いモジュール
+heavy_modules = ["PIL.Image", "cv2", "numpy", "img2pdf", "sqlite3",
+                 "concurrent.futures.process"]
+
+# 子プロセスでサブコマンドを実行し，読み込まれた重いモジュールを表示するコード
+child_code = """
+import contextlib, io, sys
+from image_tools.cli import main
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main(sys.argv[1:])
+    except (SystemExit, ImportError):
+        pass
+print(" ".join(m for m in {heavy} if m in sys.modules))
+"""
+
+
+def time_command(args, repeat):
+    """time_command python -m image_tools argsをrepeat回実行し，処理時間[ms]のリストを返す"""
+    command = [sys.executable]
+    command += ["-c", "pass"] if len(args) == 0 \
+        else ["-m", "image_tools"] + args
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=repo_root, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def loaded_modules(args):
+    """loaded_modules サブコマンドの実行で読み込まれた重いモジュールの一覧を返す"""
+    if len(args) == 0:
+        return ""
+    output = subprocess.run(
+        [sys.executable, "-c", child_code.format(heavy=heavy_modules)] + args,
+        cwd=repo_root, capture_output=True, text=True).stdout
+    return output.strip()
+
+
+# ----------------------------------------------------------------------
+# 各サブコマンドの起動時間の中央値・最小値と，読み込まれた重いモジュールを表示する
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print("{:28s}{:>10s}{:>10s}  {}".format("command", "median", "min",
+                                            "heavy modules loaded"))
+    for command in startup_commands:
+        times = time_command(command, args.repeat)
+        name = "python -c pass" if len(command) == 0 \
+            else "image-tools " + " ".join(command)
+        print("{:28s}{:8.1f}ms{:8.1f}ms  {}".format(
+            name, statistics.median(times), min(times),
+            loaded_modules(command)))
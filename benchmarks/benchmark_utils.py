@@ -0,0 +1,43 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# benchmark_utils.py
+# 各ベンチマークで共通して使う関数(ベンチマーク用の画像の生成・最大メモリ使用量の取得)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from PIL import Image
+import resource
+import sys
+
+
+def make_test_image(path, size=(6000, 4000)):
+    """make_test_image カメラ画像を模したベンチマーク用の画像を生成する
+
+    Args:
+        path (str): 生成する画像ファイル(拡張子で画像形式を決める)
+        size (tuple, optional): 画像の幅と高さ，デフォルトは(6000, 4000).
+    """
+    noise = Image.effect_noise(size, 64).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+    Image.blend(noise, gradient, 0.5).save(path, quality=90)
+
+
+def peak_rss_mb():
+    """peak_rss_mb このプロセスの最大メモリ使用量[MB]を返す
+
+    注意点:
+        Linuxのru_maxrssはfork元のプロセスの値を引き継ぐことがあるため，
+        /proc/self/statusのVmHWMを優先して使う
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrssの単位はLinuxではKB，macOSではByte
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        maxrss = maxrss / 1024
+    return maxrss / 1024
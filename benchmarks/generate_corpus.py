@@ -0,0 +1,161 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# generate_corpus.py
+# ベンチマーク用の画像(コーパス)を，大きさ・画像形式・モードごとに乱数の種を固定して生成する
+# (同じ種なら毎回同じ画像になるため，結果をベースラインと比較できる)
+#
+# 実行例: python benchmarks/generate_corpus.py ./bench_corpus/ --sizes icon small
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from PIL import Image
+from PIL import ImageChops
+from PIL import ImageDraw
+import argparse
+import json
+import os
+import random
+
+# コーパスの大きさの名前と(画像の幅と高さ, 枚数)
+corpus_sizes = {
+    "icon": ((64, 64), 200),
+    "small": ((640, 480), 50),
+    "medium": ((1920, 1080), 10),
+    "large": ((6000, 4000), 3),
+    "huge": ((12000, 8400), 1),  # 約100MP，明示した場合だけ生成する
+}
+# 既定で生成する大きさ(hugeは時間とメモリを使うため含めない)
+default_sizes = ["icon", "small", "medium", "large"]
+# 生成する画像形式(拡張子)とモード
+corpus_formats = ["png", "jpg"]
+corpus_modes = ["RGB", "L", "RGBA"]
+
+
+def synthetic_image(size, mode, rng):
+    """synthetic_image 写真や書類を模した(圧縮のかかり方が現実に近い)画像を生成する
+
+    Args:
+        size (tuple): 画像の幅と高さ
+        mode (str): 画像のモード("RGB"，"L"，"RGBA")
+        rng (random.Random): 乱数の生成器(種を固定したもの)
+
+    Returns:
+        PIL.Image.Image: 生成した画像
+
+    注意点:
+        なめらかな濃淡(粗い乱数を拡大したもの)に細かい雑音と長方形(文字や図を模したもの)を重ねる
+        (Pillowと標準ライブラリだけで生成し，numpyは使わない)
+    """
+    width, height = size
+    # なめらかな濃淡: 粗い乱数の画像を拡大する
+    coarse = Image.frombytes("RGB", (8, 8), rng.randbytes(8 * 8 * 3))
+    image_PIL = coarse.resize(size, Image.BICUBIC)
+    # 細かい雑音: 0〜255の乱数を128±12に変換し，128を引いて各チャンネルに足す
+    noise = Image.frombytes("L", size, rng.randbytes(width * height))
+    noise = noise.point([116 + value * 25 // 256 for value in range(256)])
+    noise = Image.merge("RGB", (noise, noise, noise))
+    image_PIL = ImageChops.add(image_PIL, noise, 1.0, -128)
+    # 長方形(文字や図を模したもの)
+    draw = ImageDraw.Draw(image_PIL)
+    for _ in range(16):
+        x0, x1 = sorted(rng.randrange(width) for _ in range(2))
+        y0, y1 = sorted(rng.randrange(height) for _ in range(2))
+        draw.rectangle((x0, y0, x1, y1), fill=tuple(rng.randbytes(3)))
+    if mode == "RGBA":
+        alpha = Image.new("L", size, 255)
+        alpha.paste(0, (0, 0, width, height // 8))
+        image_PIL.putalpha(alpha)
+    elif mode != "RGB":
+        image_PIL = image_PIL.convert(mode)
+    return image_PIL
+
+
+def corpus_cases(sizes=None, formats=None, modes=None):
+    """corpus_cases 生成するコーパスの組み合わせ(大きさ, 画像形式, モード)を順に返す
+
+    注意点:
+        JPEGは透過(RGBA)を保存できないため，その組み合わせは除く
+    """
+    if sizes is None:
+        sizes = default_sizes
+    for size_name in sizes:
+        for extension in formats or corpus_formats:
+            for mode in modes or corpus_modes:
+                if extension == "jpg" and mode == "RGBA":
+                    continue
+                yield size_name, extension, mode
+
+
+def corpus_dir(outdir, size_name, extension, mode):
+    """corpus_dir 1つの組み合わせの画像を置くディレクトリ(例: outdir/small_png_RGB)"""
+    return os.path.join(outdir, size_name + "_" + extension + "_" + mode)
+
+
+def generate_corpus(outdir, sizes=None, formats=None, modes=None, seed=0,
+                    count=None):
+    """generate_corpus ベンチマーク用の画像を組み合わせごとのディレクトリに生成する
+
+    Args:
+        outdir (str): コーパスを置くディレクトリ
+        sizes (list, optional): 大きさの名前のリスト，デフォルトはNone(hugeを除く全て).
+        formats (list, optional): 拡張子のリスト，デフォルトはNone(pngとjpg).
+        modes (list, optional): モードのリスト，デフォルトはNone(RGB，L，RGBA).
+        seed (int, optional): 乱数の種，デフォルトは0.
+        count (int, optional): 1つの組み合わせあたりの枚数
+                               デフォルトはNone(大きさごとの既定の枚数).
+
+    Returns:
+        list: 生成した(または生成済みだった)ディレクトリのリスト
+
+    注意点:
+        同じ設定で生成済みのディレクトリ(corpus.jsonが一致するもの)は生成し直さない
+    """
+    dirs = []
+    for size_name, extension, mode in corpus_cases(sizes, formats, modes):
+        size, default_count = corpus_sizes[size_name]
+        n = default_count if count is None else count
+        case_dir = corpus_dir(outdir, size_name, extension, mode)
+        dirs.append(case_dir)
+        # 生成済みで設定が同じ場合は生成し直さない
+        spec = {"size": list(size), "count": n, "extension": extension,
+                "mode": mode, "seed": seed, "generator": "pillow"}
+        spec_path = os.path.join(case_dir, "corpus.json")
+        try:
+            with open(spec_path, "r", encoding="utf-8") as f:
+                if json.load(f) == spec:
+                    continue
+        except (OSError, ValueError):
+            pass
+        os.makedirs(case_dir, exist_ok=True)
+        # 組み合わせごとに種を分け，どの組み合わせを生成しても同じ画像になるようにする
+        case_seed = [seed, list(corpus_sizes).index(size_name),
+                     corpus_formats.index(extension), corpus_modes.index(mode)]
+        rng = random.Random(repr(case_seed))
+        for i in range(n):
+            image_PIL = synthetic_image(size, mode, rng)
+            image_PIL.save(os.path.join(case_dir, "%04d.%s" % (i, extension)),
+                           quality=90)
+        with open(spec_path, "w", encoding="utf-8") as f:
+            json.dump(spec, f)
+        print("Generate: ", case_dir + " (" + str(n) + " images)")
+    return dirs
+
+
+# ----------------------------------------------------------------------
+# ベンチマーク用の画像をoutdir/大きさ_拡張子_モード/に生成する
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("outdir", nargs="?", default="./bench_corpus/")
+    parser.add_argument("--sizes", nargs="+", default=None,
+                        choices=list(corpus_sizes))
+    parser.add_argument("--formats", nargs="+", default=None,
+                        choices=corpus_formats)
+    parser.add_argument("--modes", nargs="+", default=None,
+                        choices=corpus_modes)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=None,
+                        help="images per case (default depends on size)")
+    args = parser.parse_args()
+    generate_corpus(args.outdir, args.sizes, args.formats, args.modes,
+                    args.seed, args.count)
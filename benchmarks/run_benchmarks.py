@@ -0,0 +1,225 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# run_benchmarks.py
+# 生成したコーパスに対して各ツールを実行し，処理時間・スループット・最大メモリ使用量を測る
+# (ベースラインの結果と比較して，遅くなった・メモリが増えた組み合わせを報告する)
+#
+# 実行例: python benchmarks/run_benchmarks.py --sizes icon small \
+#             --output result.json
+#         python benchmarks/run_benchmarks.py --baseline baseline.json \
+#             --threshold 0.2
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import argparse
+import contextlib
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# リポジトリ直下のパッケージ(image_tools)を読み込めるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from benchmark_utils import peak_rss_mb  # noqa: E402
+from generate_corpus import corpus_cases  # noqa: E402
+from generate_corpus import corpus_dir  # noqa: E402
+from generate_corpus import generate_corpus  # noqa: E402
+
+# 測定するツールの名前(各ツールの実行方法はrun_toolに定義)
+benchmark_tools = ["compress_image", "crop_image_byhand",
+                   "add_margin_around_image", "convert_image2pdf",
+                   "make_montage", "combine_horizontally",
+                   "combine_vertically", "print_image_size"]
+
+
+def run_tool(tool, indir, outdir, extension, size, jobs):
+    """run_tool 1つのツールを1つのコーパスのディレクトリに対して実行する
+
+    Args:
+        tool (str): ツールの名前(benchmark_toolsのいずれか)
+        indir (str): コーパスのディレクトリ
+        outdir (str): 出力先のディレクトリ(一時ディレクトリ)
+        extension (str): コーパスの画像の拡張子
+        size (tuple): コーパスの画像の幅と高さ
+        jobs (int): 並列に動かすプロセス数
+    """
+    if tool == "compress_image":
+        from image_tools.compress_image import compress_image
+        compress_image(indir, outdir, 2, 50, extension, jobs=jobs)
+    elif tool == "crop_image_byhand":
+        from image_tools.crop_image_by_hand import crop_image_byhand
+        # 画像の中央の1/4(幅と高さがそれぞれ半分)の領域を切り抜く
+        width, height = size
+        pixel_coordinates = {"upper left x": width // 4,
+                             "upper left y": height // 4,
+                             "lower right x": width * 3 // 4,
+                             "lower right y": height * 3 // 4}
+        crop_image_byhand(indir, outdir, pixel_coordinates, extension,
+                          jobs=jobs)
+    elif tool == "add_margin_around_image":
+        from image_tools.add_margin_around_image import add_margin_around_image
+        add_margin_around_image(indir, outdir, extension=extension, jobs=jobs)
+    elif tool == "convert_image2pdf":
+        from image_tools.convert_image_to_pdf import convert_image2pdf
+        convert_image2pdf(indir, outdir, extension, jobs=jobs)
+    elif tool == "make_montage":
+        from image_tools.combine_2_images_into_1_image import make_montage
+        from image_tools.scan_images import scan_images
+        images = [os.path.join(indir, image)
+                  for image in scan_images(indir, extension)]
+        os.makedirs(outdir, exist_ok=True)
+        make_montage(images, os.path.join(outdir, "montage.png"),
+                     cols=math.ceil(math.sqrt(len(images))))
+    elif tool in ["combine_horizontally", "combine_vertically"]:
+        from image_tools import combine_2_images_into_1_image as combine
+        from image_tools.scan_images import scan_images
+        images = [os.path.join(indir, image)
+                  for image in scan_images(indir, extension)]
+        # 前から2枚ずつ組にして合体させる(枚数が奇数の場合，最後の1枚は使わない)
+        for i in range(0, len(images) - 1, 2):
+            getattr(combine, tool)(images[i], images[i + 1],
+                                   outdir + os.sep, "%04d.png" % i)
+    elif tool == "print_image_size":
+        from image_tools.print_image_size import print_image_size
+        print_image_size(indir, extension, jobs=jobs)
+    else:
+        raise ValueError("unknown tool: " + tool)
+
+
+def run_child(tool, indir, extension, size, jobs):
+    """run_child 別のプロセスで1回だけツールを実行し，処理時間[s]と最大メモリ使用量[MB]を返す
+
+    注意点:
+        最大メモリ使用量はプロセス全体の値なので，組み合わせごとにプロセスを分ける
+    """
+    command = [sys.executable, __file__, "--child", tool, indir, extension,
+               str(size[0]), str(size[1]), str(jobs)]
+    output = subprocess.run(command, check=True, capture_output=True,
+                            text=True).stdout.split()
+    return float(output[-2]), float(output[-1])
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """compare_with_baseline ベースラインより遅くなった・メモリが増えた組み合わせを返す
+
+    Args:
+        results (list): 今回の結果(run_benchmarksの戻り値)
+        baseline (list): ベースラインの結果(同じ形)
+        threshold (float): 許容する増加の割合(0.2なら20%まで)
+
+    Returns:
+        list: (ツール, コーパス, 指標, ベースラインの値, 今回の値)のリスト
+    """
+    base = {(r["tool"], r["corpus"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        reference = base.get((result["tool"], result["corpus"]))
+        if reference is None:
+            continue
+        for metric in ["seconds", "peak_rss_mb"]:
+            if result[metric] > reference[metric] * (1 + threshold):
+                regressions.append((result["tool"], result["corpus"], metric,
+                                    reference[metric], result[metric]))
+    return regressions
+
+
+def run_benchmarks(corpus_root, tools=None, sizes=None, formats=None,
+                   modes=None, jobs=1, repeat=1):
+    """run_benchmarks コーパスの組み合わせとツールの全ての組み合わせについて測定する
+
+    Args:
+        corpus_root (str): コーパスを置くディレクトリ(無ければ生成する)
+        tools (list, optional): 測定するツールの名前，デフォルトはNone(全て).
+        sizes (list, optional): コーパスの大きさの名前，デフォルトはNone(hugeを除く全て).
+        formats (list, optional): コーパスの拡張子，デフォルトはNone(pngとjpg).
+        modes (list, optional): コーパスのモード，デフォルトはNone(RGB，L，RGBA).
+        jobs (int, optional): 各ツールで並列に動かすプロセス数，デフォルトは1.
+        repeat (int, optional): 繰り返す回数(最も速かった回を使う)，デフォルトは1.
+
+    Returns:
+        list: 組み合わせごとの結果の辞書(ツール，コーパス，枚数，処理時間[s]，
+              枚数/s，メガピクセル/s，最大メモリ使用量[MB])のリスト
+    """
+    generate_corpus(corpus_root, sizes, formats, modes)
+    results = []
+    for size_name, extension, mode in corpus_cases(sizes, formats, modes):
+        indir = corpus_dir(corpus_root, size_name, extension, mode)
+        with open(os.path.join(indir, "corpus.json"), encoding="utf-8") as f:
+            spec = json.load(f)
+        count = spec["count"]
+        megapixels = spec["size"][0] * spec["size"][1] * count / 1e6
+        for tool in tools or benchmark_tools:
+            seconds, rss = min(run_child(tool, indir, extension,
+                                         spec["size"], jobs)
+                               for _ in range(repeat))
+            result = {"tool": tool, "corpus": os.path.basename(indir),
+                      "images": count, "seconds": seconds,
+                      "images_per_s": count / seconds,
+                      "megapixels_per_s": megapixels / seconds,
+                      "peak_rss_mb": rss}
+            results.append(result)
+            print("{:24s}{:20s}{:9.3f} s{:10.1f} img/s{:9.1f} MP/s"
+                  "{:8.0f} MB".format(tool, result["corpus"], seconds,
+                                      result["images_per_s"],
+                                      result["megapixels_per_s"], rss))
+    return results
+
+
+# ----------------------------------------------------------------------
+# コーパスを生成(生成済みなら再利用)し，各ツールの処理時間と最大メモリ使用量を測る
+# "--baseline jsonファイル"を付けると，ベースラインより悪化した組み合わせがあれば
+# 一覧を表示して終了コード1で終わる
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    # ------------------------------------------------------------------
+    # 子プロセスとして呼ばれた場合は1回だけツールを実行して結果を表示する
+    # ------------------------------------------------------------------
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        tool, indir, extension = sys.argv[2], sys.argv[3], sys.argv[4]
+        size = (int(sys.argv[5]), int(sys.argv[6]))
+        jobs = int(sys.argv[7])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outdir = os.path.join(tmpdir, "out")
+            # ツールの表示は測定の結果と混ざらないように捨てる
+            with open(os.devnull, "w") as devnull, \
+                    contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                run_tool(tool, indir, outdir, extension, size, jobs)
+                elapsed = time.perf_counter() - start
+        print(elapsed, peak_rss_mb())
+        sys.exit(0)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default="./bench_corpus/",
+                        help="corpus directory (generated if missing)")
+    parser.add_argument("--tools", nargs="+", default=None,
+                        choices=benchmark_tools)
+    parser.add_argument("--sizes", nargs="+", default=None)
+    parser.add_argument("--formats", nargs="+", default=None)
+    parser.add_argument("--modes", nargs="+", default=None)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", default=None,
+                        help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=None,
+                        help="compare against this JSON file of results")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed increase over the baseline (0.2: 20%%)")
+    args = parser.parse_args()
+    results = run_benchmarks(args.corpus, args.tools, args.sizes,
+                             args.formats, args.modes, args.jobs, args.repeat)
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        for tool, corpus, metric, before, after in regressions:
+            print("Regression: ", tool + " " + corpus + " " + metric +
+                  " {:.3f} --> {:.3f}".format(before, after))
+        if len(regressions) > 0:
+            sys.exit(1)
+        print("No regressions against " + args.baseline)
@@ -0,0 +1,50 @@
+# ======================================================================
+# image_tools
+# 画像の圧縮・切り抜き・余白の付加・pdfへの変換などを行うツール集
+#
+# 各ツールの関数は from image_tools.compress_image import compress_image のように読み込む
+# 主な関数は image_tools.run_pipeline のように属性としても参照できる(参照したときに初めて読み込む)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import importlib
+
+__version__ = "0.1.0"
+
+# 属性として参照できる関数と，その関数を定義しているモジュール
+# (モジュールと同じ名前の関数は，モジュールを読み込むと属性がモジュールで上書きされるため含めない)
+_lazy_attributes = {
+    "add_margin_to_image": "add_margin_around_image",
+    "compress_one_image": "compress_image",
+    "convert_image2pdf": "convert_image_to_pdf",
+    "combine_images2pdf": "convert_image_to_pdf",
+    "crop_image_byhand": "crop_image_by_hand",
+    "trim_image_automatically": "crop_image_by_hand",
+    "make_montage": "combine_2_images_into_1_image",
+    "combine_horizontally": "combine_2_images_into_1_image",
+    "combine_vertically": "combine_2_images_into_1_image",
+    "run_pipeline": "image_pipeline",
+    "index_image_size": "print_image_size",
+    "run_batch": "batch_executor",
+    "ResultCache": "result_cache",
+    "ServerClient": "server",
+}
+
+
+def __getattr__(name):
+    """__getattr__ 関数を初めて参照したときに，定義しているモジュールを読み込む
+
+    注意点:
+        import image_toolsだけではPillowなどを読み込まないため，起動が速い
+    """
+    if name not in _lazy_attributes:
+        raise AttributeError("module 'image_tools' has no attribute "
+                             + repr(name))
+    module = importlib.import_module("image_tools." + _lazy_attributes[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes))
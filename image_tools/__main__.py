@@ -0,0 +1,10 @@
+# ======================================================================
+# __main__.py
+# python -m image_tools サブコマンド で各ツールを実行する
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import sys
+from image_tools.cli import main
+
+sys.exit(main())
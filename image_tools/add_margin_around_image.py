@@ -0,0 +1,229 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# add_margin_around_image.py
+# 画像の周囲(上下左右)に余白を付加する
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+import argparse
+import os
+import sys
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.incremental_manifest import load_manifest
+from image_tools.incremental_manifest import save_manifest
+from image_tools.incremental_manifest import skip_up_to_date
+from image_tools.incremental_manifest import update_manifest
+from image_tools.instrumentation import open_image
+from image_tools.instrumentation import save_image
+from image_tools.instrumentation import trace_image
+from image_tools.instrumentation import trace_listing
+from image_tools.result_cache import print_cache_summary
+from image_tools.result_cache import with_cache
+from image_tools.scan_images import make_output_path
+from image_tools.scan_images import scan_images
+
+# 白色のRGB
+white_rgb = (255, 255, 255)
+# 黒色のRGB
+black_rgb = (0, 0, 0)
+
+
+def add_margin_to_image(image_PIL, margin, margin_size, color=white_rgb):
+    """add_margin_to_image 1枚の画像の周囲(上下左右)に余白を一度にまとめて付加する
+
+    Args:
+        image_PIL (PIL.Image.Image): 余白を付加したい画像
+        margin (dict): 各方向(上下左右)に余白を付加するかどうか
+        margin_size (dict): 各方向(上下左右)の余白の大きさ
+        color (tuple, optional): 余白の色，デフォルトは白色.
+
+    Returns:
+        PIL.Image.Image: 余白を付加した画像
+
+    注意点:
+        最終的なキャンバスの大きさを先に計算してから1回だけ確保し，
+        元の画像を1回だけ貼り付ける(方向ごとにキャンバスを作り直さない)
+    """
+    from PIL import Image
+    # 各方向に付加する余白の大きさを定義(付加しない方向は0)
+    size = {}
+    for direction in ["top", "bottom", "left", "right"]:
+        if margin[direction] is True:
+            size[direction] = margin_size[direction]
+        else:
+            size[direction] = 0
+    # どの方向にも余白を付加しない場合は元の画像をそのままコピーして返す
+    if sum(size.values()) == 0:
+        return image_PIL.copy()
+    # 余白付加後の幅と高さを定義
+    width = image_PIL.width + size["left"] + size["right"]
+    height = image_PIL.height + size["top"] + size["bottom"]
+    # 余白の色の画像に元の画像を貼り付けて，余白を付加した画像を生成
+    image_margin_combined = Image.new('RGB', (width, height), color)
+    coordinate = (size["left"], size["top"])
+    image_margin_combined.paste(image_PIL, coordinate)
+    return image_margin_combined
+
+
+def add_margin_to_one_image(image_src, image_dst, margin, margin_size):
+    """add_margin_to_one_image 1枚の画像ファイルの周囲(上下左右)に余白を付加して保存する
+
+    Args:
+        image_src (str): 余白を付加したい画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 余白を付加した画像ファイル(相対パス・拡張子付き)
+        margin (dict): 各方向(上下左右)に余白を付加するかどうか
+        margin_size (dict): 各方向(上下左右)の余白の大きさ
+    """
+    with trace_image("add_margin_around_image", image_src,
+                     image_dst) as trace:
+        # 画像ファイル(相対パス・拡張子付き)をPillow(PIL)で読み込み
+        with trace.stage("decode"):
+            image_src_PIL = open_image(image_src, trace)
+            image_src_PIL.load()
+        # 周囲(上下左右)の必要な箇所に余白を一度にまとめて付加
+        with trace.stage("transform"):
+            image_dst_PIL = add_margin_to_image(image_src_PIL, margin,
+                                                margin_size)
+        # 余白を付加した画像を1回だけ保存(エンコード)する
+        save_image(image_dst_PIL, image_dst, trace)
+
+
+def add_margin_around_image(indir, outdir, margin=None,
+                            extension="png", margin_size=None,
+                            jobs=1, chunksize=1,
+                            recursive=False, sniff=False,
+                            incremental=False, content_hash=False,
+                            cache=None):
+    """add_margin_around_image _summary_
+
+    Args:
+        indir (str): 余白を付加したい画像をまとめて置いているディレクトリ
+        outdir (str): 余白を付加した画像をまとめて置くディレクトリ
+        margin (dict, optional): 各方向(上下左右)に余白を付加するかどうか，デフォルトはTrue.
+        extension (str または list, optional): 画像ファイルの拡張子，デフォルトは"png".
+        margin_size (dict, optional): 各方向(上下左右)の余白の大きさ，デフォルトは全方向10.
+        jobs (int, optional): 並列に動かすプロセス数，デフォルトは1(NoneだとCPU数).
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数，デフォルトは1.
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        incremental (bool, optional): 出力済みで変更の無い画像の処理を省略するかどうか
+                                      (デフォルトはFalse)
+        content_hash (bool, optional): incremental=Trueの場合に内容のハッシュ値でも判定するか
+                                       どうか(デフォルトはFalse)
+        cache (ResultCache, optional): 処理結果のキャッシュ(result_cache.py)
+                                       デフォルトはNone(--cacheで設定したもの，無ければ使わない).
+
+    Returns:
+        list: 余白の付加に失敗した(画像ファイル, エラー内容)のリスト
+    """
+    # 上下左右に余白を付加するかどうかが定義されていない場合は，
+    # 上下左右すべてに余白を付加する設定にする
+    if margin is None:
+        margin = {}
+        margin["top"] = True
+        margin["bottom"] = True
+        margin["left"] = True
+        margin["right"] = True
+    # 上下左右の余白のサイズが定義されていない場合は定義する
+    # なおここの値はあまりいじらないように思うのでハードコーディングで済ます
+    if margin_size is None:
+        margin_size = {}
+        margin_size["top"] = 10
+        margin_size["bottom"] = 10
+        margin_size["left"] = 10
+        margin_size["right"] = 10
+    # 合体後の画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    # 変換前(元の拡張子)の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("add_margin_around_image",
+                           scan_images(indir, extension, recursive, sniff))
+    # 画像1枚ずつに対する余白付加の引数(余白付加前・後の画像ファイルなど)を定義
+    sniff_dir = indir if sniff is True else None
+    items = ((os.path.join(indir, image),
+              make_output_path(outdir, image, sniff_dir),
+              margin, margin_size) for image in images)
+    # 変更の無い画像の処理を省略する場合は，マニフェストで出力済みの画像を取り除く
+    params = {"operation": "add_margin_around_image",
+              "margin": margin, "margin_size": margin_size}
+    skipped = []
+    if incremental is True:
+        manifest = load_manifest(outdir)
+        items = skip_up_to_date(items, outdir, manifest, params, skipped,
+                                content_hash)
+    # 同じ画像に同じ余白を付加したことがあればキャッシュからコピーする
+    margin_func, cache = with_cache(add_margin_to_one_image, params, cache)
+    if cache is not None:
+        cache_stats = cache.stats()
+    # 画像1枚ずつに対して周囲(上下左右)に余白を(並列に)付加する
+    errors = []
+    try:
+        for result in run_batch(margin_func, items, jobs, chunksize):
+            image_src, image_dst = result.args[0], result.args[1]
+            # 結果を見やすくするための区切り線の表示
+            print("-" * 70)
+            print(image_src)
+            if result.error is not None:
+                # 余白の付加に失敗した画像は記録しておき，残りの画像の処理は続ける
+                errors.append((image_src, result.error))
+                continue
+            # 処理が終わった画像をマニフェストに記録する
+            if incremental is True:
+                update_manifest(outdir, manifest, image_src, image_dst,
+                                params, content_hash)
+            # どの方向に余白を付加したのか報告
+            for direction in ["top", "bottom", "left", "right"]:
+                if margin[direction] is True:
+                    print("Add " + direction + " margin")
+            # どの画像に余白が付加されたのか表示
+            print("Add margin: ", image_src + " --> " + image_dst)
+    finally:
+        # 途中で止まった場合もそこまでの記録が残るようにマニフェストを保存する
+        if incremental is True:
+            save_manifest(outdir, manifest)
+    # 処理を省略した画像があれば枚数を表示する
+    if len(skipped) > 0:
+        print("Skip: ", str(len(skipped)) + " images are up to date")
+    # キャッシュを使った場合はヒットした枚数を表示する
+    if cache is not None:
+        print_cache_summary(cache, cache_stats)
+    # 結果を見やすくするための区切り線の表示
+    print("-" * 70)
+    # 余白の付加に失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像について余白の付加が終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+# ----------------------------------------------------------------------
+# 画像の周囲(上下左右)に余白を付加する
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから余白の付加を実行する(image-tools margin)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="add a margin around images")
+    parser.add_argument("indir", nargs="?", default="./src_images/")
+    parser.add_argument("outdir", nargs="?", default="./mgn_images/")
+    parser.add_argument("--extension", nargs="+", default=["png"])
+    parser.add_argument("--size", type=int, default=10,
+                        help="margin size [px] on every side")
+    args = parse_batch_args(args, parser, incremental=True)
+    margin = {direction: True
+              for direction in ["top", "bottom", "left", "right"]}
+    margin_size = {direction: args.size for direction in margin}
+    errors = add_margin_around_image(args.indir, args.outdir, margin,
+                                     args.extension, margin_size,
+                                     jobs=args.jobs, chunksize=args.chunksize,
+                                     recursive=args.recursive,
+                                     sniff=args.sniff,
+                                     incremental=args.incremental,
+                                     content_hash=args.content_hash)
+    return 1 if len(errors) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# batch_executor.py
+# 複数枚の画像に対する処理をプロセスプール上で並列に実行する
+# (ディレクトリ内の画像を1枚ずつ処理する各ツールで共通して使う)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from collections import deque
+from collections import namedtuple
+import argparse
+import os
+import sys
+from image_tools.instrumentation import enable_trace
+from image_tools.io_pipeline import enable_pipeline
+from image_tools.io_pipeline import pipeline_enabled
+from image_tools.io_pipeline import run_pipelined
+from image_tools.memory_budget import MemoryBudget
+from image_tools.memory_budget import estimate_args_bytes
+from image_tools.memory_budget import parse_bytes
+from image_tools.result_cache import ResultCache
+from image_tools.result_cache import set_default_cache
+
+# 1件の処理結果(args: 処理関数に渡した引数, value: 戻り値, error: エラー内容)
+BatchResult = namedtuple("BatchResult", ["args", "value", "error"])
+
+# 同時に処理する画像のメモリの上限(set_memory_budgetで設定する，Noneは上限無し)
+_memory_budget = {"bytes": None}
+
+
+def set_memory_budget(budget_bytes):
+    """set_memory_budget 以降のrun_batchで同時に処理する画像のメモリの上限[Byte]を設定する"""
+    _memory_budget["bytes"] = budget_bytes
+
+
+def _run_chunk(func, chunk):
+    """_run_chunk まとめて渡された複数件の処理を順番に実行する
+
+    Args:
+        func (function): 1件分の処理を行う関数
+        chunk (list): funcに渡す引数(tuple)のリスト
+
+    Returns:
+        list: (戻り値, エラー内容)のリスト(エラーが無ければエラー内容はNone)
+
+    注意点:
+        1件の失敗で残りの処理が止まらないように，例外はここで文字列にして返す
+    """
+    results = []
+    for args in chunk:
+        try:
+            results.append((func(*args), None))
+        except Exception as e:
+            results.append((None, type(e).__name__ + ": " + str(e)))
+    return results
+
+
+def _chunked(items, chunksize):
+    """_chunked 引数のイテラブルをchunksize件ずつのリストに分割して順に返す"""
+    chunk = []
+    for args in items:
+        chunk.append(args)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def run_batch(func, items, jobs=1, chunksize=1, memory_budget=None,
+              estimate=None):
+    """run_batch 複数件の処理をプロセスプール上で並列に実行する
+
+    Args:
+        func (function): 1件分の処理を行う関数(プロセス間で渡すためモジュール直下に定義)
+        items (iterable): funcに渡す引数(tuple)を順に返すイテラブル
+        jobs (int, optional): 並列に動かすプロセス数，Noneの場合はCPU数.
+                              デフォルトは1(プロセスプールを使わずに逐次実行).
+        chunksize (int, optional): 1つのプロセスにまとめて渡す件数，デフォルトは1.
+        memory_budget (int, optional): 同時に処理する画像のメモリの上限[Byte]
+                                       デフォルトはNone(set_memory_budgetの設定).
+        estimate (function, optional): 1件の引数から使うメモリ[Byte]を見積もる関数
+                                       デフォルトはNone(最初の引数の画像のヘッダから見積もる).
+
+    Yields:
+        BatchResult: 1件の処理結果(itemsと同じ順番で返す)
+
+    注意点:
+        1件の処理が失敗しても残りの処理は続行し，失敗の内容はBatchResult.errorに入る
+        itemsは必要な分だけ少しずつ読み進めるため，一覧の取得が終わる前に処理を始められる
+        enable_pipelineでパイプライン実行を有効にした場合は，プロセスプールの代わりに
+        読み込み・処理(jobsスレッド)・書き込みを別々のスレッドで重ねて実行する
+        メモリの上限を指定した場合は，処理中の見積もりの合計が上限以下の間だけ次を始める
+        (上限を超える大きな画像は他の処理が終わるのを待って単独で処理する)
+    """
+    if jobs is None:
+        jobs = os.cpu_count()
+    if chunksize < 1:
+        chunksize = 1
+    if memory_budget is None:
+        memory_budget = _memory_budget["bytes"]
+    budget = None
+    if memory_budget is not None and jobs > 1:
+        budget = MemoryBudget(memory_budget)
+        if estimate is None:
+            estimate = estimate_args_bytes
+    # ------------------------------------------------------------------
+    # パイプライン実行が有効な場合は読み書きと処理をスレッドで重ねて実行する
+    # ------------------------------------------------------------------
+    if pipeline_enabled() is True:
+        for args, value, error in run_pipelined(func, items, jobs,
+                                                budget=budget,
+                                                estimate=estimate):
+            yield BatchResult(args, value, error)
+        return
+    # ------------------------------------------------------------------
+    # 並列数が1の場合はプロセスプールを使わずにその場で逐次実行する
+    # ------------------------------------------------------------------
+    if jobs <= 1:
+        for chunk in _chunked(items, chunksize):
+            for args, (value, error) in zip(chunk, _run_chunk(func, chunk)):
+                yield BatchResult(args, value, error)
+        return
+    # ------------------------------------------------------------------
+    # 並列数が2以上の場合はプロセスプールで実行する
+    # 実行中のまとまり(chunk)は最大でjobsの2倍までに抑え，
+    # 先頭のまとまりから順に結果を返すことで出力の順番を入力と揃える
+    # メモリの上限がある場合は，見積もりの合計が上限に収まるまで先頭の結果を待つ
+    # ------------------------------------------------------------------
+    # プロセスプール(multiprocessing)は読み込みに時間がかかるため，使う場合だけ読み込む
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+
+        def pop_pending():
+            chunk_done, future, cost = pending.popleft()
+            results = future.result()
+            if budget is not None:
+                budget.release(cost)
+            return zip(chunk_done, results)
+
+        for chunk in _chunked(items, chunksize):
+            cost = 0
+            if budget is not None:
+                cost = sum(estimate(args) for args in chunk)
+                while budget.try_acquire(cost) is False:
+                    for args, (value, error) in pop_pending():
+                        yield BatchResult(args, value, error)
+            pending.append((chunk, executor.submit(_run_chunk, func, chunk),
+                            cost))
+            if len(pending) < jobs * 2:
+                continue
+            for args, (value, error) in pop_pending():
+                yield BatchResult(args, value, error)
+        while len(pending) > 0:
+            for args, (value, error) in pop_pending():
+                yield BatchResult(args, value, error)
+
+
+def print_batch_errors(errors, file=None):
+    """print_batch_errors 処理に失敗した画像の一覧を表示する
+
+    Args:
+        errors (list): (画像ファイル, エラー内容)のリスト
+        file (file, optional): 表示先，デフォルトは標準出力.
+    """
+    if len(errors) == 0:
+        return
+    if file is None:
+        file = sys.stdout
+    print("Failed for " + str(len(errors)) + " images", file=file)
+    for image_src, error in errors:
+        print(" " + image_src + ": " + error, file=file)
+
+
+def parse_batch_args(args=None, parser=None, scan=True, incremental=False):
+    """parse_batch_args コマンドライン引数から並列実行の設定を読み込む
+
+    Args:
+        args (list, optional): 解析する引数のリスト，デフォルトはsys.argv[1:].
+        parser (argparse.ArgumentParser, optional): 各ツール独自の引数を追加済みのパーサ
+                                                    デフォルトはNone(新しく作る).
+        scan (bool, optional): ディレクトリ内の画像の探し方(--recursive，--sniff)を
+                               追加するかどうか，デフォルトはTrue.
+        incremental (bool, optional): 出力済みの画像の省略(--incremental，
+                                      --content-hash)を追加するかどうか，
+                                      デフォルトはFalse.
+
+    Returns:
+        argparse.Namespace: jobs(並列に動かすプロセス数)とchunksize(まとめて渡す件数)
+
+    注意点:
+        --traceを指定した場合は段階ごとの処理時間のトレースの記録を有効にする
+        (--profileと--tracemallocは--traceと一緒に指定する)
+        --pipelineを指定した場合は読み込み・処理・書き込みをスレッドで重ねて実行する
+        (この場合の--jobsは処理を行うスレッド数になる)
+        --memory-budgetを指定した場合は同時に処理する画像のメモリの上限を設定する
+        --cacheを指定した場合は処理結果のキャッシュ(対応するツールのみ)を有効にする
+        --recursiveと--sniffはscan_imagesのrecursiveとsniffに渡す
+        --incrementalと--content-hashは各ツールのincrementalとcontent_hashに渡す
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser()
+    if scan is True:
+        parser.add_argument("-r", "--recursive", action="store_true",
+                            help="also process images in subdirectories")
+        parser.add_argument("--sniff", action="store_true",
+                            help="detect images by their first bytes "
+                                 "instead of the extension")
+    if incremental is True:
+        parser.add_argument("--incremental", action="store_true",
+                            help="skip images whose output is up to date")
+        parser.add_argument("--content-hash", action="store_true",
+                            help="with --incremental, also compare the "
+                                 "content hash of the inputs")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (0: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=1,
+                        help="number of images handed to a worker at once")
+    parser.add_argument("--trace", default=None,
+                        help="append a per-image, per-stage JSON-lines trace")
+    parser.add_argument("--profile", default=None,
+                        help="with --trace, dump cProfile stats to this dir")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="with --trace, record Python peak allocations")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="overlap reading, processing and writing "
+                             "with threads (--jobs: worker threads)")
+    parser.add_argument("--prefetch", type=int, default=4,
+                        help="with --pipeline, files to read ahead")
+    parser.add_argument("--write-queue", type=int, default=4,
+                        help="with --pipeline, outputs waiting to be written")
+    parser.add_argument("--memory-budget", type=parse_bytes, default=None,
+                        help="limit the estimated memory of images processed "
+                             "at once (e.g. 2G)")
+    parser.add_argument("--cache", default=None,
+                        help="shared result cache directory "
+                             "(compress/crop/margin)")
+    parser.add_argument("--cache-size", type=parse_bytes, default=None,
+                        help="with --cache, evict LRU entries above this")
+    parser.add_argument("--cache-hardlink", action="store_true",
+                        help="with --cache, hardlink hits instead of copying")
+    parsed = parser.parse_args(args)
+    if parsed.jobs == 0:
+        parsed.jobs = None
+    if parsed.trace is not None:
+        enable_trace(parsed.trace, parsed.profile, parsed.tracemalloc)
+    if parsed.pipeline is True:
+        enable_pipeline(parsed.prefetch, parsed.write_queue)
+    if parsed.memory_budget is not None:
+        set_memory_budget(parsed.memory_budget)
+    if parsed.cache is not None:
+        set_default_cache(ResultCache(parsed.cache, parsed.cache_size,
+                                      parsed.cache_hardlink))
+    return parsed
@@ -0,0 +1,85 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# cli.py
+# 各ツールを1つのコマンド(image-tools サブコマンド)から実行する
+# (サブコマンドのモジュールは実行するときに初めて読み込むため，起動が速い)
+#
+# 実行例: image-tools compress ./src_images/ ./cmp_images/ --shrink 4 -j 8
+#         python -m image_tools size ./src_images/
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import importlib
+import sys
+from image_tools import __version__
+
+# サブコマンドの名前と(モジュール名, 説明)
+subcommands = {
+    "compress": ("compress_image", "shrink and recompress images"),
+    "crop": ("crop_image_by_hand", "crop images to the same rectangle(s)"),
+    "margin": ("add_margin_around_image", "add a margin around images"),
+    "pdf": ("convert_image_to_pdf", "convert images to PDF"),
+    "combine": ("combine_2_images_into_1_image",
+                "combine images into one image"),
+    "pipeline": ("image_pipeline",
+                 "crop/trim/margin/compress/pdf with one decode per image"),
+    "size": ("print_image_size", "print image and file sizes"),
+    "coordinate": ("print_coordinate_clicked_with_mouse",
+                   "print (and record) clicked coordinates (needs cv2)"),
+    "serve": ("server", "serve image operations over a Unix socket"),
+    "trace": ("instrumentation", "summarize a per-stage trace"),
+    "cache": ("result_cache", "show (and trim) a result cache"),
+}
+
+
+def print_usage(file=None):
+    """print_usage 使い方とサブコマンドの一覧を表示する"""
+    if file is None:
+        file = sys.stdout
+    print("usage: image-tools [--version] <subcommand> [args...]", file=file)
+    print("", file=file)
+    print("subcommands:", file=file)
+    for name, (_, description) in subcommands.items():
+        print("  {:12s}{}".format(name, description), file=file)
+    print("", file=file)
+    print("run 'image-tools <subcommand> --help' for the options", file=file)
+
+
+def main(args=None):
+    """main サブコマンドのモジュールを読み込み，そのmainに残りの引数を渡して実行する
+
+    Args:
+        args (list, optional): コマンドライン引数，デフォルトはNone(sys.argv[1:]).
+
+    Returns:
+        int: 終了コード(失敗した画像があれば1，使い方の誤りは2)
+
+    注意点:
+        一覧の表示やサブコマンドの選択ではPillowやcv2などを読み込まない
+    """
+    if args is None:
+        args = sys.argv[1:]
+    if len(args) == 0 or args[0] in ["-h", "--help"]:
+        print_usage()
+        return 0
+    if args[0] == "--version":
+        print("image-tools " + __version__)
+        return 0
+    if args[0] not in subcommands:
+        print("image-tools: unknown subcommand '" + args[0] + "'",
+              file=sys.stderr)
+        print_usage(sys.stderr)
+        return 2
+    module_name, _ = subcommands[args[0]]
+    try:
+        module = importlib.import_module("image_tools." + module_name)
+    except ImportError as error:
+        # cv2などの任意の依存が無い場合は，インストール方法を表示して終了する
+        print("image-tools " + args[0] + ": " + str(error)
+              + " (pip install \"image-tools[gui]\")", file=sys.stderr)
+        return 1
+    return module.main(args[1:], prog="image-tools " + args[0])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,547 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# combine_2_images_into_1_image.py
+# 2枚の画像を合体させて1枚の画像を生成する
+# (N枚の画像を格子状などに並べた1枚の画像(モンタージュ)も生成できる)
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+import argparse
+import math
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+# 白色のRGB
+white_rgb = (255, 255, 255)
+# 黒色のRGB
+black_rgb = (0, 0, 0)
+
+
+def compute_montage_layout(sizes, cols=None, rows=None, flow_width=None,
+                           gap=0):
+    """compute_montage_layout 複数枚の画像を並べるときの各画像の位置を計算する
+
+    Args:
+        sizes (list): 並べる画像の(幅, 高さ)のリスト
+        cols (int, optional): 格子状に並べる場合の列数
+        rows (int, optional): 格子状に並べる場合の行数
+                              (cols，rowsともにNoneの場合は正方形に近くなるように決める)
+        flow_width (int, optional): 指定した場合は格子状ではなく，左から順に並べて
+                                    この幅を超えるところで折り返す(cols，rowsは使わない)
+        gap (int, optional): 画像同士の間隔[px]，デフォルトは0.
+
+    Returns:
+        tuple: (合体後の画像の(幅, 高さ), 各画像の左上の座標のリスト)
+
+    注意点:
+        格子状の場合，各列の幅はその列で最も幅の広い画像に，
+        各行の高さはその行で最も高い画像に合わせ，画像はそのマスの中央に置く
+        折り返す場合，各行の高さはその行で最も高い画像に合わせ，画像は上下の中央に置く
+    """
+    n = len(sizes)
+    offsets = []
+    # ------------------------------------------------------------------
+    # 左から順に並べて，flow_widthを超えるところで折り返す
+    # ------------------------------------------------------------------
+    if flow_width is not None:
+        # 画像を行ごとに分ける
+        lines = [[]]
+        x = 0
+        for i, (w, h) in enumerate(sizes):
+            if len(lines[-1]) > 0 and x + w > flow_width:
+                lines.append([])
+                x = 0
+            lines[-1].append(i)
+            x += w + gap
+        offsets = [None] * n
+        width, y = 0, 0
+        for line in lines:
+            line_height = max(sizes[i][1] for i in line)
+            x = 0
+            for i in line:
+                w, h = sizes[i]
+                offsets[i] = (x, y + (line_height - h) // 2)
+                x += w + gap
+            width = max(width, x - gap)
+            y += line_height + gap
+        return (width, y - gap), offsets
+    # ------------------------------------------------------------------
+    # 格子状(rows行×cols列)に並べる
+    # ------------------------------------------------------------------
+    if cols is None and rows is None:
+        cols = math.ceil(math.sqrt(n))
+    if cols is None:
+        cols = math.ceil(n / rows)
+    rows = math.ceil(n / cols)
+    # 各列の幅と各行の高さ
+    col_widths = [0] * cols
+    row_heights = [0] * rows
+    for i, (w, h) in enumerate(sizes):
+        col_widths[i % cols] = max(col_widths[i % cols], w)
+        row_heights[i // cols] = max(row_heights[i // cols], h)
+    # 各列の左端と各行の上端の座標
+    col_x = [sum(col_widths[:c]) + gap * c for c in range(cols)]
+    row_y = [sum(row_heights[:r]) + gap * r for r in range(rows)]
+    for i, (w, h) in enumerate(sizes):
+        c, r = i % cols, i // cols
+        offsets.append((col_x[c] + (col_widths[c] - w) // 2,
+                        row_y[r] + (row_heights[r] - h) // 2))
+    width = sum(col_widths) + gap * (cols - 1)
+    height = sum(row_heights) + gap * (rows - 1)
+    return (width, height), offsets
+
+
+class StreamingPngWriter:
+    """StreamingPngWriter 上から数行ずつ画素データを受け取りながら書き出すPNGの書き込み
+
+    注意点:
+        受け取った行はその場でzlibで圧縮してIDATチャンクとして書き出すため，
+        画像全体をメモリ上に持たずにPNGを生成できる(フィルタは各行とも"None")
+    """
+
+    def __init__(self, path, size, mode="RGB"):
+        """__init__ PNGのファイルを開き，シグネチャとIHDRチャンクを書き込む
+
+        Args:
+            path (str): 書き込むPNGファイル
+            size (tuple): 画像の幅と高さ
+            mode (str, optional): "RGB"または"L"，デフォルトは"RGB".
+        """
+        self.f = open(path, "wb")
+        self.width, self.height = size
+        self.bands = {"L": 1, "RGB": 3}[mode]
+        self.compressor = zlib.compressobj(6)
+        self.f.write(b"\x89PNG\r\n\x1a\n")
+        color_type = {"L": 0, "RGB": 2}[mode]
+        self._write_chunk(b"IHDR", struct.pack(
+            ">IIBBBBB", self.width, self.height, 8, color_type, 0, 0, 0))
+
+    def _write_chunk(self, chunk_type, data):
+        """_write_chunk チャンク(長さ・種類・データ・CRC)を1つ書き込む"""
+        self.f.write(struct.pack(">I", len(data)))
+        self.f.write(chunk_type)
+        self.f.write(data)
+        self.f.write(struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    def write_rows(self, data):
+        """write_rows 数行分の画素データ(Image.tobytes()の形式)を書き込む
+
+        Args:
+            data (bytes): 書き込む行の画素データ
+        """
+        row_bytes = self.width * self.bands
+        # 各行の先頭にフィルタの種類(0: None)を付けてから圧縮する
+        rows = b"".join(b"\x00" + data[i:i + row_bytes]
+                        for i in range(0, len(data), row_bytes))
+        compressed = self.compressor.compress(rows)
+        if len(compressed) > 0:
+            self._write_chunk(b"IDAT", compressed)
+
+    def close(self):
+        """close 圧縮の残りとIENDチャンクを書き込んでファイルを閉じる"""
+        self._write_chunk(b"IDAT", self.compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self.f.close()
+
+
+class PngRowReader:
+    """PngRowReader インターレースでない8bitのPNGを上から数行ずつデコードする
+
+    注意点:
+        IDATチャンクを少しずつ読んで展開し，必要な行だけをPillowのzipデコーダに渡す
+        (前の行を参照するフィルタのため，直前の1行を展開済みの値(フィルタ無し)で先頭に付ける)
+        メモリ上に持つのは読み込み中の行と直前の1行だけである
+    """
+
+    # デコードできる(1画素1Byteの帯からなる)モード
+    modes = ("L", "LA", "RGB", "RGBA", "P")
+
+    def __init__(self, path, image_PIL):
+        """__init__ PNGのファイルを開き，最初のIDATチャンクの手前まで読み飛ばす
+
+        Args:
+            path (str): PNGファイル
+            image_PIL (PIL.Image.Image): Image.openで開いただけのpathの画像
+        """
+        from PIL import Image
+        self.mode = image_PIL.mode
+        self.width = image_PIL.size[0]
+        self.palette = None
+        if self.mode == "P":
+            self.palette = (image_PIL.getpalette(image_PIL.palette.mode),
+                            image_PIL.palette.mode)
+        # フィルタの種類(1Byte)を含む1行のバイト数
+        self.row_bytes = 1 + self.width * Image.getmodebands(self.mode)
+        self.f = open(path, "rb")
+        self.f.seek(8)
+        self.decompressor = zlib.decompressobj()
+        self.chunk_left = 0
+        self.previous = None
+
+    @classmethod
+    def supports(cls, image_PIL):
+        """supports 上から数行ずつデコードできるPNGかどうかを返す"""
+        tiles = image_PIL.tile
+        return image_PIL.format == "PNG" and len(tiles) == 1 \
+            and tiles[0][0] == "zip" and tiles[0][3] == image_PIL.mode \
+            and image_PIL.mode in cls.modes \
+            and not image_PIL.info.get("interlace")
+
+    def _read_idat(self):
+        """_read_idat 次のIDATチャンクのデータを読む(無くなったらb""を返す)"""
+        while self.chunk_left == 0:
+            header = self.f.read(8)
+            if len(header) < 8:
+                return b""
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type == b"IDAT":
+                self.chunk_left = length
+                break
+            if chunk_type == b"IEND":
+                return b""
+            # IDAT以外のチャンクはデータとCRCを読み飛ばす
+            self.f.seek(length + 4, os.SEEK_CUR)
+        data = self.f.read(min(self.chunk_left, 1 << 16))
+        if len(data) == 0:
+            return b""
+        self.chunk_left -= len(data)
+        if self.chunk_left == 0:
+            self.f.seek(4, os.SEEK_CUR)
+        return data
+
+    def read_rows(self, top, bottom):
+        """read_rows 前回の続きのtop行目からbottom行目の手前までをデコードする
+
+        Args:
+            top (int): 読み込む最初の行(前回のbottomと同じにする)
+            bottom (int): 読み込む最後の行の次の行
+
+        Returns:
+            PIL.Image.Image: 読み込んだ行だけの画像
+        """
+        from PIL import Image
+        need = (bottom - top) * self.row_bytes
+        parts, size = [], 0
+        while size < need:
+            data = self.decompressor.unconsumed_tail
+            if len(data) == 0:
+                data = self._read_idat()
+                if len(data) == 0:
+                    raise OSError("image file is truncated")
+            part = self.decompressor.decompress(data, need - size)
+            parts.append(part)
+            size += len(part)
+        if self.previous is not None:
+            parts.insert(0, b"\x00" + self.previous)
+        rows = b"".join(parts)
+        n = len(rows) // self.row_bytes
+        image_PIL = Image.frombytes(self.mode, (self.width, n),
+                                    zlib.compress(rows, 0), "zip", self.mode)
+        if self.palette is not None:
+            image_PIL.putpalette(*self.palette)
+        self.previous = image_PIL.crop(
+            (0, n - 1, self.width, n)).tobytes()
+        if n > bottom - top:
+            image_PIL = image_PIL.crop((0, 1, self.width, n))
+        return image_PIL
+
+    def close(self):
+        """close PNGのファイルを閉じる"""
+        self.f.close()
+
+
+class SpilledRowReader:
+    """SpilledRowReader 画像を1回だけデコードして一時ファイルに書き出し，数行ずつ読み込む
+
+    注意点:
+        上から順にデコードを続けられない形式(JPEG，WebP，インターレースのPNGなど)に使う
+        デコードした直後は画像全体がメモリ上にあるが，一時ファイルに書き出したら解放する
+    """
+
+    def __init__(self, image_PIL):
+        """__init__ 画像をデコードして，1行ずつ並べた画素データを一時ファイルに書き出す
+
+        Args:
+            image_PIL (PIL.Image.Image): Image.openで開いただけの画像
+        """
+        image_PIL.load()
+        self.mode = image_PIL.mode
+        self.width, h = image_PIL.size
+        self.palette = None
+        if image_PIL.palette is not None and self.mode in ("P", "PA"):
+            self.palette = (image_PIL.getpalette(image_PIL.palette.mode),
+                            image_PIL.palette.mode)
+        self.row_bytes = len(image_PIL.crop((0, 0, self.width, 1)).tobytes())
+        self.f = tempfile.TemporaryFile()
+        # 画素データ全体の複製を作らないように，256行ずつ書き出す
+        for y in range(0, h, 256):
+            self.f.write(image_PIL.crop(
+                (0, y, self.width, min(y + 256, h))).tobytes())
+
+    def read_rows(self, top, bottom):
+        """read_rows top行目からbottom行目の手前までを一時ファイルから読み込む
+
+        Args:
+            top (int): 読み込む最初の行
+            bottom (int): 読み込む最後の行の次の行
+
+        Returns:
+            PIL.Image.Image: 読み込んだ行だけの画像
+        """
+        from PIL import Image
+        self.f.seek(top * self.row_bytes)
+        data = self.f.read((bottom - top) * self.row_bytes)
+        image_PIL = Image.frombytes(self.mode, (self.width, bottom - top),
+                                    data)
+        if self.palette is not None:
+            image_PIL.putpalette(*self.palette)
+        return image_PIL
+
+    def close(self):
+        """close 一時ファイルを閉じる(削除される)"""
+        self.f.close()
+
+
+def open_row_reader(image):
+    """open_row_reader 画像ファイルを上から数行ずつ読み込むためのオブジェクトを返す
+
+    Args:
+        image (str): 画像ファイル(相対パス・拡張子付き)
+
+    Returns:
+        PngRowReader または SpilledRowReader: read_rows(top, bottom)とclose()を持つ
+    """
+    from PIL import Image
+    with Image.open(image) as image_PIL:
+        if PngRowReader.supports(image_PIL):
+            return PngRowReader(image, image_PIL)
+        return SpilledRowReader(image_PIL)
+
+
+def _make_montage_out_of_core(images, path_out, sizes, size, offsets, color,
+                              strip_height):
+    """_make_montage_out_of_core 合体後の画像を上から帯(strip)ごとに生成して書き出す
+
+    注意点:
+        ".npy"のファイルにはメモリマップ(numpy.memmap)した配列に直接貼り付ける
+        それ以外はPNGとして帯ごとに圧縮しながら書き出す
+        各画像は重なる最初の帯で開き，最後の帯まで続きから読み込む(デコードは1回だけ)
+        インターレースでない8bitのPNGはメモリ上に持つのが1本の帯と各画像の数行だけで済む
+        それ以外の形式は開くときに1枚ずつ全体をデコードし，一時ファイルに書き出してから読む
+    """
+    from PIL import Image
+    # ------------------------------------------------------------------
+    # ".npy"の場合はディスク上の配列をメモリマップして，各画像を1枚ずつ書き込む
+    # ------------------------------------------------------------------
+    if os.path.splitext(path_out)[1].lower() == ".npy":
+        import numpy as np
+        canvas = np.lib.format.open_memmap(
+            path_out, mode="w+", dtype=np.uint8,
+            shape=(size[1], size[0], 3))
+        # 余白の色で塗りつぶす(帯ごとに塗ってメモリに載る量を抑える)
+        for y0 in range(0, size[1], strip_height):
+            canvas[y0:y0 + strip_height] = color
+        for image, (w, h), (x, y) in zip(images, sizes, offsets):
+            with Image.open(image) as image_PIL:
+                canvas[y:y + h, x:x + w] = \
+                    np.asarray(image_PIL.convert("RGB"))
+            canvas.flush()
+        del canvas
+        return
+    # ------------------------------------------------------------------
+    # PNGの場合は上から帯ごとに画像を貼り付けて，帯ごとに圧縮しながら書き出す
+    # ------------------------------------------------------------------
+    writer = StreamingPngWriter(path_out, size)
+    # 読み込み中の画像(番号: 行ごとの読み込み)，その画像の最後の行を含む帯を過ぎたら閉じる
+    readers = {}
+    try:
+        for y0 in range(0, size[1], strip_height):
+            y1 = min(y0 + strip_height, size[1])
+            strip = Image.new('RGB', (size[0], y1 - y0), color)
+            for i, ((w, h), (x, y)) in enumerate(zip(sizes, offsets)):
+                # この帯に重ならない画像は飛ばす
+                if y >= y1 or y + h <= y0:
+                    continue
+                if i not in readers:
+                    readers[i] = open_row_reader(images[i])
+                # 画像のうちこの帯に重なる行だけを(前の帯の続きから)読み込んで貼り付ける
+                top, bottom = max(y0 - y, 0), min(y1 - y, h)
+                strip.paste(readers[i].read_rows(top, bottom),
+                            (x, y + top - y0))
+                if bottom == h:
+                    readers.pop(i).close()
+            writer.write_rows(strip.tobytes())
+    finally:
+        for reader in readers.values():
+            reader.close()
+    writer.close()
+
+
+def make_montage(images, path_out, cols=None, rows=None, flow_width=None,
+                 gap=0, color=white_rgb, debug=False, strip_height=None):
+    """make_montage 複数枚の画像を格子状(または折り返し)に並べた1枚の画像を生成する
+
+    Args:
+        images (list): 並べる画像ファイル(相対パス・拡張子付き)のリスト
+        path_out (str): 生成した1枚の画像ファイル(相対パス・拡張子付き)
+        cols (int, optional): 格子状に並べる場合の列数
+        rows (int, optional): 格子状に並べる場合の行数
+        flow_width (int, optional): 左から順に並べて折り返す場合の幅
+        gap (int, optional): 画像同士の間隔[px]，デフォルトは0.
+        color (tuple, optional): 余白の色，デフォルトは白色.
+        debug (bool, optional): 計算した配置を表示するかどうか，デフォルトはFalse.
+        strip_height (int, optional): 指定した場合は合体後の画像をメモリ上に確保せず，
+                                      この高さ[px]の帯ごとに生成して書き出す
+                                      (path_outはPNGまたは".npy"にする)
+                                      デフォルトはNone(メモリ上で生成する).
+
+    注意点:
+        配置はヘッダから読んだ幅と高さだけで計算し(画素データはデコードしない)，
+        合体後の画像を1回だけ確保して，各画像を1回だけ(1枚ずつデコードして)貼り付ける
+        strip_heightを指定した場合の最大メモリ使用量は，合体後の画像全体ではなく
+        1本の帯とその帯に重なる画像の分で決まる
+    """
+    from PIL import Image
+    # 各画像の幅と高さをヘッダだけから取得
+    sizes = []
+    for image in images:
+        with Image.open(image) as image_PIL:
+            sizes.append(image_PIL.size)
+    # 合体後の画像の大きさと各画像の位置を計算
+    size, offsets = compute_montage_layout(sizes, cols, rows, flow_width, gap)
+    if debug is True:
+        print("canvas:", size)
+        for image, offset in zip(images, offsets):
+            print(" " + image + ":", offset)
+    # メモリに載らない大きさの場合は帯ごとに生成して書き出す
+    if strip_height is not None:
+        _make_montage_out_of_core(images, path_out, sizes, size, offsets,
+                                  color, strip_height)
+        return
+    # 合体後の画像を1回だけ確保し，各画像を1枚ずつ読み込んで貼り付ける
+    image_combined = Image.new('RGB', size, color)
+    for image, offset in zip(images, offsets):
+        with Image.open(image) as image_PIL:
+            image_combined.paste(image_PIL, offset)
+    image_combined.save(path_out)
+
+
+def combine_horizontally(image_left, image_right, dir_out, image_out,
+                         debug=False, strip_height=None):
+    """combine_horizontally 横方向に2枚の画像を合体させた1枚の画像を生成する
+
+    Args:
+        image_left (str): 合体させる2枚の画像のうち左側
+        image_right (str): 合体させる2枚の画像のうち右側
+        dir_out (str): 2枚の画像を合体させて生成した1枚の画像を置くディレクトリ
+        image_out (str): 2枚の画像を合体させて生成した1枚の画像のファイル名
+        debug (bool, optional): debug用に計算した配置を表示する(デフォルトはFalse)
+        strip_height (int, optional): 指定した場合は合体後の画像をこの高さ[px]の帯ごとに
+                                      生成して書き出す(デフォルトはNone)
+
+    注意点:
+        サイズが異なる場合には，小さい方の上下に余白を追加して対応している
+    """
+    # 合体後の画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(dir_out) is False:
+        os.makedirs(dir_out)
+    # ------------------------------------------------------------------
+    # 横方向の合体によりできる新しい画像は，
+    # 幅：左の画像の幅+右の画像の幅
+    # 高さ：左右の画像の高さのうち高い方
+    # となり，低い方の画像は上下の中央に置く(上下の余白は白色)．
+    # これは1行2列のモンタージュと同じである．
+    # ------------------------------------------------------------------
+    make_montage([image_left, image_right], dir_out + image_out,
+                 cols=2, rows=1, debug=debug,
+                 strip_height=strip_height)
+    # 横方向の合体が終了したことを報告する
+    print(image_left + " + " + image_right + " --> " + dir_out + image_out)
+    print("To combine horizontally is done")
+
+
+def combine_vertically(image_top, image_bottom, dir_out, image_out,
+                       debug=False, strip_height=None):
+    """combine_vertically 縦方向に2枚の画像を合体させた1枚の画像を生成する
+
+    Args:
+        image_top (str): 合体させる2枚の画像のうち上側
+        image_bottom (str): 合体させる2枚の画像のうち下側
+        dir_out (str): 2枚の画像を合体させて生成した1枚の画像を置くディレクトリ
+        image_out (str): 2枚の画像を合体させて生成した1枚の画像のファイル名
+        debug (bool, optional): debug用に計算した配置を表示する(デフォルトはFalse)
+        strip_height (int, optional): 指定した場合は合体後の画像をこの高さ[px]の帯ごとに
+                                      生成して書き出す(デフォルトはNone)
+
+    注意点:
+        サイズが異なる場合には，小さい方の左右に余白を追加して対応している
+    """
+    # 合体後の画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(dir_out) is False:
+        os.makedirs(dir_out)
+    # ------------------------------------------------------------------
+    # 縦方向の合体によりできる新しい画像は，
+    # 幅：上下の画像の幅のうち広い方
+    # 高さ：上の画像の高さ+下の画像の高さ
+    # となり，狭い方の画像は左右の中央に置く(左右の余白は白色)．
+    # これは2行1列のモンタージュと同じである．
+    # ------------------------------------------------------------------
+    make_montage([image_top, image_bottom], dir_out + image_out,
+                 cols=1, rows=2, debug=debug,
+                 strip_height=strip_height)
+    # 縦方向の合体が終了したことを報告する
+    print(image_top + " + " + image_bottom + " --> " + dir_out + image_out)
+    print("To combine vertically is done")
+
+
+# ----------------------------------------------------------------------
+# 横方向(左右)または縦方向(上下)に2枚の画像を合体させて1枚の画像を生成する
+# (3枚以上または--colsを指定した場合は格子状に並べる)
+# ----------------------------------------------------------------------
+# images (list): 合体させる画像(2枚の場合は左右または上下の順)
+# outdir (str): 合体させて生成した1枚の画像を置くディレクトリ
+# output (str): 合体させて生成した1枚の画像のファイル名
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから画像の合体を実行する(image-tools combine)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="combine images into one image")
+    parser.add_argument("images", nargs="*",
+                        default=["./src_images/1.png", "./src_images/2.png"])
+    parser.add_argument("--vertical", action="store_true",
+                        help="stack two images top to bottom")
+    parser.add_argument("--outdir", default="./cmb_images/")
+    parser.add_argument("--output", default=None,
+                        help="output file name in outdir")
+    parser.add_argument("--cols", type=int, default=None,
+                        help="lay the images out in a grid of this many "
+                             "columns")
+    parser.add_argument("--gap", type=int, default=0)
+    parser.add_argument("--strip-height", type=int, default=None,
+                        help="write the output in strips of this height")
+    args = parser.parse_args(args)
+    # 2枚を合体させる関数は出力先をdir_out + image_outで作るため末尾に区切りを付ける
+    outdir = os.path.join(args.outdir, "")
+    if len(args.images) == 2 and args.cols is None:
+        if args.vertical is True:
+            combine_vertically(args.images[0], args.images[1], outdir,
+                               args.output or "combine_vertically.png",
+                               strip_height=args.strip_height)
+        else:
+            combine_horizontally(args.images[0], args.images[1], outdir,
+                                 args.output or "combine_horizontally.png",
+                                 strip_height=args.strip_height)
+        return 0
+    os.makedirs(args.outdir, exist_ok=True)
+    cols = args.cols or math.ceil(math.sqrt(len(args.images)))
+    make_montage(args.images,
+                 os.path.join(args.outdir, args.output or "montage.png"),
+                 cols=cols, gap=args.gap, strip_height=args.strip_height)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
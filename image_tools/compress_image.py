@@ -0,0 +1,755 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# compress_image.py
+# 画像のサイズを小さくしつつ品質も変更することで圧縮する
+# 注意：当然だが画質が悪くなる！！
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import io
+import math
+import os
+import sys
+import time
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.incremental_manifest import load_manifest
+from image_tools.incremental_manifest import save_manifest
+from image_tools.incremental_manifest import skip_up_to_date
+from image_tools.incremental_manifest import update_manifest
+from image_tools.instrumentation import encode_image
+from image_tools.instrumentation import open_image
+from image_tools.instrumentation import save_image
+from image_tools.instrumentation import trace_image
+from image_tools.instrumentation import trace_listing
+from image_tools.instrumentation import write_bytes
+from image_tools.io_pipeline import source_size
+from image_tools.result_cache import print_cache_summary
+from image_tools.result_cache import with_cache
+from image_tools.scan_images import make_output_path
+from image_tools.scan_images import scan_images
+
+# PNGの最適化で試すzlibの圧縮方式(compress_type)の名前と値
+# (Pillowの既定はZ_FILTERED(1)なので，それ以外を試す)
+png_strategies = {"default": 0, "huffman": 2, "rle": 3, "fixed": 4}
+
+# PNGの最適化で試す減色後の色数
+png_palette_colors = [256, 128, 64]
+
+
+def draft_for_shrink(image_src_PIL, shrink):
+    """draft_for_shrink JPEGを1/shrink以上の大きさで最も小さい解像度でデコードするよう設定する
+
+    注意点:
+        デコード(load)の前に呼ぶ必要があり，JPEG以外やshrinkが整数でない場合は何もしない
+    """
+    if isinstance(shrink, int) and shrink > 1:
+        w, h = image_src_PIL.size
+        image_src_PIL.draft(image_src_PIL.mode, (w // shrink, h // shrink))
+
+
+def shrink_image(image_src_PIL, shrink, fast_decode=True,
+                 original_size=None):
+    """shrink_image 1枚の画像を1/shrinkのサイズに縮小する
+
+    Args:
+        image_src_PIL (PIL.Image.Image): 縮小前の画像(Image.openで開いただけのもの)
+        shrink (int): 何倍に縮小するかを定義(3だと1/3のサイズに縮小する)
+        fast_decode (bool, optional): shrinkが整数の場合に縮小した解像度で読み込むかどうか
+                                      デフォルトはTrue.
+        original_size (tuple, optional): draft_for_shrinkで縮小した解像度でデコード済みの
+                                         場合の元の幅と高さ，デフォルトはNone(image_src_PILの大きさ).
+
+    Returns:
+        PIL.Image.Image: 縮小後の画像
+
+    注意点:
+        fast_decode=Trueの場合，
+        JPEGはデコーダのdraftモード(DCTスケーリング)で1/2，1/4，1/8の解像度のまま読み込み，
+        残りの整数倍の縮小はImage.reduce(ボックスフィルタ)で行ってから，
+        最後に必要な場合だけresizeで目的のサイズに合わせる
+        (JPEG以外は元の解像度でデコードしてからImage.reduceで縮小する)
+    """
+    # 幅(w:width)と高さ(h:height)を取得
+    if original_size is None:
+        original_size = image_src_PIL.size
+    w, h = original_size
+    # 縮小(shrink)した幅(w:width)縮小した高さ(h:height)を定義
+    w_shrink = w // shrink
+    h_shrink = h // shrink
+    image_shrink_PIL = image_src_PIL
+    if fast_decode is True and isinstance(shrink, int) and shrink > 1:
+        # JPEGは縮小後のサイズ以上になる範囲で最も小さい解像度でデコードする
+        # (JPEG以外では何もしない)
+        draft_for_shrink(image_shrink_PIL, shrink)
+        # 残りの整数倍の縮小はボックスフィルタで行う
+        # (端の余りを除いた範囲を縮小すると，ちょうど目的のサイズになる)
+        # (パレット(P)や2値(1)の画像は画素値を平均できないのでresizeに任せる)
+        factor = min(image_shrink_PIL.width // w_shrink,
+                     image_shrink_PIL.height // h_shrink)
+        if factor > 1 and image_shrink_PIL.mode not in ["P", "1"]:
+            box = (0, 0, w_shrink * factor, h_shrink * factor)
+            image_shrink_PIL = image_shrink_PIL.reduce(factor, box=box)
+    # 画像サイズを縮小(shrink)した幅(w:width)縮小した高さ(h:height)に縮小
+    if image_shrink_PIL.size != (w_shrink, h_shrink):
+        image_shrink_PIL = image_shrink_PIL.resize((w_shrink, h_shrink))
+    return image_shrink_PIL
+
+
+def _encode(image_PIL, image_format, quality):
+    """_encode 画像をメモリ上(BytesIO)でエンコードし，バイト列を返す"""
+    buffer = io.BytesIO()
+    image_PIL.save(buffer, format=image_format, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def _search_quality(image_PIL, image_format, target_bytes,
+                    quality_max, quality_min):
+    """_search_quality 目標以下になる最も高い品質を二分探索する
+
+    Returns:
+        tuple: (目標以下になったエンコード結果の辞書(無ければNone)，
+                最も小さかったエンコード結果の辞書，試行回数)
+    """
+    # 品質の指定が効かない画像形式では品質を探索しない
+    if image_format not in ["JPEG", "WEBP", "JPEG2000", "AVIF"]:
+        quality_min = quality_max
+    found = None
+    smallest = None
+    trials = 0
+    low, high = quality_min, quality_max
+    while low <= high:
+        quality = (low + high) // 2
+        data = _encode(image_PIL, image_format, quality)
+        trials += 1
+        if smallest is None or len(data) < len(smallest["data"]):
+            smallest = {"data": data, "quality": quality}
+        if len(data) <= target_bytes:
+            found = {"data": data, "quality": quality}
+            low = quality + 1
+        else:
+            high = quality - 1
+    return found, smallest, trials
+
+
+def _scaled(image_PIL, scale):
+    """_scaled 画像をscale倍に縮小する(1画素未満になる場合はNone)"""
+    size = (int(image_PIL.width * scale), int(image_PIL.height * scale))
+    if size[0] < 1 or size[1] < 1:
+        return None
+    return image_PIL.resize(size)
+
+
+def encode_to_target_size(image_PIL, image_format, target_bytes,
+                          quality_max=95, quality_min=5, rescale=False,
+                          refine_steps=4):
+    """encode_to_target_size ファイルサイズが目標以下になる最も高い品質(と倍率)を探してエンコードする
+
+    Args:
+        image_PIL (PIL.Image.Image): エンコードする画像
+        image_format (str): 画像形式("JPEG"，"PNG"，"WEBP"など)
+        target_bytes (int): 目標のファイルサイズ(Byte)
+        quality_max (int, optional): 探索する品質の上限，デフォルトは95.
+        quality_min (int, optional): 探索する品質の下限，デフォルトは5.
+        rescale (bool, optional): 品質を下げても目標に届かない場合に画像を縮小するかどうか
+                                  デフォルトはFalse.
+        refine_steps (int, optional): 縮小した場合に倍率を二分探索で詰める回数，デフォルトは4.
+
+    Returns:
+        dict: エンコード結果("data")，品質("quality")，倍率("scale")，
+              エンコードの試行回数("trials")，目標に届いたかどうか("met")
+
+    注意点:
+        品質は二分探索で探し，エンコードは全てメモリ上で行う(ディスクには書かない)
+        縮小する場合は解像度を優先し，目標に届く最も大きい倍率で最も高い品質を選ぶ
+        PNGなど品質の指定が効かない画像形式では，rescale=Trueの場合に倍率だけを探す
+        目標に届かない場合は，試した中で最も小さいエンコード結果を返す
+    """
+    found, smallest, trials = _search_quality(
+        image_PIL, image_format, target_bytes, quality_max, quality_min)
+    if found is not None:
+        found.update({"scale": 1.0, "trials": trials, "met": True})
+        return found
+    smallest.update({"scale": 1.0, "met": False})
+    if rescale is False:
+        smallest["trials"] = trials
+        return smallest
+    # ------------------------------------------------------------------
+    # 目標に届くまで，ファイルサイズが画素数に比例するとみなして縮小し直す
+    # ------------------------------------------------------------------
+    scale_ng, scale = 1.0, 1.0
+    size_ng = len(smallest["data"])
+    while found is None:
+        scale = scale_ng * (target_bytes / size_ng) ** 0.5 * 0.95
+        image_scaled_PIL = _scaled(image_PIL, scale)
+        if image_scaled_PIL is None:
+            smallest["trials"] = trials
+            return smallest
+        found, smallest_scaled, n = _search_quality(
+            image_scaled_PIL, image_format, target_bytes,
+            quality_max, quality_min)
+        trials += n
+        if found is None:
+            scale_ng, size_ng = scale, len(smallest_scaled["data"])
+            if size_ng < len(smallest["data"]):
+                smallest = smallest_scaled
+                smallest.update({"scale": scale, "met": False})
+    found["scale"] = scale
+    # ------------------------------------------------------------------
+    # 目標に届いた倍率と届かなかった倍率の間を二分探索し，より大きい倍率を探す
+    # ------------------------------------------------------------------
+    scale_ok = scale
+    for _ in range(refine_steps):
+        scale = (scale_ok + scale_ng) / 2
+        found_scaled, _, n = _search_quality(
+            _scaled(image_PIL, scale), image_format, target_bytes,
+            quality_max, quality_min)
+        trials += n
+        if found_scaled is None:
+            scale_ng = scale
+        else:
+            scale_ok = scale
+            found = found_scaled
+            found["scale"] = scale
+    found.update({"trials": trials, "met": True})
+    return found
+
+
+def psnr(image_a_PIL, image_b_PIL):
+    """psnr 同じ大きさの2枚の画像のPSNR[dB]を返す(全ての画素が同じ場合はinf)
+
+    注意点:
+        モードが違う場合やRGB・RGBA・L以外の場合は，RGBAに揃えてから比べる
+    """
+    from PIL import ImageChops
+    from PIL import ImageStat
+    if image_a_PIL.mode != image_b_PIL.mode or \
+            image_a_PIL.mode not in ["RGB", "RGBA", "L"]:
+        image_a_PIL = image_a_PIL.convert("RGBA")
+        image_b_PIL = image_b_PIL.convert("RGBA")
+    stat = ImageStat.Stat(ImageChops.difference(image_a_PIL, image_b_PIL))
+    mse = sum(stat.sum2) / (len(stat.sum2) * image_a_PIL.width
+                            * image_a_PIL.height)
+    if mse == 0:
+        return math.inf
+    return 10 * math.log10(255 ** 2 / mse)
+
+
+def _exact_palette(image_PIL, colors):
+    """_exact_palette 色数が256以下のRGB・Lの画像を，色を変えずにパレット画像(P)にする"""
+    from PIL import Image
+    if image_PIL.mode == "L":
+        colors = [(c, c, c) for _, c in colors]
+        image_PIL = image_PIL.convert("RGB")
+    else:
+        colors = [c for _, c in colors]
+    palette_PIL = Image.new("P", (1, 1))
+    palette_PIL.putpalette([v for c in colors for v in c])
+    return image_PIL.quantize(palette=palette_PIL, dither=Image.Dither.NONE)
+
+
+def _quantized(colors):
+    """_quantized colors色に減色する関数を返す(RGBAはFASTOCTREE，それ以外はMEDIANCUT)"""
+    def quantize(image_PIL):
+        from PIL import Image
+        method = Image.Quantize.FASTOCTREE if image_PIL.mode == "RGBA" \
+            else Image.Quantize.MEDIANCUT
+        return image_PIL.quantize(colors=colors, method=method)
+    return quantize
+
+
+def png_candidates(image_PIL, quality=80, webp=False):
+    """png_candidates PNGの最適化で試す候補の一覧を返す
+
+    Args:
+        image_PIL (PIL.Image.Image): 保存する画像
+        quality (int, optional): WebP(非可逆)の品質，デフォルトは80.
+        webp (bool, optional): WebPも候補にするかどうか，デフォルトはFalse.
+
+    Returns:
+        list: (名前, 画像を変換する関数(無ければNone), 画像形式, 保存時の引数,
+               可逆かどうか)のリスト(最初はoptimize=Trueで保存するだけの基準)
+
+    注意点:
+        zlibの圧縮レベルと圧縮方式(compress_type)を変えた可逆の候補に加え，
+        色数が256以下なら色を変えないパレット画像，RGB・RGBA・Lなら減色したパレット画像を試す
+        PillowはPNGの行ごとのフィルタを選べないため，フィルタの違いは圧縮方式の違いで代える
+    """
+    from PIL import features
+    candidates = [("png-optimize", None, "PNG", {"optimize": True}, True),
+                  ("png-level6", None, "PNG", {"compress_level": 6}, True)]
+    for name, strategy in png_strategies.items():
+        candidates.append(("png-" + name, None, "PNG",
+                           {"compress_level": 9, "compress_type": strategy},
+                           True))
+    # 透明色(tRNS)を持つRGB・Lの画像はパレット画像にすると透明色が失われるため減色しない
+    palette = image_PIL.mode == "RGBA" or \
+        (image_PIL.mode in ["RGB", "L"]
+         and "transparency" not in image_PIL.info)
+    if palette is True and image_PIL.mode != "RGBA":
+        image_colors = image_PIL.getcolors(256)
+        if image_colors is not None:
+            candidates.append(("palette-exact",
+                               lambda image: _exact_palette(image,
+                                                            image_colors),
+                               "PNG", {"optimize": True}, True))
+    if palette is True:
+        for colors in png_palette_colors:
+            candidates.append(("palette-" + str(colors), _quantized(colors),
+                               "PNG", {"optimize": True}, False))
+    # WebPは8bitのRGB(A)で保存するため，16bitなどの画像では試さない
+    if webp is True and features.check("webp") and \
+            image_PIL.mode in ["RGB", "RGBA", "L", "P"]:
+        candidates.append(("webp-lossless", None, "WEBP",
+                           {"lossless": True, "quality": 100}, True))
+        candidates.append(("webp-q" + str(quality), None, "WEBP",
+                           {"quality": quality}, False))
+    return candidates
+
+
+def _encode_candidate(image_PIL, candidate):
+    """_encode_candidate 1つの候補でメモリ上にエンコードし，PSNRを測る
+
+    Returns:
+        dict: 名前("candidate")，画像形式("format")，バイト列("data")，PSNR[dB]("psnr")
+    """
+    from PIL import Image
+    name, convert, image_format, params, lossless = candidate
+    # Image.saveは画像に保存時の設定を書き込むため，スレッドごとに別の画像を使う
+    image_dst_PIL = image_PIL.copy() if convert is None \
+        else convert(image_PIL)
+    # 減色した画像やWebPにも色空間(ICCプロファイル)を引き継ぐ
+    if "icc_profile" in image_PIL.info:
+        params = dict(params, icc_profile=image_PIL.info["icc_profile"])
+    buffer = io.BytesIO()
+    image_dst_PIL.save(buffer, format=image_format, **params)
+    data = buffer.getvalue()
+    # 非可逆の候補はデコードし直して元の画像と比べる
+    value = math.inf
+    if lossless is False:
+        with Image.open(io.BytesIO(data)) as decoded_PIL:
+            decoded_PIL.load()
+            value = psnr(image_PIL, decoded_PIL)
+    return {"candidate": name, "format": image_format, "data": data,
+            "psnr": value}
+
+
+def optimize_png(image_PIL, min_psnr=40.0, webp=False, quality=80,
+                 threads=None):
+    """optimize_png PNGの候補を並列にエンコードし，PSNRが基準以上で最も小さいものを返す
+
+    Args:
+        image_PIL (PIL.Image.Image): 保存する画像
+        min_psnr (float, optional): 非可逆の候補に求めるPSNR[dB]の下限，デフォルトは40.0.
+        webp (bool, optional): WebPも候補にするかどうか，デフォルトはFalse.
+        quality (int, optional): WebP(非可逆)の品質，デフォルトは80.
+        threads (int, optional): 並列にエンコードするスレッド数，デフォルトはNone(CPU数).
+
+    Returns:
+        dict: 選んだ候補の名前("candidate")，画像形式("format")，バイト列("data")，
+              PSNR[dB]("psnr")，基準(optimize=True)のバイト数("baseline")，
+              試した候補の数("trials")，かかった時間[s]("seconds")
+
+    注意点:
+        Pillowの減色とエンコードは処理中にGILを解放するため，スレッドでも並列になる
+        どの候補も基準を満たさない場合も，可逆の基準(optimize=True)が必ず残る
+    """
+    start = time.perf_counter()
+    image_PIL.load()
+    candidates = png_candidates(image_PIL, quality, webp)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda c: _encode_candidate(image_PIL, c),
+                                    candidates))
+    best = None
+    for result in results:
+        if result["psnr"] < min_psnr:
+            continue
+        if best is None or len(result["data"]) < len(best["data"]):
+            best = result
+    best.update({"baseline": len(results[0]["data"]),
+                 "trials": len(results),
+                 "seconds": time.perf_counter() - start})
+    return best
+
+
+def compress_one_image(image_src, image_dst, shrink, quality,
+                       fast_decode=True, target_bytes=None, rescale=False,
+                       png_optimize=None):
+    """compress_one_image 1枚の画像のサイズを小さくしつつ品質も変更することで圧縮する
+
+    Args:
+        image_src (str): 圧縮前の画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 圧縮後の画像ファイル(相対パス・拡張子付き)
+        shrink (int): 何倍に縮小するかを定義(3だと1/3のサイズに縮小する)
+        quality (int): 圧縮後の品質(target_bytesを指定した場合は探索する品質の上限)
+        fast_decode (bool, optional): 縮小した解像度で読み込むかどうか(デフォルトはTrue)
+        target_bytes (int, optional): 目標のファイルサイズ(Byte)，デフォルトはNone(指定しない).
+        rescale (bool, optional): 目標に届かない場合に更に縮小するかどうか(デフォルトはFalse)
+        png_optimize (dict, optional): PNGで保存する場合にoptimize_pngに渡す引数
+                                       (例: {"min_psnr": 40.0, "webp": True})
+                                       デフォルトはNone(optimize=Trueで保存するだけ).
+
+    Returns:
+        dict: target_bytesを指定した場合は品質("quality")，倍率("scale")，
+              試行回数("trials")，目標に届いたかどうか("met")，ファイルサイズ("size")
+              png_optimizeで最適化した場合は選んだ候補("candidate")，ファイルサイズ("size")，
+              基準のファイルサイズ("baseline")，元のファイルサイズ("input")，
+              PSNR("psnr"，可逆の候補はJSONにできるようにinfではなくNone)，
+              候補の数("trials")，時間[s]("seconds")，出力先("output")
+              それ以外の場合はNone
+
+    注意点:
+        png_optimizeでWebPが選ばれた場合は，拡張子を.webpに変えて保存する
+    """
+    from PIL import Image
+    with trace_image("compress_image", image_src, image_dst) as trace:
+        # 圧縮前の画像ファイル(相対パス・拡張子付き)をPillow(PIL)で読み込み
+        with trace.stage("decode"):
+            image_src_PIL = open_image(image_src, trace)
+            original_size = image_src_PIL.size
+            if fast_decode is True:
+                draft_for_shrink(image_src_PIL, shrink)
+            image_src_PIL.load()
+        # 画像サイズを1/shrinkに縮小
+        with trace.stage("transform"):
+            image_shrink_PIL = shrink_image(image_src_PIL, shrink,
+                                            fast_decode, original_size)
+        extension = os.path.splitext(image_dst)[1].lower()
+        image_format = Image.registered_extensions()[extension]
+        # PNGを最適化する場合は，候補の中から最も小さいものを選んで1回だけ書き込む
+        if target_bytes is None and png_optimize is not None and \
+                image_format == "PNG":
+            with trace.stage("encode"):
+                optimized = optimize_png(image_shrink_PIL, quality=quality,
+                                         **png_optimize)
+            trace.add_pixels(image_shrink_PIL)
+            if optimized["format"] == "WEBP":
+                image_dst = os.path.splitext(image_dst)[0] + ".webp"
+            write_bytes(optimized["data"], image_dst, trace)
+            return {"candidate": optimized["candidate"],
+                    "size": len(optimized["data"]),
+                    "baseline": optimized["baseline"],
+                    "input": source_size(image_src),
+                    "psnr": None if math.isinf(optimized["psnr"])
+                    else optimized["psnr"],
+                    "trials": optimized["trials"],
+                    "seconds": optimized["seconds"], "output": image_dst}
+        # 目標のファイルサイズが無い場合は，縮小した画像をqualityの質で保存
+        if target_bytes is None:
+            save_image(image_shrink_PIL, image_dst, trace, quality=quality,
+                       optimize=True)
+            return None
+        # 目標のファイルサイズがある場合は，目標以下になる品質を探してから1回だけ書き込む
+        with trace.stage("encode"):
+            encoded = encode_to_target_size(image_shrink_PIL, image_format,
+                                            target_bytes, quality_max=quality,
+                                            rescale=rescale)
+        trace.add_pixels(image_shrink_PIL)
+        write_bytes(encoded["data"], image_dst, trace)
+    return {"quality": encoded["quality"], "scale": encoded["scale"],
+            "trials": encoded["trials"], "met": encoded["met"],
+            "size": len(encoded["data"])}
+
+
+def pyramid_dir_name(shrink):
+    """pyramid_dir_name 複数の大きさに縮小する場合の，大きさごとの出力先のサブディレクトリ名を返す"""
+    return "shrink" + str(shrink)
+
+
+def compress_one_image_to_pyramid(image_src, image_dsts, shrinks, quality,
+                                  fast_decode=True, encode_threads=1):
+    """compress_one_image_to_pyramid 1枚の画像を1回だけデコードし，複数の大きさに縮小して圧縮する
+
+    Args:
+        image_src (str): 圧縮前の画像ファイル(相対パス・拡張子付き)
+        image_dsts (list): 圧縮後の画像ファイル(大きさごと，相対パス・拡張子付き)のリスト
+        shrinks (list): 何倍に縮小するかのリスト(例: [2, 4, 8, 16]，小さい順)
+        quality (int): 圧縮後の品質
+        fast_decode (bool, optional): JPEGを最も大きい出力の大きさに近い解像度でデコードするか
+                                      どうか(デフォルトはTrue)
+        encode_threads (int, optional): 縮小した画像を並列に保存するスレッド数(デフォルトは1)
+
+    注意点:
+        2番目以降の大きさは元の画像ではなく1つ前の大きさの画像から縮小する
+        (倍率が整数倍ならImage.reduce，[2, 4, 8, 16]ならreduce(2)を繰り返す)
+        出力の大きさはshrinkごとにcompress_one_imageで縮小した場合と同じ
+    """
+    with trace_image("compress_image", image_src, image_dsts[0]) as trace:
+        # 圧縮前の画像ファイルを，最も大きい出力に必要な解像度で1回だけデコード
+        with trace.stage("decode"):
+            image_src_PIL = open_image(image_src, trace)
+            original_size = image_src_PIL.size
+            if fast_decode is True:
+                draft_for_shrink(image_src_PIL, shrinks[0])
+            image_src_PIL.load()
+
+        # 1つ前の大きさの画像から順に縮小し，縮小できたものから保存する
+        # (Pillowの圧縮処理はGILを解放するため，次の縮小とエンコードをスレッドで重ねられる．
+        # パイプライン実行の出力はスレッドごとに記録するため，書き込みはこのスレッドで行う)
+        with ThreadPoolExecutor(max_workers=max(1, encode_threads)) \
+                as executor:
+            futures = []
+            image_PIL = image_src_PIL
+            for shrink, image_dst in zip(shrinks, image_dsts):
+                with trace.stage("transform"):
+                    image_PIL = shrink_image(image_PIL, shrink, True,
+                                             original_size)
+                if encode_threads <= 1:
+                    save_image(image_PIL, image_dst, trace, quality=quality,
+                               optimize=True)
+                else:
+                    futures.append((executor.submit(
+                        encode_image, image_PIL, image_dst, trace,
+                        quality=quality, optimize=True), image_dst))
+            for future, image_dst in futures:
+                write_bytes(future.result(), image_dst, trace)
+
+
+def print_png_report(report):
+    """print_png_report PNGの最適化の結果(選んだ候補，削減できたバイト数，時間)を表示する
+
+    Args:
+        report (dict): compress_one_imageがpng_optimizeで最適化した場合の戻り値
+    """
+    saved = report["input"] - report["size"]
+    print(" size: " + str(report["size"]) + " B"
+          + ", saved: " + str(saved) + " B ("
+          + str(round(100 * saved / max(1, report["input"]), 1)) + " %)"
+          + ", vs optimize=True: "
+          + str(report["baseline"] - report["size"]) + " B"
+          + ", candidate: " + report["candidate"]
+          + ", psnr: " + ("lossless" if report["psnr"] is None
+                          else str(round(report["psnr"], 1)) + " dB")
+          + ", trials: " + str(report["trials"])
+          + ", time: " + str(round(report["seconds"] * 1000)) + " ms")
+
+
+def compress_image(indir, outdir, shrink, quality, extension="png",
+                   jobs=1, chunksize=1, recursive=False, sniff=False,
+                   incremental=False, content_hash=False, fast_decode=True,
+                   target_bytes=None, rescale=False, cache=None,
+                   png_optimize=None, encode_threads=1):
+    """compress_image 複数枚の画像のサイズを小さくしつつ品質も変更することで圧縮する
+
+    Args:
+        indir (str): 圧縮前の画像ファイルをまとめて置いているディレクトリ
+        outdir (str): 圧縮後の画像ファイルをまとめて置くディレクトリ
+        shrink (int または list): 何倍に縮小するかを定義(3だと1/3のサイズに縮小する)
+                                  (リスト(例: [2, 4, 8, 16])の場合は全ての大きさを出力する)
+        quality (int): 圧縮後の品質
+        extension (str または list, optional): 変換前の拡張子(デフォルトは"png")
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        incremental (bool, optional): 出力済みで変更の無い画像の処理を省略するかどうか
+                                      (デフォルトはFalse)
+        content_hash (bool, optional): incremental=Trueの場合に内容のハッシュ値でも判定するか
+                                       どうか(デフォルトはFalse)
+        fast_decode (bool, optional): shrinkが整数の場合に縮小した解像度で読み込むかどうか
+                                      (デフォルトはTrue)
+        target_bytes (int, optional): 1枚あたりの目標のファイルサイズ(Byte)
+                                      指定した場合はqualityを上限として品質を探索する
+                                      (デフォルトはNoneで，qualityの質でそのまま保存)
+        rescale (bool, optional): target_bytesの指定時に品質を下げても目標に届かない場合
+                                  更に縮小するかどうか(デフォルトはFalse)
+        cache (ResultCache, optional): 処理結果のキャッシュ(result_cache.py)
+                                       デフォルトはNone(--cacheで設定したもの，無ければ使わない).
+        png_optimize (dict, optional): PNGで保存する場合にoptimize_pngに渡す引数
+                                       (例: {"min_psnr": 40.0, "webp": True})
+                                       デフォルトはNone(optimize=Trueで保存するだけ).
+        encode_threads (int, optional): shrinkがリストの場合に，1枚の画像から縮小した画像を
+                                        並列に保存するスレッド数(デフォルトは1)
+
+    Returns:
+        list: 圧縮に失敗した(画像ファイル, エラー内容)のリスト
+
+    注意点:
+        圧縮前の画像と圧縮後の対応は1対1
+        shrinkがリストの場合は，各画像を1回だけデコードして1つ前の大きさから順に縮小し，
+        outdir/shrink倍率/画像 に保存する(target_bytes・png_optimizeとは一緒に使えない)
+        png_optimizeでWebPを候補にする場合は出力先の拡張子が変わるため，
+        incremental・cacheと一緒には使えない
+        同じディレクトリの同じ拡張子であれば1枚以上に対して実行可能
+        動作例: indir/1.画像 --> outdir/1.画像, indir/2.画像 --> outdir/2.画像
+    """
+    # 変換前(元の拡張子)の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("compress_image",
+                           scan_images(indir, extension, recursive, sniff))
+    # 圧縮後の画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    # PNGの最適化の候補を並列にエンコードするスレッド数は，プロセス数で分け合う
+    webp = png_optimize is not None and png_optimize.get("webp", False)
+    png_params = None
+    if png_optimize is not None:
+        png_params = {k: v for k, v in png_optimize.items() if k != "threads"}
+        cpus = os.cpu_count() or 1
+        png_optimize = dict({"threads": max(1, cpus // (jobs or cpus))},
+                            **png_optimize)
+    sniff_dir = indir if sniff is True else None
+    if isinstance(shrink, (list, tuple)):
+        if target_bytes is not None or png_optimize is not None:
+            raise ValueError("a list of shrink cannot be combined with "
+                             "target_bytes or png_optimize")
+        # 複数の大きさに縮小する場合は，大きさごとのサブディレクトリへ出力する
+        shrink = sorted(set(shrink))
+        for s in shrink:
+            os.makedirs(os.path.join(outdir, pyramid_dir_name(s)),
+                        exist_ok=True)
+        items = ((os.path.join(indir, image),
+                  [make_output_path(os.path.join(outdir, pyramid_dir_name(s)),
+                                    image, sniff_dir) for s in shrink],
+                  shrink, quality, fast_decode, encode_threads)
+                 for image in images)
+        compress_func = compress_one_image_to_pyramid
+    else:
+        # 画像1枚ずつに対する圧縮の引数(圧縮前・圧縮後の画像ファイルなど)を定義
+        items = ((os.path.join(indir, image),
+                  make_output_path(outdir, image, sniff_dir),
+                  shrink, quality, fast_decode, target_bytes, rescale,
+                  png_optimize)
+                 for image in images)
+        compress_func = compress_one_image
+    # 変更の無い画像の処理を省略する場合は，マニフェストで出力済みの画像を取り除く
+    params = {"operation": "compress_image",
+              "shrink": shrink, "quality": quality,
+              "fast_decode": fast_decode,
+              "target_bytes": target_bytes, "rescale": rescale,
+              "png_optimize": png_params}
+    skipped = []
+    if incremental is True:
+        manifest = load_manifest(outdir)
+        items = skip_up_to_date(items, outdir, manifest, params, skipped,
+                                content_hash)
+    # 同じ画像に同じ圧縮をしたことがあればキャッシュからコピーする
+    compress_func, cache = with_cache(compress_func, params, cache)
+    if webp is True and (incremental is True or cache is not None):
+        raise ValueError("WebP candidates cannot be used with incremental "
+                         "or cache because they change the output extension")
+    if cache is not None:
+        cache_stats = cache.stats()
+    # PNGを最適化した場合の合計(元のファイルサイズ，最適化後のファイルサイズ，枚数)
+    png_totals = {"input": 0, "size": 0, "images": 0}
+    # 画像1枚ずつに対して圧縮を(並列に)実施
+    errors = []
+    try:
+        for result in run_batch(compress_func, items, jobs, chunksize):
+            image_src, image_dst = result.args[0], result.args[1]
+            if result.error is not None:
+                # 圧縮に失敗した画像は記録しておき，残りの画像の圧縮は続ける
+                errors.append((image_src, result.error))
+                continue
+            # 処理が終わった画像をマニフェストに記録する
+            if incremental is True:
+                update_manifest(outdir, manifest, image_src, image_dst,
+                                params, content_hash)
+            # どの画像が圧縮されたのか表示(WebPで保存した場合はその出力先)
+            if result.value is not None and "output" in result.value:
+                image_dst = result.value["output"]
+            if isinstance(image_dst, list):
+                image_dst = os.path.join(outdir, "*",
+                                         os.path.relpath(image_src, indir))
+            print("Compress: ", image_src + " --> " + image_dst)
+            # PNGを最適化した場合は選んだ候補と削減できたバイト数も表示
+            if result.value is not None and "candidate" in result.value:
+                print_png_report(result.value)
+                for key in ["input", "size"]:
+                    png_totals[key] += result.value[key]
+                png_totals["images"] += 1
+            # 目標のファイルサイズがある場合は探索の結果(試行回数など)も表示
+            elif result.value is not None:
+                print(" size: " + str(result.value["size"]) + " B"
+                      + ", quality: " + str(result.value["quality"])
+                      + ", scale: " + str(round(result.value["scale"], 3))
+                      + ", trials: " + str(result.value["trials"])
+                      + ("" if result.value["met"] else " (target not met)"))
+    finally:
+        # 途中で止まった場合もそこまでの記録が残るようにマニフェストを保存する
+        if incremental is True:
+            save_manifest(outdir, manifest)
+    # 処理を省略した画像があれば枚数を表示する
+    if len(skipped) > 0:
+        print("Skip: ", str(len(skipped)) + " images are up to date")
+    # キャッシュを使った場合はヒットした枚数を表示する
+    if cache is not None:
+        print_cache_summary(cache, cache_stats)
+    # PNGを最適化した場合は合計で削減できたバイト数を表示する
+    if png_totals["images"] > 0:
+        saved = png_totals["input"] - png_totals["size"]
+        print("PNG: ", "saved {:.2f} MB of {:.2f} MB ({:.1f} %) in {} images"
+              .format(saved / 1024 ** 2, png_totals["input"] / 1024 ** 2,
+                      100 * saved / max(1, png_totals["input"]),
+                      png_totals["images"]))
+    # 圧縮に失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像について圧縮が終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+# ----------------------------------------------------------------------
+# サイズを1/6に縮小し,保存する画像の品質を50にする
+# indir/画像 --> outdir/画像
+# 注意：画質悪くなるのでパラメータの値は調整が必要...
+# 並列数は "image-tools compress --jobs 8" のように指定する
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから圧縮を実行する(image-tools compress)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="shrink and recompress images")
+    parser.add_argument("indir", nargs="?", default="./src_images/")
+    parser.add_argument("outdir", nargs="?", default="./cmp_images/")
+    parser.add_argument("--extension", nargs="+", default=["png"])
+    parser.add_argument("--shrink", type=int, nargs="+", default=[6],
+                        help="several values (e.g. 2 4 8 16) write every "
+                             "size from one decode into outdir/shrinkN/")
+    parser.add_argument("--quality", type=int, default=50)
+    parser.add_argument("--target-bytes", type=int, default=None,
+                        help="search the quality for this file size")
+    parser.add_argument("--rescale", action="store_true",
+                        help="with --target-bytes, also shrink further "
+                             "when the lowest quality is still too large")
+    parser.add_argument("--png-optimize", action="store_true",
+                        help="keep the smallest of several PNG encodings")
+    parser.add_argument("--min-psnr", type=float, default=40.0,
+                        help="lowest PSNR [dB] accepted for lossy PNG "
+                             "candidates (default: 40)")
+    parser.add_argument("--webp", action="store_true",
+                        help="also try WebP with --png-optimize")
+    parser.add_argument("--encode-threads", type=int, default=1,
+                        help="threads saving the sizes of one image "
+                             "(with several --shrink values)")
+    args = parse_batch_args(args, parser, incremental=True)
+    if args.rescale is True and args.target_bytes is None:
+        parser.error("--rescale needs --target-bytes")
+    if args.webp is True and \
+            (args.cache is not None or args.incremental is True):
+        parser.error("--webp cannot be used with --cache or --incremental")
+    shrink = args.shrink[0] if len(args.shrink) == 1 else args.shrink
+    if isinstance(shrink, list) and \
+            (args.target_bytes is not None or args.png_optimize is True):
+        parser.error("several --shrink values cannot be used with "
+                     "--target-bytes or --png-optimize")
+    png_optimize = None
+    if args.png_optimize is True:
+        png_optimize = {"min_psnr": args.min_psnr, "webp": args.webp}
+    errors = compress_image(args.indir, args.outdir, shrink,
+                            args.quality, args.extension,
+                            jobs=args.jobs, chunksize=args.chunksize,
+                            recursive=args.recursive, sniff=args.sniff,
+                            incremental=args.incremental,
+                            content_hash=args.content_hash,
+                            target_bytes=args.target_bytes,
+                            rescale=args.rescale,
+                            png_optimize=png_optimize,
+                            encode_threads=args.encode_threads)
+    return 1 if len(errors) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
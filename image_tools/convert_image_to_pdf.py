@@ -0,0 +1,531 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# convert_image_to_pdf.py
+# 画像を同じファイル名のpdfに変換する
+# または複数枚の画像を1個(または複数の分冊)のpdfにまとめる
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+import argparse
+import io
+import os
+import sys
+import zlib
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.incremental_manifest import load_manifest
+from image_tools.incremental_manifest import save_manifest
+from image_tools.incremental_manifest import skip_up_to_date
+from image_tools.incremental_manifest import update_manifest
+from image_tools.instrumentation import trace_image
+from image_tools.instrumentation import trace_listing
+from image_tools.instrumentation import write_bytes
+from image_tools.io_pipeline import read_bytes
+from image_tools.io_pipeline import read_source
+from image_tools.scan_images import make_output_path
+from image_tools.scan_images import scan_images
+
+# 白色のRGB
+white_rgb = (255, 255, 255)
+
+
+def convert_one_image2pdf(image_src, image_dst):
+    """convert_one_image2pdf 1枚の画像を1個のpdfに変換する
+
+    Args:
+        image_src (str): 変換前の画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 変換後のpdfファイル(相対パス・拡張子付き)
+    """
+    with trace_image("convert_image2pdf", image_src, image_dst) as trace:
+        # 画像をpdfに変換(変換に失敗した場合に空のpdfが残らないように，変換してから開く)
+        trace.add_read(image_src)
+        with trace.stage("encode"):
+            # img2pdfは読み込みに時間がかかるため，1枚ずつのpdfに変換する場合だけ読み込む
+            import img2pdf
+            image_pdf = img2pdf.convert(read_bytes(image_src))
+        write_bytes(image_pdf, image_dst, trace)
+
+
+def convert_image2pdf(indir, outdir, extension="png", jobs=1, chunksize=1,
+                      recursive=False, sniff=False,
+                      incremental=False, content_hash=False):
+    """convert_image2pdf 複数枚の画像を同じファイル名の複数個のpdfに変換する
+
+    Args:
+        indir (str): 変換前の画像ファイルをまとめて置いているディレクトリ
+        outdir (str): pdfに変換したものをまとめて置くディレクトリ
+        extension (str または list, optional): 変換前の拡張子(デフォルトは"png")
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        incremental (bool, optional): 出力済みで変更の無い画像の処理を省略するかどうか
+                                      (デフォルトはFalse)
+        content_hash (bool, optional): incremental=Trueの場合に内容のハッシュ値でも判定するか
+                                       どうか(デフォルトはFalse)
+
+    Returns:
+        list: 変換に失敗した(画像ファイル, エラー内容)のリスト
+
+    注意点:
+        画像とpdfの対応は1対1
+        同じディレクトリの同じ拡張子であれば1枚以上に対して実行可能
+        動作例: indir/1.画像 --> outdir/1.pdf, indir/2.画像 --> outdir/2.pdf
+    """
+    # 変換前(元の拡張子)の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("convert_image2pdf",
+                           scan_images(indir, extension, recursive, sniff))
+    # pdfをまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    # 画像1枚ずつに対する変換の引数(変換前の画像ファイル・変換後のpdfファイル)を定義
+    # (pdfファイル名は画像ファイル名(パス無し・拡張子無し)に".pdf"を付加したもの)
+    items = ((os.path.join(indir, image),
+              make_output_path(outdir, os.path.splitext(image)[0] + ".pdf"))
+             for image in images)
+    # 変更の無い画像の処理を省略する場合は，マニフェストで出力済みの画像を取り除く
+    params = {"operation": "convert_image2pdf"}
+    skipped = []
+    if incremental is True:
+        manifest = load_manifest(outdir)
+        items = skip_up_to_date(items, outdir, manifest, params, skipped,
+                                content_hash)
+    # 画像1枚ずつに対してpdfへの変換を(並列に)実施
+    errors = []
+    try:
+        for result in run_batch(convert_one_image2pdf, items, jobs, chunksize):
+            image_src, image_dst = result.args
+            if result.error is not None:
+                # 変換に失敗した画像は記録しておき，残りの画像の変換は続ける
+                errors.append((image_src, result.error))
+                continue
+            # 処理が終わった画像をマニフェストに記録する
+            if incremental is True:
+                update_manifest(outdir, manifest, image_src, image_dst,
+                                params, content_hash)
+            # どの画像がpdfに変換されたのか表示
+            print("Convert: ", image_src + " --> " + image_dst)
+    finally:
+        # 途中で止まった場合もそこまでの記録が残るようにマニフェストを保存する
+        if incremental is True:
+            save_manifest(outdir, manifest)
+    # 処理を省略した画像があれば枚数を表示する
+    if len(skipped) > 0:
+        print("Skip: ", str(len(skipped)) + " images are up to date")
+    # 変換に失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像についてpdfへの変換が終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+# pdfの画像の色空間とPillow(PIL)のモードの対応
+pdf_colorspaces = {
+    "L": "/DeviceGray",
+    "RGB": "/DeviceRGB",
+}
+
+
+def _page_size(image_PIL, default_dpi):
+    """_page_size 画像の解像度からpdfのページの幅と高さ[pt]を求める"""
+    dpi = image_PIL.info.get("dpi", (default_dpi, default_dpi))
+    dpi = [d if d > 0 else default_dpi for d in dpi]
+    return (image_PIL.width * 72 / dpi[0], image_PIL.height * 72 / dpi[1])
+
+
+def image_to_pdf_page(image_PIL, default_dpi=96, quality=None):
+    """image_to_pdf_page メモリ上の画像をpdfの1ページに埋め込む画像データ(ストリーム)に変換する
+
+    Args:
+        image_PIL (PIL.Image.Image): 変換前の画像
+        default_dpi (int, optional): 画像に解像度の情報が無い場合の解像度，デフォルトは96.
+        quality (int, optional): 指定した場合はこの品質でJPEGにエンコードして埋め込む
+                                 (DCTDecode)，デフォルトはNone(zlibで圧縮する).
+
+    Returns:
+        dict: prepare_pdf_pageと同じ形の辞書
+
+    注意点:
+        透過(アルファチャンネル)のある画像は白色の背景に重ねてから埋め込む
+    """
+    from PIL import Image
+    page_size = _page_size(image_PIL, default_dpi)
+    # 透過のある画像は白色の背景に重ね，それ以外はグレースケールかRGBにする
+    if image_PIL.mode in ["RGBA", "LA", "PA"] or \
+            (image_PIL.mode == "P" and "transparency" in image_PIL.info):
+        image_rgba_PIL = image_PIL.convert("RGBA")
+        image_page_PIL = Image.new("RGB", image_PIL.size, white_rgb)
+        image_page_PIL.paste(image_rgba_PIL, (0, 0), image_rgba_PIL)
+    elif image_PIL.mode in ["1", "L"]:
+        image_page_PIL = image_PIL.convert("L")
+    else:
+        image_page_PIL = image_PIL.convert("RGB")
+    if quality is not None:
+        buffer = io.BytesIO()
+        image_page_PIL.save(buffer, format="JPEG", quality=quality)
+        pdf_filter, data = "/DCTDecode", buffer.getvalue()
+    else:
+        pdf_filter, data = "/FlateDecode", zlib.compress(
+            image_page_PIL.tobytes())
+    return {"width": image_PIL.width, "height": image_PIL.height,
+            "page size": page_size,
+            "colorspace": pdf_colorspaces[image_page_PIL.mode],
+            "filter": pdf_filter, "data": data}
+
+
+def prepare_pdf_page(image_src, default_dpi=96):
+    """prepare_pdf_page 1枚の画像をpdfの1ページに埋め込む画像データ(ストリーム)に変換する
+
+    Args:
+        image_src (str): 変換前の画像ファイル(相対パス・拡張子付き)
+        default_dpi (int, optional): 画像に解像度の情報が無い場合の解像度，デフォルトは96.
+
+    Returns:
+        dict: 幅と高さ[px]("width"，"height")，ページの幅と高さ[pt]("page size")，
+              色空間("colorspace")，圧縮方式("filter")，画像データ("data")
+
+    注意点:
+        JPEG(グレースケールまたはRGB)は再エンコードせずにそのまま埋め込む(DCTDecode)
+        それ以外は画素データをzlibで圧縮して埋め込む(FlateDecode)
+        透過(アルファチャンネル)のある画像は白色の背景に重ねてから埋め込む
+    """
+    from PIL import Image
+    with trace_image("combine_images2pdf", image_src) as trace, \
+            Image.open(read_source(image_src)) as image_PIL:
+        trace.add_read(image_src)
+        # JPEGは元のファイルのバイト列をそのまま使う
+        if image_PIL.format == "JPEG" and image_PIL.mode in pdf_colorspaces:
+            data = read_bytes(image_src)
+            return {"width": image_PIL.width, "height": image_PIL.height,
+                    "page size": _page_size(image_PIL, default_dpi),
+                    "colorspace": pdf_colorspaces[image_PIL.mode],
+                    "filter": "/DCTDecode", "data": data}
+        with trace.stage("decode"):
+            image_PIL.load()
+        trace.add_pixels(image_PIL)
+        with trace.stage("encode"):
+            return image_to_pdf_page(image_PIL, default_dpi)
+
+
+class StreamingPdfWriter:
+    """StreamingPdfWriter ページを1枚ずつファイルに書き出していくpdfの書き込み
+
+    注意点:
+        各ページの画像データは追加したときにファイルへ書き出すため，
+        メモリ上に残るのは各オブジェクトの位置(オフセット)とページの番号だけである
+    """
+
+    def __init__(self, path):
+        """__init__ pdfのファイルを開き，ヘッダを書き込む
+
+        Args:
+            path (str): 書き込むpdfファイル
+        """
+        self.path = path
+        self.f = open(path, "wb")
+        # オブジェクト番号ごとのファイル先頭からの位置(1番はページの一覧に予約)
+        self.offsets = {}
+        self.next_id = 2
+        self.pages_id = 1
+        self.page_ids = []
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write_object(self, body, stream=None, object_id=None):
+        """_write_object オブジェクト(必要ならストリーム付き)を書き込み，その番号を返す"""
+        if object_id is None:
+            object_id = self.next_id
+            self.next_id += 1
+        self.offsets[object_id] = self.f.tell()
+        for data in _object_parts(object_id, body, stream):
+            self.f.write(data)
+        return object_id
+
+    def _page_objects(self, page, image_id):
+        """_page_objects 1ページ分の(画像・内容・ページの)オブジェクトの一覧を返す
+
+        Args:
+            page (dict): prepare_pdf_pageの戻り値
+            image_id (int): 画像のオブジェクト番号(内容とページは続く番号にする)
+
+        Returns:
+            list: (本体の辞書, ストリーム)を書き込む順に並べたリスト
+        """
+        page_width, page_height = page["page size"]
+        content = ("q %.4f 0 0 %.4f 0 0 cm /Im0 Do Q" % (
+            page_width, page_height)).encode("ascii")
+        return [
+            ("<< /Type /XObject /Subtype /Image"
+             " /Width %d /Height %d /ColorSpace %s /BitsPerComponent 8"
+             " /Filter %s /Length %d >>" % (
+                 page["width"], page["height"], page["colorspace"],
+                 page["filter"], len(page["data"])), page["data"]),
+            ("<< /Length %d >>" % len(content), content),
+            ("<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.4f %.4f]"
+             " /Resources << /XObject << /Im0 %d 0 R >> >>"
+             " /Contents %d 0 R >>" % (
+                 self.pages_id, page_width, page_height, image_id,
+                 image_id + 1), None),
+        ]
+
+    def _closing_bytes(self, page_ids, next_id, xref_offset=0):
+        """_closing_bytes ページの一覧・カタログ・相互参照表(xref)のバイト列を返す
+
+        Args:
+            page_ids (list): 全ページのオブジェクト番号
+            next_id (int): カタログに使うオブジェクト番号
+            xref_offset (int, optional): 相互参照表の位置(見積もりでは0でよい)
+
+        Returns:
+            tuple: (ページの一覧, カタログ, 相互参照表とトレーラ)のバイト列
+        """
+        kids = " ".join("%d 0 R" % page_id for page_id in page_ids)
+        pages = _object_bytes(
+            self.pages_id, "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+                kids, len(page_ids)))
+        catalog = _object_bytes(
+            next_id, "<< /Type /Catalog /Pages %d 0 R >>" % self.pages_id)
+        # 相互参照表は1個のオブジェクトあたり20Byte(0番の空きを含む)
+        xref = ["xref\n0 %d\n" % (next_id + 1), "0000000000 65535 f \n"]
+        for object_id in range(1, next_id + 1):
+            xref.append("%010d 00000 n \n" % self.offsets.get(object_id, 0))
+        xref.append("trailer\n<< /Size %d /Root %d 0 R >>\n"
+                    "startxref\n%d\n%%%%EOF\n" % (
+                        next_id + 1, next_id, xref_offset))
+        return pages, catalog, "".join(xref).encode("ascii")
+
+    def add_page(self, page):
+        """add_page prepare_pdf_pageで変換した画像データを1ページとして書き込む
+
+        Args:
+            page (dict): prepare_pdf_pageの戻り値
+        """
+        for body, stream in self._page_objects(page, self.next_id):
+            page_id = self._write_object(body, stream)
+        self.page_ids.append(page_id)
+
+    def projected_size(self, page):
+        """projected_size このページを追加して閉じた場合のファイルサイズ(Byte)を返す
+
+        Args:
+            page (dict): prepare_pdf_pageの戻り値
+
+        注意点:
+            ページのオブジェクトに加えて，増えたページの分の相互参照表(xref)・
+            ページの一覧(Kids)・トレーラも含める(startxrefの桁数の分だけ多めに見積もる)
+        """
+        size = self.f.tell()
+        for body, stream in self._page_objects(page, self.next_id):
+            size += sum(len(data) for data in
+                        _object_parts(self.next_id, body, stream))
+        next_id = self.next_id + 3
+        closing = self._closing_bytes(self.page_ids + [next_id - 1], next_id,
+                                      xref_offset=10 ** 20)
+        return size + sum(len(b) for b in closing)
+
+    def tell(self):
+        """tell これまでに書き込んだバイト数を返す"""
+        return self.f.tell()
+
+    def close(self):
+        """close ページの一覧・カタログ・相互参照表(xref)を書き込んでファイルを閉じる"""
+        catalog_id = self.next_id
+        self.next_id += 1
+        pages, catalog, _ = self._closing_bytes(self.page_ids, catalog_id)
+        self.offsets[self.pages_id] = self.f.tell()
+        self.f.write(pages)
+        self.offsets[catalog_id] = self.f.tell()
+        self.f.write(catalog)
+        _, _, xref = self._closing_bytes(self.page_ids, catalog_id,
+                                         xref_offset=self.f.tell())
+        self.f.write(xref)
+        self.f.close()
+
+
+def _object_parts(object_id, body, stream=None):
+    """_object_parts 1個のオブジェクト(必要ならストリーム付き)を書き込む順のバイト列のリストで返す
+
+    注意点:
+        画像データ(ストリーム)は連結せずにそのまま並べる(大きな画像を複製しないため)
+    """
+    parts = [("%d 0 obj\n" % object_id).encode("ascii"), body.encode("ascii")]
+    if stream is not None:
+        parts += [b"\nstream\n", stream, b"\nendstream"]
+    parts.append(b"\nendobj\n")
+    return parts
+
+
+def _object_bytes(object_id, body):
+    """_object_bytes ストリームの無い1個のオブジェクトのバイト列を返す"""
+    return b"".join(_object_parts(object_id, body))
+
+
+def _volume_path(pdf_out, volume):
+    """_volume_path 分冊のpdfファイルを定義する(例: "book.pdf" --> "book_001.pdf")"""
+    root, ext = os.path.splitext(pdf_out)
+    return root + "_%03d" % volume + ext
+
+
+class SplitPdfWriter:
+    """SplitPdfWriter 最大ページ数または最大ファイルサイズごとに分冊しながらpdfを書き込む
+
+    注意点:
+        分冊しない(max_pagesもmax_bytesもNoneの)場合はpdf_outの1冊だけを書き込む
+        1ページで最大ファイルサイズを超える場合は，そのページだけの1冊にする
+    """
+
+    def __init__(self, pdf_out, max_pages=None, max_bytes=None):
+        """__init__ 分冊の設定を記録する(ファイルは最初のページを追加したときに開く)
+
+        Args:
+            pdf_out (str): まとめたpdfファイル(分冊する場合は"_001"などを付けたファイル名になる)
+            max_pages (int, optional): 1冊あたりの最大ページ数，デフォルトはNone.
+            max_bytes (int, optional): 1冊あたりの最大ファイルサイズ(Byte)，デフォルトはNone.
+        """
+        self.pdf_out = pdf_out
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.split = max_pages is not None or max_bytes is not None
+        self.writer = None
+        self.volume = 0
+
+    def _close_volume(self):
+        """_close_volume 書き込み中の分冊を閉じ，書き込んだページ数を表示する"""
+        self.writer.close()
+        print("Write: ", self.writer.path + " (" +
+              str(len(self.writer.page_ids)) + " pages)")
+        self.writer = None
+
+    def add_page(self, page):
+        """add_page 1ページを書き込み(必要なら次の分冊に移り)，書き込んだpdfファイルを返す
+
+        Args:
+            page (dict): prepare_pdf_pageの戻り値
+        """
+        writer = self.writer
+        # 最大ページ数または最大ファイルサイズを超える場合は次の分冊に移る
+        if writer is not None and self.split is True \
+                and len(writer.page_ids) > 0:
+            over_pages = self.max_pages is not None and \
+                len(writer.page_ids) >= self.max_pages
+            over_bytes = self.max_bytes is not None and \
+                writer.projected_size(page) > self.max_bytes
+            if over_pages or over_bytes:
+                self._close_volume()
+        if self.writer is None:
+            self.volume += 1
+            if self.split is True:
+                path = _volume_path(self.pdf_out, self.volume)
+            else:
+                path = self.pdf_out
+            self.writer = StreamingPdfWriter(path)
+        self.writer.add_page(page)
+        return self.writer.path
+
+    def close(self):
+        """close 書き込み中の分冊を閉じる"""
+        if self.writer is not None:
+            self._close_volume()
+
+
+def combine_images2pdf(indir, pdf_out, extension="png", images=None,
+                       max_pages=None, max_bytes=None, jobs=1, chunksize=1,
+                       recursive=False, sniff=False):
+    """combine_images2pdf 複数枚の画像を1個(または複数の分冊)のpdfにまとめる
+
+    Args:
+        indir (str): 変換前の画像ファイルをまとめて置いているディレクトリ
+        pdf_out (str): まとめたpdfファイル(分冊する場合は"_001"などを付けたファイル名になる)
+        extension (str または list, optional): 変換前の拡張子(デフォルトは"png")
+        images (list, optional): まとめる画像ファイル(indirからの相対パス)を並べたリスト
+                                 (デフォルトはNoneで，indir内の画像をファイル名の順に全て使う)
+        max_pages (int, optional): 1冊あたりの最大ページ数(デフォルトはNoneで分冊しない)
+        max_bytes (int, optional): 1冊あたりの最大ファイルサイズ(Byte)
+                                   (デフォルトはNoneで分冊しない)
+        jobs (int, optional): ページの画像データを並列に準備するプロセス数
+                              (デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+
+    Returns:
+        list: 変換に失敗した(画像ファイル, エラー内容)のリスト
+
+    注意点:
+        ページは1枚ずつファイルへ書き出すため，全ページの画像データをメモリ上に持たない
+        (メモリ上にあるのは並列に準備中のページの分だけである)
+        1ページで最大ファイルサイズを超える場合は，そのページだけの1冊にする
+    """
+    # まとめる画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    if images is None:
+        images = trace_listing("combine_images2pdf",
+                               scan_images(indir, extension, recursive,
+                                           sniff))
+    # pdfを格納する出力先ディレクトリが無い場合は作成
+    outdir = os.path.dirname(pdf_out)
+    if outdir != "" and os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    items = ((os.path.join(indir, image),) for image in images)
+    # ページの画像データを(並列に)準備し，準備できた順(入力の順)にpdfへ書き出す
+    errors = []
+    writer = SplitPdfWriter(pdf_out, max_pages, max_bytes)
+    try:
+        for result in run_batch(prepare_pdf_page, items, jobs, chunksize):
+            image_src = result.args[0]
+            if result.error is not None:
+                # 変換に失敗した画像は記録しておき，残りの画像の変換は続ける
+                errors.append((image_src, result.error))
+                continue
+            path = writer.add_page(result.value)
+            # どの画像がpdfに追加されたのか表示
+            print("Add page: ", image_src + " --> " + path)
+    finally:
+        writer.close()
+    # 変換に失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像についてpdfへの変換が終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+# ----------------------------------------------------------------------
+# "indir/ファイル名.png" を "outdir/ファイル名.pdf" に変換する
+# "--combine pdfファイル"を付けると，全ての画像を1個のpdfにまとめる
+# 例: image-tools pdf --combine ./dst_images/all.pdf --max-pages 500
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインからpdfへの変換を実行する(image-tools pdf)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="convert images to PDF")
+    parser.add_argument("indir", nargs="?", default="./src_images/")
+    parser.add_argument("outdir", nargs="?", default="./dst_images/")
+    parser.add_argument("--extension", nargs="+", default=["png"])
+    parser.add_argument("--combine", default=None,
+                        help="bind all images into this PDF")
+    parser.add_argument("--max-pages", type=int, default=None,
+                        help="split into volumes of at most this many pages")
+    parser.add_argument("--max-bytes", type=int, default=None,
+                        help="split into volumes of at most this many bytes")
+    args = parse_batch_args(args, parser, incremental=True)
+    if args.combine is not None and args.incremental is True:
+        parser.error("--incremental cannot be used with --combine")
+    if args.combine is not None:
+        errors = combine_images2pdf(args.indir, args.combine, args.extension,
+                                    max_pages=args.max_pages,
+                                    max_bytes=args.max_bytes, jobs=args.jobs,
+                                    chunksize=args.chunksize,
+                                    recursive=args.recursive,
+                                    sniff=args.sniff)
+    else:
+        errors = convert_image2pdf(args.indir, args.outdir, args.extension,
+                                   jobs=args.jobs, chunksize=args.chunksize,
+                                   recursive=args.recursive, sniff=args.sniff,
+                                   incremental=args.incremental,
+                                   content_hash=args.content_hash)
+    return 1 if len(errors) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,539 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# crop_image_by_hand.py
+# 複数枚の画像を同じ長方形の画像へ切り抜く
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import csv
+import json
+import os
+import sys
+from image_tools.add_margin_around_image import add_margin_to_image
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.incremental_manifest import load_manifest
+from image_tools.incremental_manifest import save_manifest
+from image_tools.incremental_manifest import skip_up_to_date
+from image_tools.incremental_manifest import update_manifest
+from image_tools.instrumentation import encode_image
+from image_tools.instrumentation import open_image
+from image_tools.instrumentation import save_image
+from image_tools.instrumentation import trace_image
+from image_tools.instrumentation import trace_listing
+from image_tools.instrumentation import write_bytes
+from image_tools.result_cache import print_cache_summary
+from image_tools.result_cache import with_cache
+from image_tools.scan_images import make_output_path
+from image_tools.scan_images import scan_images
+
+# 切り抜き後の画像の領域を定義する座標の辞書のkey(左上x, 左上y, 右下x, 右下y)
+coordinate_keys = ["upper left x", "upper left y",
+                   "lower right x", "lower right y"]
+
+
+def load_crop_template(path):
+    """load_crop_template 名前付きの複数の切り抜く領域をテンプレート(json/csv)から読み込む
+
+    Args:
+        path (str): テンプレートのファイル(拡張子が".csv"ならcsv，それ以外はjson)
+
+    Returns:
+        dict: 領域の名前をkey，左上と右下の座標の辞書(pixel_coordinatesと同じ形)をvalueとする辞書
+
+    注意点:
+        jsonは{"名前": {"upper left x": 0, ...}}または{"名前": [左上x, 左上y, 右下x, 右下y]}
+        csvは1行目を見出し(name, upper left x, upper left y,
+        lower right x, lower right y)とする
+    """
+    templates = {}
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                templates[row["name"]] = {key: int(row[key])
+                                          for key in coordinate_keys}
+        return templates
+    with open(path, "r", encoding="utf-8") as f:
+        for name, coordinates in json.load(f).items():
+            if isinstance(coordinates, list):
+                coordinates = dict(zip(coordinate_keys, coordinates))
+            templates[name] = {key: int(coordinates[key])
+                               for key in coordinate_keys}
+    return templates
+
+
+def to_area_rectangle(coordinates):
+    """to_area_rectangle 左上と右下の座標の辞書を領域(左上x, 左上y, 右下x, 右下y)にする"""
+    return tuple(coordinates[key] for key in coordinate_keys)
+
+
+def load_region(image_PIL, image_area_rectangle):
+    """load_region 画像のうち切り抜く領域を含む部分だけをデコードする
+
+    Args:
+        image_PIL (PIL.Image.Image): Image.openで開いただけの(まだデコードしていない)画像
+        image_area_rectangle (tuple): 切り抜く領域(左上x, 左上y, 右下x, 右下y)
+
+    Returns:
+        PIL.Image.Image: 切り抜く領域を含む部分だけをデコードした画像
+                         (座標は元の画像と同じで，切り抜く領域より下の行は含まない)
+
+    注意点:
+        上の行から順に保存されている形式(インターレースでないPNG，JPEG，無圧縮のTIFFなど)は
+        右下のyの行までデコードしたところで読み込みを止める
+        複数のタイル(ストリップ)に分かれている形式は，切り抜く領域に重なるタイルだけをデコードする
+        それ以外の形式は全体をデコードする
+    """
+    from PIL import ImageFile
+    left, upper, right, lower = image_area_rectangle
+    w, h = image_PIL.size
+    tiles = image_PIL.tile
+    # ------------------------------------------------------------------
+    # 複数のタイルに分かれている場合は，切り抜く領域に重なるタイルだけを残す
+    # ------------------------------------------------------------------
+    if len(tiles) > 1:
+        image_PIL.tile = [tile for tile in tiles
+                          if tile[1][0] < right and tile[1][2] > left
+                          and tile[1][1] < lower and tile[1][3] > upper]
+        image_PIL.load()
+        return image_PIL
+    # ------------------------------------------------------------------
+    # 上の行から順に保存されている形式は，右下のyの行までで読み込みを止める
+    # ------------------------------------------------------------------
+    row_ordered = False
+    if len(tiles) == 1 and 0 < lower < h and tiles[0][1] == (0, 0, w, h):
+        codec, args = tiles[0][0], tiles[0][3]
+        if codec == "zip" and image_PIL.format == "PNG":
+            row_ordered = not image_PIL.info.get("interlace")
+        elif codec == "jpeg":
+            row_ordered = True
+        elif codec == "raw":
+            # BMPのように下の行から保存されている(向きが-1)ものは除く
+            row_ordered = isinstance(args, tuple) and len(args) == 3 \
+                and args[2] == 1
+    if row_ordered is False:
+        image_PIL.load()
+        return image_PIL
+    image_PIL.tile = [ImageFile._Tile(tiles[0][0], (0, 0, w, lower),
+                                      tiles[0][2], tiles[0][3])]
+    image_PIL._size = (w, lower)
+    if tiles[0][0] != "jpeg":
+        image_PIL.load()
+        return image_PIL
+    # JPEGのデコーダは途中で止めるとエラーを返すため，この画像の読み込みだけで許容する
+    # (ImageFile.LOAD_TRUNCATED_IMAGESはプロセス全体で共通なので変えない)
+    try:
+        image_PIL.load()
+    except OSError:
+        # 全ての行をデコードし終えた後のエラーだけを許容する
+        # (ファイルが途中で切れている場合はデコード中にエラーになり，tileが残る)
+        if len(image_PIL.tile) > 0 or image_PIL.im is None:
+            raise
+        image_PIL.load()
+    return image_PIL
+
+
+def crop_one_image(image_src, image_dst, image_area_rectangle,
+                   region_decode=True):
+    """crop_one_image 1枚の画像を長方形の画像へ切り抜く
+
+    Args:
+        image_src (str): 切り抜き前の画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 切り抜き後の画像ファイル(相対パス・拡張子付き)
+        image_area_rectangle (tuple): 切り抜き後の画像の領域(左上x, 左上y, 右下x, 右下y)
+        region_decode (bool, optional): 切り抜く領域を含む部分だけをデコードするかどうか
+                                        (デフォルトはTrue)
+    """
+    with trace_image("crop_image_byhand", image_src, image_dst) as trace:
+        with trace.stage("decode"):
+            # 切り抜き前の画像ファイル(相対パス・拡張子付き)をPillow(PIL)で読み込み
+            image_src_PIL = open_image(image_src, trace)
+            # 切り抜く領域を含む部分だけをデコード
+            if region_decode is True:
+                image_src_PIL = load_region(image_src_PIL,
+                                            image_area_rectangle)
+            else:
+                image_src_PIL.load()
+        # 切り抜きを実施
+        with trace.stage("transform"):
+            image_crop_PIL = image_src_PIL.crop(image_area_rectangle)
+        # 切り抜き後の画像を保存
+        save_image(image_crop_PIL, image_dst, trace)
+
+
+def crop_one_image_to_regions(image_src, image_dsts, image_area_rectangles,
+                              region_decode=True, encode_threads=1):
+    """crop_one_image_to_regions 1枚の画像を1回だけデコードし，複数の長方形の画像へ切り抜く
+
+    Args:
+        image_src (str): 切り抜き前の画像ファイル(相対パス・拡張子付き)
+        image_dsts (list): 切り抜き後の画像ファイル(領域ごと，相対パス・拡張子付き)のリスト
+        image_area_rectangles (list): 切り抜き後の画像の領域(左上x, 左上y, 右下x, 右下y)のリスト
+        region_decode (bool, optional): 全ての領域を含む部分だけをデコードするかどうか
+                                        (デフォルトはTrue)
+        encode_threads (int, optional): 切り抜き後の画像を並列に保存するスレッド数
+                                        (デフォルトは1)
+    """
+    with trace_image("crop_image_byhand", image_src,
+                     image_dsts[0]) as trace:
+        with trace.stage("decode"):
+            # 切り抜き前の画像ファイル(相対パス・拡張子付き)をPillow(PIL)で読み込み
+            image_src_PIL = open_image(image_src, trace)
+            # 全ての領域を囲む長方形を含む部分だけを1回だけデコード
+            if region_decode is True:
+                union_rectangle = (min(r[0] for r in image_area_rectangles),
+                                   min(r[1] for r in image_area_rectangles),
+                                   max(r[2] for r in image_area_rectangles),
+                                   max(r[3] for r in image_area_rectangles))
+                image_src_PIL = load_region(image_src_PIL, union_rectangle)
+            else:
+                image_src_PIL.load()
+
+        def crop_and_encode(image_dst, image_area_rectangle):
+            with trace.stage("transform"):
+                image_crop_PIL = image_src_PIL.crop(image_area_rectangle)
+            return encode_image(image_crop_PIL, image_dst, trace)
+
+        # 領域ごとに切り抜いて保存(Pillowの圧縮処理はGILを解放するためスレッドで並列にできる)
+        if encode_threads <= 1:
+            for image_dst, image_area_rectangle in zip(image_dsts,
+                                                       image_area_rectangles):
+                with trace.stage("transform"):
+                    image_crop_PIL = image_src_PIL.crop(image_area_rectangle)
+                save_image(image_crop_PIL, image_dst, trace)
+            return
+        # パイプライン実行の出力はスレッドごとに記録するため，
+        # 別のスレッドではエンコードだけを行い，書き込みはこのスレッドで行う
+        with ThreadPoolExecutor(max_workers=encode_threads) as executor:
+            futures = [executor.submit(crop_and_encode, image_dst,
+                                       image_area_rectangle)
+                       for image_dst, image_area_rectangle
+                       in zip(image_dsts, image_area_rectangles)]
+            for future, image_dst in zip(futures, image_dsts):
+                write_bytes(future.result(), image_dst, trace)
+
+
+def crop_image_byhand(indir, outdir, pixel_coordinates, extension="png",
+                      jobs=1, chunksize=1, recursive=False, sniff=False,
+                      incremental=False, content_hash=False,
+                      region_decode=True, encode_threads=1, cache=None):
+    """crop_image_byhand 複数枚の画像を同じ長方形の画像へ切り抜く
+
+    Args:
+        indir (str): 切り抜き前の画像ファイルをまとめて置いているディレクトリ
+        outdir (str): 切り抜き後の画像ファイルをまとめて置くディレクトリ
+        pixel_coordinates (辞書{'str' : int}): 切り抜き後の左上と右下の座標
+                                              (複数の領域を切り抜く場合は，領域の名前をkey，
+                                              座標の辞書をvalueとする辞書)
+        extension (str, optional): 変換前の拡張子(デフォルトは"png")
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        incremental (bool, optional): 出力済みで変更の無い画像の処理を省略するかどうか
+                                      (デフォルトはFalse)
+        content_hash (bool, optional): incremental=Trueの場合に内容のハッシュ値でも判定するか
+                                       どうか(デフォルトはFalse)
+        region_decode (bool, optional): 切り抜く領域を含む部分だけをデコードするかどうか
+                                        (デフォルトはTrue)
+        encode_threads (int, optional): 複数の領域を切り抜く場合に，1枚の画像から切り抜いた
+                                        画像を並列に保存するスレッド数(デフォルトは1)
+        cache (ResultCache, optional): 処理結果のキャッシュ(result_cache.py)
+                                       デフォルトはNone(--cacheで設定したもの，無ければ使わない).
+
+    Returns:
+        list: 切り抜きに失敗した(画像ファイル, エラー内容)のリスト
+
+    注意点:
+        複数の領域を切り抜く場合は，各画像を1回だけデコードして全ての領域を切り抜き，
+        outdir/領域の名前/画像 に保存する
+    """
+    # 圧縮後の画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    # 変換前(元の拡張子)の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("crop_image_byhand",
+                           scan_images(indir, extension, recursive, sniff))
+    sniff_dir = indir if sniff is True else None
+    # 切り抜き後の画像の領域を左上と右下の座標で定義
+    if coordinate_keys[0] in pixel_coordinates:
+        image_area_rectangle = to_area_rectangle(pixel_coordinates)
+        # 画像1枚ずつに対する切り抜きの引数(切り抜き前・後の画像ファイルなど)を定義
+        items = ((os.path.join(indir, image),
+                  make_output_path(outdir, image, sniff_dir),
+                  image_area_rectangle, region_decode) for image in images)
+        crop_func = crop_one_image
+        params = {"operation": "crop_image_byhand",
+                  "image_area_rectangle": image_area_rectangle}
+    else:
+        # 複数の領域を切り抜く場合は，領域の名前ごとのサブディレクトリへ出力する
+        names = list(pixel_coordinates.keys())
+        for name in names:
+            os.makedirs(os.path.join(outdir, name), exist_ok=True)
+        image_area_rectangles = [to_area_rectangle(pixel_coordinates[name])
+                                 for name in names]
+        items = ((os.path.join(indir, image),
+                  [make_output_path(os.path.join(outdir, name), image,
+                                    sniff_dir) for name in names],
+                  image_area_rectangles, region_decode, encode_threads)
+                 for image in images)
+        crop_func = crop_one_image_to_regions
+        params = {"operation": "crop_image_byhand",
+                  "image_area_rectangles": dict(zip(names,
+                                                    image_area_rectangles))}
+    # 変更の無い画像の処理を省略する場合は，マニフェストで出力済みの画像を取り除く
+    skipped = []
+    if incremental is True:
+        manifest = load_manifest(outdir)
+        items = skip_up_to_date(items, outdir, manifest, params, skipped,
+                                content_hash)
+    # 同じ画像を同じ領域で切り抜いたことがあればキャッシュからコピーする
+    crop_func, cache = with_cache(crop_func, params, cache)
+    if cache is not None:
+        cache_stats = cache.stats()
+    # 画像1枚ずつに対して不要な部分の切り抜き(crop)を(並列に)実施
+    errors = []
+    try:
+        for result in run_batch(crop_func, items, jobs, chunksize):
+            image_src, image_dst = result.args[0], result.args[1]
+            if result.error is not None:
+                # 切り抜きに失敗した画像は記録しておき，残りの画像の切り抜きは続ける
+                errors.append((image_src, result.error))
+                continue
+            # 処理が終わった画像をマニフェストに記録する
+            if incremental is True:
+                update_manifest(outdir, manifest, image_src, image_dst,
+                                params, content_hash)
+            # どの画像が切り抜きされたのか表示
+            if isinstance(image_dst, list):
+                image_dst = os.path.join(outdir, "*",
+                                         os.path.relpath(image_src, indir))
+            print("Crop: ", image_src + " --> " + image_dst)
+    finally:
+        # 途中で止まった場合もそこまでの記録が残るようにマニフェストを保存する
+        if incremental is True:
+            save_manifest(outdir, manifest)
+    # 処理を省略した画像があれば枚数を表示する
+    if len(skipped) > 0:
+        print("Skip: ", str(len(skipped)) + " images are up to date")
+    # キャッシュを使った場合はヒットした枚数を表示する
+    if cache is not None:
+        print_cache_summary(cache, cache_stats)
+    # 切り抜きに失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像について切り抜きが終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+def find_content_bbox(image_PIL, border_color=None, tolerance=10):
+    """find_content_bbox 周囲の余白(枠)を除いた内容の領域を求める
+
+    Args:
+        image_PIL (PIL.Image.Image): 内容の領域を求めたい画像
+        border_color (int または tuple, optional): 余白の色，デフォルトはNone(左上の画素の色).
+        tolerance (int, optional): 余白の色とみなす各色成分の差の上限，デフォルトは10.
+
+    Returns:
+        tuple: 内容の領域(左上x, 左上y, 右下x, 右下y)，画像全体が余白の場合はNone
+
+    注意点:
+        画素ごとのループは使わず，余白の色との差の画像を作って色成分ごとにしきい値で
+        2値化し，getbboxで領域を求める(全てPillowのC実装で処理される)
+    """
+    from PIL import Image
+    from PIL import ImageChops
+    # 8bitの色成分を持つ形式以外(パレット，16bitなど)はRGBにしてから比較する
+    if image_PIL.mode not in ("L", "LA", "RGB", "RGBA"):
+        image_PIL = image_PIL.convert("RGB")
+    if border_color is None:
+        border_color = image_PIL.getpixel((0, 0))
+    # 余白の色との差の画像を作る
+    background = Image.new(image_PIL.mode, image_PIL.size, border_color)
+    difference = ImageChops.difference(image_PIL, background)
+    # どれかの色成分の差がtoleranceより大きい画素を内容とみなして領域を求める
+    table = [0] * (tolerance + 1) + [255] * (255 - tolerance)
+    mask = difference.point(table * len(difference.getbands()))
+    return mask.getbbox(alpha_only=False)
+
+
+def trim_one_image(image_src, image_dst, border_color=None, tolerance=10,
+                   margin=None, margin_size=None):
+    """trim_one_image 1枚の画像の周囲の余白(枠)を自動で切り抜く
+
+    Args:
+        image_src (str): 切り抜き前の画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 切り抜き後の画像ファイル(相対パス・拡張子付き)
+        border_color (int または tuple, optional): 余白の色(デフォルトは左上の画素の色)
+        tolerance (int, optional): 余白の色とみなす各色成分の差の上限(デフォルトは10)
+        margin (dict, optional): 切り抜き後に各方向(上下左右)に余白を付加するかどうか
+        margin_size (dict, optional): 切り抜き後に付加する各方向(上下左右)の余白の大きさ
+
+    Returns:
+        tuple: 切り抜いた領域(左上x, 左上y, 右下x, 右下y)
+    """
+    with trace_image("trim_image_automatically", image_src,
+                     image_dst) as trace:
+        # 切り抜き前の画像ファイル(相対パス・拡張子付き)をPillow(PIL)で読み込み
+        with trace.stage("decode"):
+            image_src_PIL = open_image(image_src, trace)
+            image_src_PIL.load()
+        with trace.stage("transform"):
+            # 内容の領域を求めて切り抜く(全体が余白の場合はそのまま残す)
+            image_area_rectangle = find_content_bbox(image_src_PIL,
+                                                     border_color, tolerance)
+            if image_area_rectangle is None:
+                image_area_rectangle = (0, 0) + image_src_PIL.size
+            image_dst_PIL = image_src_PIL.crop(image_area_rectangle)
+            # 指定された場合は切り抜き後の画像の周囲に余白を付加する
+            if margin is not None:
+                image_dst_PIL = add_margin_to_image(image_dst_PIL, margin,
+                                                    margin_size)
+        # 切り抜き後の画像を保存
+        save_image(image_dst_PIL, image_dst, trace)
+    return image_area_rectangle
+
+
+def trim_image_automatically(indir, outdir, extension="png",
+                             border_color=None, tolerance=10,
+                             margin=None, margin_size=None,
+                             jobs=1, chunksize=1, recursive=False,
+                             sniff=False, incremental=False,
+                             content_hash=False):
+    """trim_image_automatically 複数枚の画像の周囲の余白(枠)を画像ごとに自動で切り抜く
+
+    Args:
+        indir (str): 切り抜き前の画像ファイルをまとめて置いているディレクトリ
+        outdir (str): 切り抜き後の画像ファイルをまとめて置くディレクトリ
+        extension (str, optional): 変換前の拡張子(デフォルトは"png")
+        border_color (int または tuple, optional): 余白の色(デフォルトは各画像の左上の画素の色)
+        tolerance (int, optional): 余白の色とみなす各色成分の差の上限(デフォルトは10)
+        margin (dict, optional): 切り抜き後に各方向(上下左右)に余白を付加するかどうか
+                                 (デフォルトはNoneで，margin_sizeを指定した場合は全方向)
+        margin_size (dict, optional): 切り抜き後に付加する各方向(上下左右)の余白の大きさ
+                                      (デフォルトはNoneで，余白を付加しない)
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        incremental (bool, optional): 出力済みで変更の無い画像の処理を省略するかどうか
+                                      (デフォルトはFalse)
+        content_hash (bool, optional): incremental=Trueの場合に内容のハッシュ値でも判定するか
+                                       どうか(デフォルトはFalse)
+
+    Returns:
+        list: 切り抜きに失敗した(画像ファイル, エラー内容)のリスト
+    """
+    # 余白の大きさだけ指定された場合は上下左右すべてに余白を付加する
+    if margin_size is not None and margin is None:
+        margin = {direction: True
+                  for direction in ["top", "bottom", "left", "right"]}
+    # 切り抜き後の画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    # 変換前(元の拡張子)の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("trim_image_automatically",
+                           scan_images(indir, extension, recursive, sniff))
+    # 画像1枚ずつに対する切り抜きの引数(切り抜き前・後の画像ファイルなど)を定義
+    sniff_dir = indir if sniff is True else None
+    items = ((os.path.join(indir, image),
+              make_output_path(outdir, image, sniff_dir),
+              border_color, tolerance, margin, margin_size)
+             for image in images)
+    # 変更の無い画像の処理を省略する場合は，マニフェストで出力済みの画像を取り除く
+    params = {"operation": "trim_image_automatically",
+              "border_color": border_color, "tolerance": tolerance,
+              "margin": margin, "margin_size": margin_size}
+    skipped = []
+    if incremental is True:
+        manifest = load_manifest(outdir)
+        items = skip_up_to_date(items, outdir, manifest, params, skipped,
+                                content_hash)
+    # 画像1枚ずつに対して周囲の余白の切り抜きを(並列に)実施
+    errors = []
+    try:
+        for result in run_batch(trim_one_image, items, jobs, chunksize):
+            image_src, image_dst = result.args[0], result.args[1]
+            if result.error is not None:
+                # 切り抜きに失敗した画像は記録しておき，残りの画像の切り抜きは続ける
+                errors.append((image_src, result.error))
+                continue
+            # 処理が終わった画像をマニフェストに記録する
+            if incremental is True:
+                update_manifest(outdir, manifest, image_src, image_dst,
+                                params, content_hash)
+            # どの画像のどの領域が切り抜きされたのか表示
+            print("Trim: ", image_src + " --> " + image_dst,
+                  str(result.value))
+    finally:
+        # 途中で止まった場合もそこまでの記録が残るようにマニフェストを保存する
+        if incremental is True:
+            save_manifest(outdir, manifest)
+    # 処理を省略した画像があれば枚数を表示する
+    if len(skipped) > 0:
+        print("Skip: ", str(len(skipped)) + " images are up to date")
+    # 切り抜きに失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像について切り抜きが終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+# ----------------------------------------------------------------------
+# 複数枚の画像を同じ長方形の画像へ切り抜く
+# indir/画像 --> outdir/画像
+# (--templateで複数の領域を指定した場合は indir/画像 --> outdir/領域の名前/画像)
+# (--auto-trimの場合は画像ごとに周囲の余白(枠)を自動で切り抜く)
+# 注意：辞書のkeyは変えずに使用すること(関数内で使うため)
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから切り抜きを実行する(image-tools crop)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="crop images to the same rectangle(s)")
+    parser.add_argument("indir", nargs="?", default="./src_images/")
+    parser.add_argument("outdir", nargs="?", default="./crp_images/")
+    parser.add_argument("--extension", nargs="+", default=["png"])
+    parser.add_argument("--box", type=int, nargs=4, default=[0, 0, 100, 100],
+                        metavar=("LEFT", "UPPER", "RIGHT", "LOWER"),
+                        help="rectangle to crop (default: 0 0 100 100)")
+    parser.add_argument("--template", default=None,
+                        help="json/csv file of named rectangles to crop")
+    parser.add_argument("--encode-threads", type=int, default=1,
+                        help="threads saving the regions of one image")
+    parser.add_argument("--auto-trim", action="store_true",
+                        help="trim the border of each image automatically")
+    parser.add_argument("--tolerance", type=int, default=10,
+                        help="max difference from the border colour")
+    args = parse_batch_args(args, parser, incremental=True)
+    if args.auto_trim is True:
+        errors = trim_image_automatically(args.indir, args.outdir,
+                                          args.extension,
+                                          tolerance=args.tolerance,
+                                          jobs=args.jobs,
+                                          chunksize=args.chunksize,
+                                          recursive=args.recursive,
+                                          sniff=args.sniff,
+                                          incremental=args.incremental,
+                                          content_hash=args.content_hash)
+        return 1 if len(errors) > 0 else 0
+    if args.template is not None:
+        pixel_coordinates = load_crop_template(args.template)
+    else:
+        pixel_coordinates = dict(zip(coordinate_keys, args.box))
+    errors = crop_image_byhand(args.indir, args.outdir, pixel_coordinates,
+                               args.extension, jobs=args.jobs,
+                               chunksize=args.chunksize,
+                               recursive=args.recursive, sniff=args.sniff,
+                               incremental=args.incremental,
+                               content_hash=args.content_hash,
+                               encode_threads=args.encode_threads)
+    return 1 if len(errors) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# image_pipeline.py
+# 切り抜き・余白の付加・圧縮・pdfへの変換などの処理を順番にメモリ上でまとめて実行する
+# (各画像のデコードとエンコードは1回ずつで，途中のディレクトリに画像を書き出さない)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import argparse
+import json
+import os
+import sys
+import time
+from image_tools.add_margin_around_image import add_margin_to_image
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.compress_image import draft_for_shrink
+from image_tools.compress_image import encode_to_target_size
+from image_tools.compress_image import shrink_image
+from image_tools.convert_image_to_pdf import SplitPdfWriter
+from image_tools.convert_image_to_pdf import image_to_pdf_page
+from image_tools.crop_image_by_hand import find_content_bbox
+from image_tools.crop_image_by_hand import load_region
+from image_tools.crop_image_by_hand import to_area_rectangle
+from image_tools.incremental_manifest import load_manifest
+from image_tools.incremental_manifest import save_manifest
+from image_tools.incremental_manifest import skip_up_to_date
+from image_tools.incremental_manifest import update_manifest
+from image_tools.instrumentation import open_image
+from image_tools.instrumentation import save_image
+from image_tools.instrumentation import trace_image
+from image_tools.instrumentation import trace_listing
+from image_tools.instrumentation import write_bytes
+from image_tools.scan_images import make_output_path
+from image_tools.scan_images import scan_images
+
+# パイプラインで使える処理の名前(pdfは最後にだけ置ける)
+stage_names = ["crop", "trim", "margin", "compress", "pdf"]
+
+
+def _apply_crop(image_PIL, params):
+    """_apply_crop pixel_coordinatesで指定した長方形の画像へ切り抜く"""
+    return image_PIL.crop(to_area_rectangle(params["pixel_coordinates"]))
+
+
+def _apply_trim(image_PIL, params):
+    """_apply_trim 周囲の余白(枠)を自動で切り抜く"""
+    bbox = find_content_bbox(image_PIL, params.get("border_color"),
+                             params.get("tolerance", 10))
+    if bbox is None:
+        return image_PIL
+    return image_PIL.crop(bbox)
+
+
+def _apply_margin(image_PIL, params):
+    """_apply_margin 周囲(上下左右)に余白を付加する(デフォルトは全方向に10)"""
+    margin = params.get("margin")
+    if margin is None:
+        margin = {direction: True
+                  for direction in ["top", "bottom", "left", "right"]}
+    margin_size = params.get("margin_size")
+    if margin_size is None:
+        margin_size = {direction: 10
+                       for direction in ["top", "bottom", "left", "right"]}
+    return add_margin_to_image(image_PIL, margin, margin_size)
+
+
+def _apply_compress(image_PIL, params, original_size=None):
+    """_apply_compress 1/shrinkのサイズに縮小する(品質の変更はエンコード時に行う)
+
+    注意点:
+        縮小した解像度でデコード済みの場合はoriginal_sizeに元の幅と高さを渡す
+    """
+    shrink = params.get("shrink", 1)
+    if shrink == 1:
+        return image_PIL
+    return shrink_image(image_PIL, shrink, params.get("fast_decode", True),
+                        original_size)
+
+
+# 処理の名前と，メモリ上の画像に対してその処理を行う関数の対応
+stage_functions = {
+    "crop": _apply_crop,
+    "trim": _apply_trim,
+    "margin": _apply_margin,
+    "compress": _apply_compress,
+}
+
+
+def _decode(image_src, stages, trace):
+    """_decode 最初の処理に必要な分だけ画像をデコードする
+
+    Returns:
+        tuple: (デコードした画像, デコード前の元の幅と高さ)
+
+    注意点:
+        最初の処理が切り抜きの場合は切り抜く領域を含む部分だけを，
+        最初の処理が整数倍の縮小の場合は(JPEGなら)縮小した解像度でデコードする
+    """
+    image_PIL = open_image(image_src, trace)
+    original_size = image_PIL.size
+    name, params = stages[0]
+    if name == "crop" and params.get("region_decode", True) is True:
+        return load_region(image_PIL, to_area_rectangle(
+            params["pixel_coordinates"])), original_size
+    if name == "compress" and params.get("fast_decode", True) is True:
+        draft_for_shrink(image_PIL, params.get("shrink", 1))
+    image_PIL.load()
+    return image_PIL, original_size
+
+
+def _encode_params(stages):
+    """_encode_params 最後のcompressの設定(品質・目標のファイルサイズ)を返す"""
+    params = {}
+    for name, stage_params in stages:
+        if name == "compress":
+            params = stage_params
+    return params
+
+
+def process_one_image(image_src, image_dst, stages):
+    """process_one_image 1枚の画像に対して一連の処理をメモリ上で順番に行う
+
+    Args:
+        image_src (str): 処理前の画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 処理後の画像ファイル(最後がpdfの場合はNone)
+        stages (list): (処理の名前, パラメータの辞書)のリスト
+
+    Returns:
+        dict: 処理ごとの処理時間[s]("times")，
+              最後がpdfの場合はpdfのページの画像データ("page")
+
+    注意点:
+        デコードとエンコードは1回ずつで，途中の画像はファイルに書き出さない
+    """
+    from PIL import Image
+    times = {}
+    with trace_image("run_pipeline", image_src, image_dst) as trace:
+        start = time.perf_counter()
+        with trace.stage("decode"):
+            image_PIL, original_size = _decode(image_src, stages, trace)
+        times["decode"] = time.perf_counter() - start
+        page = None
+        for i, (name, params) in enumerate(stages):
+            start = time.perf_counter()
+            if name == "pdf":
+                # pdfのページに埋め込む画像データにする
+                # (pdfの処理自体にqualityを指定した場合だけJPEGにする．compressのqualityは
+                # PNGには効かないため，別々のツールで処理した場合と同じく可逆のまま埋め込む)
+                with trace.stage("encode"):
+                    page = image_to_pdf_page(image_PIL,
+                                             quality=params.get("quality"))
+                trace.add_pixels(image_PIL)
+            elif name == "compress" and i == 0:
+                # 縮小した解像度でデコード済みの場合があるため元の大きさを渡す
+                with trace.stage("transform"):
+                    image_PIL = _apply_compress(image_PIL, params,
+                                                original_size)
+            else:
+                with trace.stage("transform"):
+                    image_PIL = stage_functions[name](image_PIL, params)
+            times[name] = times.get(name, 0.0) + time.perf_counter() - start
+        # 最後がpdfでない場合は，最後に1回だけエンコードして保存する
+        if page is None:
+            start = time.perf_counter()
+            params = _encode_params(stages)
+            quality = params.get("quality", 95)
+            if params.get("target_bytes") is None:
+                save_image(image_PIL, image_dst, trace, quality=quality,
+                           optimize=True)
+            else:
+                with trace.stage("encode"):
+                    extension = os.path.splitext(image_dst)[1].lower()
+                    image_format = Image.registered_extensions()[extension]
+                    encoded = encode_to_target_size(
+                        image_PIL, image_format, params["target_bytes"],
+                        quality_max=quality,
+                        rescale=params.get("rescale", False))
+                trace.add_pixels(image_PIL)
+                write_bytes(encoded["data"], image_dst, trace)
+            times["encode"] = time.perf_counter() - start
+    return {"times": times, "page": page}
+
+
+def check_stages(stages):
+    """check_stages 処理の一覧を(処理の名前, パラメータの辞書)のリストにして確認する"""
+    checked = []
+    for stage in stages:
+        if isinstance(stage, str):
+            stage = (stage, {})
+        name, params = stage
+        if name not in stage_names:
+            raise ValueError("unknown stage: " + str(name))
+        checked.append((name, dict(params)))
+    if len(checked) == 0:
+        raise ValueError("no stages")
+    for name, _ in checked[:-1]:
+        if name == "pdf":
+            raise ValueError("pdf must be the last stage")
+    return checked
+
+
+def print_stage_times(total_times):
+    """print_stage_times 処理ごとの合計の処理時間と割合を表示する
+
+    Args:
+        total_times (dict): 処理の名前をkey，全ての画像の合計の処理時間[s]をvalueとする辞書
+    """
+    total = sum(total_times.values())
+    if total == 0:
+        return
+    for name, seconds in total_times.items():
+        print("Time: ", "{:10s}{:9.3f} s ({:5.1f} %)".format(
+            name, seconds, seconds / total * 100))
+
+
+def run_pipeline(indir, outdir, stages, extension="png", jobs=1, chunksize=1,
+                 recursive=False, sniff=False, incremental=False,
+                 content_hash=False):
+    """run_pipeline 複数枚の画像に対して一連の処理を各画像1回のデコードとエンコードで行う
+
+    Args:
+        indir (str): 処理前の画像ファイルをまとめて置いているディレクトリ
+        outdir (str): 処理後の画像ファイルをまとめて置くディレクトリ
+                      (最後がpdfの場合はpdfのパラメータ"pdf_out"のファイルに書き込む．
+                      "pdf_out"が無い場合はoutdir/all.pdf)
+        stages (list): (処理の名前, パラメータの辞書)を処理の順に並べたリスト
+                       "crop": pixel_coordinates，region_decode
+                               (crop_image_by_hand.pyと同じ辞書)
+                       "trim": border_color，tolerance
+                       "margin": margin，margin_size
+                                 (add_margin_around_image.pyと同じ辞書)
+                       "compress": shrink，quality，fast_decode，
+                                   target_bytes，rescale
+                       "pdf": pdf_out，max_pages，max_bytes，quality
+        extension (str または list, optional): 処理前の拡張子(デフォルトは"png")
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        incremental (bool, optional): 出力済みで変更の無い画像の処理を省略するかどうか
+                                      (デフォルトはFalse，最後がpdfの場合は使えない)
+        content_hash (bool, optional): incremental=Trueの場合に内容のハッシュ値でも判定するか
+                                       どうか(デフォルトはFalse)
+
+    Returns:
+        list: 処理に失敗した(画像ファイル, エラー内容)のリスト
+
+    注意点:
+        pdfより前の処理は，crop_image_by_hand.py，add_margin_around_image.py，
+        compress_image.pyを順番に実行するのと同じ処理を，途中のディレクトリ無しで行う
+        最後がpdfの場合は画像ごとのpdfではなく，全ての画像を入力の順に1個
+        (max_pages・max_bytesを指定した場合は分冊)のpdfにまとめる
+        (convert_image_to_pdf.pyのcombine_images2pdfと同じ)
+    """
+    stages = check_stages(stages)
+    pdf_params = stages[-1][1] if stages[-1][0] == "pdf" else None
+    if pdf_params is not None:
+        pdf_params.setdefault("pdf_out", os.path.join(outdir, "all.pdf"))
+    # 処理前の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("run_pipeline",
+                           scan_images(indir, extension, recursive, sniff))
+    # 画像1枚ずつに対する処理の引数(処理前・後の画像ファイルなど)を定義
+    if pdf_params is None:
+        if os.path.isdir(outdir) is False:
+            os.makedirs(outdir)
+        sniff_dir = indir if sniff is True else None
+        items = ((os.path.join(indir, image),
+                  make_output_path(outdir, image, sniff_dir),
+                  stages) for image in images)
+    else:
+        pdf_dir = os.path.dirname(pdf_params["pdf_out"])
+        if pdf_dir != "" and os.path.isdir(pdf_dir) is False:
+            os.makedirs(pdf_dir)
+        items = ((os.path.join(indir, image), None, stages)
+                 for image in images)
+    # 変更の無い画像の処理を省略する場合は，マニフェストで出力済みの画像を取り除く
+    params = {"operation": "run_pipeline", "stages": stages}
+    skipped = []
+    incremental = incremental is True and pdf_params is None
+    if incremental is True:
+        manifest = load_manifest(outdir)
+        items = skip_up_to_date(items, outdir, manifest, params, skipped,
+                                content_hash)
+    # 画像1枚ずつに対して一連の処理を(並列に)実施
+    errors = []
+    total_times = {}
+    writer = None
+    if pdf_params is not None:
+        writer = SplitPdfWriter(pdf_params["pdf_out"],
+                                pdf_params.get("max_pages"),
+                                pdf_params.get("max_bytes"))
+    try:
+        for result in run_batch(process_one_image, items, jobs, chunksize):
+            image_src, image_dst = result.args[0], result.args[1]
+            if result.error is not None:
+                # 処理に失敗した画像は記録しておき，残りの画像の処理は続ける
+                errors.append((image_src, result.error))
+                continue
+            for name, seconds in result.value["times"].items():
+                total_times[name] = total_times.get(name, 0.0) + seconds
+            # 最後がpdfの場合は，ページを入力の順にpdfへ書き出す
+            if writer is not None:
+                start = time.perf_counter()
+                image_dst = writer.add_page(result.value["page"])
+                total_times["write"] = total_times.get("write", 0.0) + \
+                    time.perf_counter() - start
+            # 処理が終わった画像をマニフェストに記録する
+            if incremental is True:
+                update_manifest(outdir, manifest, image_src, image_dst,
+                                params, content_hash)
+            # どの画像が処理されたのか表示
+            print("Process: ", image_src + " --> " + image_dst)
+    finally:
+        if writer is not None:
+            writer.close()
+        # 途中で止まった場合もそこまでの記録が残るようにマニフェストを保存する
+        if incremental is True:
+            save_manifest(outdir, manifest)
+    # 処理を省略した画像があれば枚数を表示する
+    if len(skipped) > 0:
+        print("Skip: ", str(len(skipped)) + " images are up to date")
+    # 処理ごとの合計の処理時間を表示する(並列の場合は各プロセスの時間の合計)
+    print_stage_times(total_times)
+    # 処理に失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像について処理が終了したことを報告する
+    print("Finished for all images")
+    return errors
+
+
+# ----------------------------------------------------------------------
+# 切り抜き --> 余白の付加 --> 圧縮 --> pdfへの変換 を各画像1回のデコードで行う
+# indir/画像 --> pdf_out
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから一連の処理を実行する(image-tools pipeline)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="crop, margin, compress and bind to PDF "
+                               "with one decode per image")
+    parser.add_argument("indir", nargs="?", default="./src_images/")
+    parser.add_argument("outdir", nargs="?", default="./dst_images/")
+    parser.add_argument("--extension", nargs="+", default=["png"])
+    parser.add_argument("--stages", default=None,
+                        help="JSON list of [name, params] pairs "
+                             "(default: crop, margin, compress, pdf)")
+    args = parse_batch_args(args, parser, incremental=True)
+    if args.stages is not None:
+        stages = [tuple(stage) for stage in json.loads(args.stages)]
+    else:
+        pixel_coordinates = {"upper left x": 0, "upper left y": 0,
+                             "lower right x": 100, "lower right y": 100}
+        stages = [
+            ("crop", {"pixel_coordinates": pixel_coordinates}),
+            ("margin", {}),
+            ("compress", {"shrink": 1, "quality": 50}),
+            ("pdf", {"pdf_out": os.path.join(args.outdir, "all.pdf")}),
+        ]
+    errors = run_pipeline(args.indir, args.outdir, stages, args.extension,
+                          jobs=args.jobs, chunksize=args.chunksize,
+                          recursive=args.recursive, sniff=args.sniff,
+                          incremental=args.incremental,
+                          content_hash=args.content_hash)
+    return 1 if len(errors) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
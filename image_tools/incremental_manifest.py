@@ -0,0 +1,181 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# incremental_manifest.py
+# 処理済みの画像を記録しておき，再実行時に変更の無い画像の処理を省略する
+# (出力先ディレクトリの隣に置くマニフェスト(json)で管理する)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import hashlib
+import json
+import os
+
+# マニフェストの形式のバージョン(形式を変えたら増やす)
+manifest_version = 1
+
+
+def manifest_path(outdir):
+    """manifest_path 出力先ディレクトリに対応するマニフェストのファイルを定義する
+
+    Args:
+        outdir (str): 出力先のディレクトリ(例: "./cmp_images/")
+
+    Returns:
+        str: マニフェストのファイル(例: "./cmp_images.manifest.json")
+    """
+    return os.path.normpath(outdir) + ".manifest.json"
+
+
+def load_manifest(outdir):
+    """load_manifest 出力先ディレクトリのマニフェストを読み込む
+
+    Args:
+        outdir (str): 出力先のディレクトリ
+
+    Returns:
+        dict: マニフェスト(無い場合や壊れている場合は空のマニフェスト)
+    """
+    path = manifest_path(outdir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get("version") != manifest_version:
+        manifest = {"version": manifest_version, "entries": {}}
+    return manifest
+
+
+def save_manifest(outdir, manifest):
+    """save_manifest マニフェストを書き込む(途中で止まっても壊れないように置き換えで書く)
+
+    Args:
+        outdir (str): 出力先のディレクトリ
+        manifest (dict): マニフェスト
+    """
+    path = manifest_path(outdir)
+    path_tmp = path + ".tmp"
+    with open(path_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(path_tmp, path)
+
+
+def file_sha256(path):
+    """file_sha256 ファイルの内容のハッシュ値(SHA-256)を計算する"""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _normalize_params(params):
+    """_normalize_params 処理のパラメータをjsonで保存した後と同じ形にする(tuple→listなど)"""
+    return json.loads(json.dumps(params, sort_keys=True))
+
+
+def _output_paths(image_dst):
+    """_output_paths 処理後の画像ファイル(1つまたは複数)をリストにする"""
+    if isinstance(image_dst, (list, tuple)):
+        return list(image_dst)
+    return [image_dst]
+
+
+def _output_sizes(image_dst):
+    """_output_sizes 処理後の画像ファイルのサイズ(複数の場合はリスト)を返す"""
+    sizes = [os.path.getsize(path) for path in _output_paths(image_dst)]
+    if isinstance(image_dst, (list, tuple)):
+        return sizes
+    return sizes[0]
+
+
+def is_up_to_date(outdir, manifest, image_src, image_dst, params,
+                  content_hash=False):
+    """is_up_to_date 出力済みの画像が再利用できる(処理を省略できる)かどうかを判定する
+
+    Args:
+        outdir (str): 出力先のディレクトリ
+        manifest (dict): マニフェスト
+        image_src (str): 処理前の画像ファイル
+        image_dst (str または list): 処理後の画像ファイル(1枚から複数の画像を出力する
+                                     場合はリストで，先頭の画像ファイルで記録する)
+        params (dict): 処理の名前とパラメータ(shrink，qualityなど)
+        content_hash (bool, optional): サイズか更新時刻が変わっていても内容のハッシュ値が
+                                       同じなら再利用するかどうか，デフォルトはFalse.
+
+    Returns:
+        bool: 再利用できる場合はTrue
+    """
+    entry = manifest["entries"].get(
+        os.path.relpath(_output_paths(image_dst)[0], outdir))
+    if entry is None:
+        return False
+    # 処理のパラメータが変わっていれば再利用できない
+    if entry["params"] != _normalize_params(params):
+        return False
+    # 出力済みの画像が無い，またはサイズが記録と違う(壊れている)場合は再利用できない
+    try:
+        if _output_sizes(image_dst) != entry["output_size"]:
+            return False
+        stat = os.stat(image_src)
+    except OSError:
+        return False
+    # 処理前の画像のサイズと更新時刻が記録と同じなら再利用できる
+    if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    # 更新時刻だけ変わった(コピーし直したなど)場合は内容のハッシュ値で判定する
+    if content_hash is True and "sha256" in entry:
+        if stat.st_size == entry["size"] \
+                and file_sha256(image_src) == entry["sha256"]:
+            entry["mtime_ns"] = stat.st_mtime_ns
+            return True
+    return False
+
+
+def update_manifest(outdir, manifest, image_src, image_dst, params,
+                    content_hash=False):
+    """update_manifest 処理が終わった画像をマニフェストに記録する
+
+    Args:
+        outdir (str): 出力先のディレクトリ
+        manifest (dict): マニフェスト
+        image_src (str): 処理前の画像ファイル
+        image_dst (str または list): 処理後の画像ファイル(複数の場合はリスト)
+        params (dict): 処理の名前とパラメータ(shrink，qualityなど)
+        content_hash (bool, optional): 内容のハッシュ値も記録するかどうか，デフォルトはFalse.
+    """
+    stat = os.stat(image_src)
+    entry = {
+        "source": image_src,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "params": _normalize_params(params),
+        "output_size": _output_sizes(image_dst),
+    }
+    if content_hash is True:
+        entry["sha256"] = file_sha256(image_src)
+    manifest["entries"][
+        os.path.relpath(_output_paths(image_dst)[0], outdir)] = entry
+
+
+def skip_up_to_date(items, outdir, manifest, params, skipped,
+                    content_hash=False):
+    """skip_up_to_date 処理の引数のうち，出力済みの画像を再利用できるものを取り除く
+
+    Args:
+        items (iterable): 処理の引数(先頭2つが処理前・処理後の画像ファイルのtuple)
+        outdir (str): 出力先のディレクトリ
+        manifest (dict): マニフェスト
+        params (dict): 処理の名前とパラメータ(shrink，qualityなど)
+        skipped (list): 処理を省略した画像ファイルを追加していくリスト
+        content_hash (bool, optional): 内容のハッシュ値でも判定するかどうか，デフォルトはFalse.
+
+    Yields:
+        tuple: 処理が必要な画像に対する処理の引数
+    """
+    for args in items:
+        if is_up_to_date(outdir, manifest, args[0], args[1], params,
+                         content_hash):
+            skipped.append(args[0])
+            continue
+        yield args
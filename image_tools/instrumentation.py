@@ -0,0 +1,382 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# instrumentation.py
+# 各ツールの処理時間を画像ごと・段階(一覧の取得・デコード・変換・エンコード・書き込み)ごとに
+# 記録し，json-lines形式のトレースに書き出す(指定した場合だけ動く)
+# (トレースの集計: image-tools trace trace.jsonl --top 10)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from contextlib import contextmanager
+import argparse
+import cProfile
+import io
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from image_tools.io_pipeline import pipelined
+from image_tools.io_pipeline import read_source
+from image_tools.io_pipeline import source_size
+from image_tools.io_pipeline import write_output
+
+# トレースを書き出すファイル(環境変数で指定するとプロセスプールの各プロセスにも引き継がれる)
+trace_env = "IMAGE_TOOLS_TRACE"
+# cProfileの結果をプロセスごとに書き出すディレクトリ
+profile_env = "IMAGE_TOOLS_PROFILE"
+# tracemallocでPythonのメモリ確保の最大量を記録するかどうか("1"で記録する)
+tracemalloc_env = "IMAGE_TOOLS_TRACEMALLOC"
+
+# 記録する段階の名前(表示する順)
+trace_stages = ["list", "decode", "transform", "encode", "write"]
+
+# プロセスごとのcProfileのプロファイラ
+_profiler = None
+
+
+def enable_trace(trace_file, profile_dir=None, trace_malloc=False):
+    """enable_trace トレースの記録を有効にする(以降に起動するプロセスにも引き継がれる)
+
+    Args:
+        trace_file (str): トレースを追記するjson-linesのファイル
+        profile_dir (str, optional): 指定した場合はcProfileの結果をプロセスごとに
+                                     "ツール名.プロセスID.prof"として書き出す
+        trace_malloc (bool, optional): tracemallocで画像1枚ごとのPythonのメモリ確保の
+                                       最大量を記録するかどうか，デフォルトはFalse.
+    """
+    os.environ[trace_env] = os.path.abspath(trace_file)
+    if profile_dir is not None:
+        os.makedirs(profile_dir, exist_ok=True)
+        os.environ[profile_env] = os.path.abspath(profile_dir)
+    if trace_malloc is True:
+        os.environ[tracemalloc_env] = "1"
+
+
+def trace_enabled():
+    """trace_enabled トレースの記録が有効かどうかを返す"""
+    return os.environ.get(trace_env, "") != ""
+
+
+def write_trace_record(record):
+    """write_trace_record 1件の記録をトレースのファイルに1行で追記する
+
+    注意点:
+        複数のプロセスから追記しても行が混ざらないように，1行を1回の書き込みで追記する
+    """
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(os.environ[trace_env],
+                 os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+class ImageTrace:
+    """ImageTrace 1枚の画像の処理の段階ごとの処理時間・読み書きしたバイト数・画素数を記録する
+
+    注意点:
+        トレースが無効の場合も同じように使えるが，時間の計測や書き出しは行わない
+    """
+
+    def __init__(self, tool, image_src, image_dst=None):
+        self.enabled = trace_enabled()
+        # 複数のスレッドで保存する場合(切り抜きのencode_threads)に備えて加算を排他する
+        self.lock = threading.Lock()
+        self.record = {"tool": tool, "image": image_src, "output": image_dst,
+                       "stages": {}, "bytes_read": 0, "bytes_written": 0,
+                       "pixels": 0, "pid": os.getpid(), "error": None}
+
+    @contextmanager
+    def stage(self, name):
+        """stage withで囲んだ範囲の処理時間を段階nameの時間に加える"""
+        if self.enabled is False:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                stages = self.record["stages"]
+                stages[name] = stages.get(name, 0.0) + seconds
+
+    def add_read(self, image_src):
+        """add_read 読み込んだファイルのバイト数を加える"""
+        if self.enabled is True:
+            self.record["bytes_read"] += source_size(image_src)
+
+    def add_pixels(self, image_PIL):
+        """add_pixels 処理した画像の画素数を加える"""
+        if self.enabled is True:
+            with self.lock:
+                self.record["pixels"] += image_PIL.width * image_PIL.height
+
+    def add_written(self, n):
+        """add_written 書き込んだバイト数を加える"""
+        if self.enabled is True:
+            with self.lock:
+                self.record["bytes_written"] += n
+
+
+@contextmanager
+def trace_image(tool, image_src, image_dst=None):
+    """trace_image 1枚の画像の処理を記録し，終わったらトレースに1行追記する
+
+    Args:
+        tool (str): ツールの名前(例: "compress_image")
+        image_src (str): 処理前の画像ファイル
+        image_dst (str, optional): 処理後のファイル
+
+    Yields:
+        ImageTrace: 段階ごとの記録に使う
+
+    注意点:
+        処理が失敗した場合もエラー内容を記録してから例外をそのまま送出する
+        profile_dirを指定した場合はcProfileで計測し，1枚ごとにプロセスの累計を書き出す
+    """
+    trace = ImageTrace(tool, image_src, image_dst)
+    if trace.enabled is False:
+        yield trace
+        return
+    global _profiler
+    profile_dir = os.environ.get(profile_env, "")
+    if profile_dir != "" and _profiler is None:
+        _profiler = cProfile.Profile()
+    trace_malloc = os.environ.get(tracemalloc_env, "") == "1"
+    if trace_malloc is True:
+        if tracemalloc.is_tracing() is False:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    if _profiler is not None:
+        _profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield trace
+    except Exception as e:
+        trace.record["error"] = type(e).__name__ + ": " + str(e)
+        raise
+    finally:
+        trace.record["total"] = time.perf_counter() - start
+        if _profiler is not None:
+            _profiler.disable()
+            _profiler.dump_stats(os.path.join(
+                profile_dir, "%s.%d.prof" % (tool, os.getpid())))
+        if trace_malloc is True:
+            # Pillowの画素データはPythonの外で確保されるため含まれない
+            trace.record["python_peak_bytes"] = \
+                tracemalloc.get_traced_memory()[1]
+        write_trace_record(trace.record)
+
+
+def open_image(image_src, trace):
+    """open_image 画像ファイルを開き，読み込むバイト数を記録する(デコードはまだしない)
+
+    注意点:
+        パイプライン実行で先読み済みの場合はメモリ上のバイト列から開く
+    """
+    # Pillowは画像を開くときに初めて読み込む(--helpや引数の誤りの表示を速くするため)
+    from PIL import Image
+    trace.add_read(image_src)
+    return Image.open(read_source(image_src))
+
+
+def save_image(image_PIL, image_dst, trace, **params):
+    """save_image 画像を保存する(トレースが有効ならエンコードと書き込みの時間を分けて記録する)
+
+    Args:
+        image_PIL (PIL.Image.Image): 保存する画像
+        image_dst (str): 保存先の画像ファイル(拡張子で画像形式を決める)
+        trace (ImageTrace): 記録に使う
+        **params: Image.saveに渡す引数(quality，optimizeなど)
+    """
+    if trace.enabled is False and pipelined() is False:
+        trace.add_pixels(image_PIL)
+        image_PIL.save(image_dst, **params)
+        return
+    # メモリ上でエンコードしてから書き込み，それぞれの時間を記録する
+    write_bytes(encode_image(image_PIL, image_dst, trace, **params),
+                image_dst, trace)
+
+
+def encode_image(image_PIL, image_dst, trace, **params):
+    """encode_image 画像を保存先の拡張子の形式でメモリ上にエンコードし，バイト列を返す
+
+    Args:
+        image_PIL (PIL.Image.Image): エンコードする画像
+        image_dst (str): 保存先の画像ファイル(拡張子で画像形式を決める)
+        trace (ImageTrace): 記録に使う
+        **params: Image.saveに渡す引数(quality，optimizeなど)
+
+    Returns:
+        bytes: エンコードした画像ファイルの中身
+
+    注意点:
+        パイプライン実行の出力はスレッドごとに記録するため，処理用のスレッドの中で
+        エンコードだけを別のスレッドで行う場合は，書き込み(write_bytes)は呼び出し元で行う
+    """
+    from PIL import Image
+    trace.add_pixels(image_PIL)
+    with trace.stage("encode"):
+        extension = os.path.splitext(image_dst)[1].lower()
+        image_format = Image.registered_extensions()[extension]
+        buffer = io.BytesIO()
+        image_PIL.save(buffer, format=image_format, **params)
+    return buffer.getvalue()
+
+
+def write_bytes(data, path, trace):
+    """write_bytes バイト列をファイルに書き込み，書き込みの時間とバイト数を記録する
+
+    注意点:
+        パイプライン実行の処理中は書き込みスレッドに任せるため，書き込みの時間は含まれない
+    """
+    with trace.stage("write"):
+        write_output(data, path)
+    trace.add_written(len(data))
+
+
+def trace_listing(tool, images):
+    """trace_listing 画像ファイルの一覧の取得にかかった時間を記録する
+
+    Args:
+        tool (str): ツールの名前
+        images (iterable): 画像ファイルを順に返すイテラブル(scan_imagesの戻り値など)
+
+    Yields:
+        str: imagesと同じ画像ファイル
+
+    注意点:
+        一覧の取得は処理と並行して少しずつ進むため，次の画像ファイルを取り出すのに
+        かかった時間だけを合計し，最後に1行("image"はNone)追記する
+    """
+    if trace_enabled() is False:
+        yield from images
+        return
+    iterator = iter(images)
+    seconds = 0.0
+    count = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            image = next(iterator)
+        except StopIteration:
+            seconds += time.perf_counter() - start
+            break
+        seconds += time.perf_counter() - start
+        count += 1
+        yield image
+    write_trace_record({"tool": tool, "image": None, "output": None,
+                        "stages": {"list": seconds}, "total": seconds,
+                        "files": count, "pid": os.getpid(), "error": None})
+
+
+def percentile(values, q):
+    """percentile 並べ替え済みの値のq(0〜100)パーセンタイル(最近傍)を返す"""
+    if len(values) == 0:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def summarize_trace(trace_file, top=10):
+    """summarize_trace トレースを段階ごとのパーセンタイルと遅い画像の一覧に集計する
+
+    Args:
+        trace_file (str): json-linesのトレースのファイル
+        top (int, optional): 表示する遅い画像の件数，デフォルトは10.
+
+    Returns:
+        dict: 段階ごとの集計("stages": {段階: {count, total, p50, p90, p99, max}})，
+              合計のバイト数・画素数("bytes_read"，"bytes_written"，"pixels")，
+              失敗した件数("errors")，処理時間の長い画像("slowest")
+    """
+    stage_values = {}
+    images = []
+    summary = {"bytes_read": 0, "bytes_written": 0, "pixels": 0,
+               "errors": 0}
+    with open(trace_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() == "":
+                continue
+            record = json.loads(line)
+            for name, seconds in record["stages"].items():
+                stage_values.setdefault(name, []).append(seconds)
+            if record["image"] is None:
+                continue
+            images.append(record)
+            for key in ["bytes_read", "bytes_written", "pixels"]:
+                summary[key] += record.get(key, 0)
+            if record.get("error") is not None:
+                summary["errors"] += 1
+    stages = {}
+    order = trace_stages + sorted(set(stage_values) - set(trace_stages))
+    for name in order:
+        if name not in stage_values:
+            continue
+        values = sorted(stage_values[name])
+        stages[name] = {"count": len(values), "total": sum(values),
+                        "p50": percentile(values, 50),
+                        "p90": percentile(values, 90),
+                        "p99": percentile(values, 99),
+                        "max": values[-1]}
+    summary["stages"] = stages
+    summary["images"] = len(images)
+    images.sort(key=lambda record: record.get("total", 0.0), reverse=True)
+    summary["slowest"] = [{"tool": r["tool"], "image": r["image"],
+                           "total": r.get("total", 0.0),
+                           "stages": r["stages"]} for r in images[:top]]
+    return summary
+
+
+def print_trace_summary(summary):
+    """print_trace_summary summarize_traceの集計を表にして表示する"""
+    print("{:10s}{:>8s}{:>11s}{:>11s}{:>11s}{:>11s}{:>11s}".format(
+        "stage", "count", "total[s]", "p50[ms]", "p90[ms]", "p99[ms]",
+        "max[ms]"))
+    for name, s in summary["stages"].items():
+        print("{:10s}{:8d}{:11.3f}{:11.2f}{:11.2f}{:11.2f}{:11.2f}".format(
+            name, s["count"], s["total"], s["p50"] * 1000, s["p90"] * 1000,
+            s["p99"] * 1000, s["max"] * 1000))
+    print("-" * 70)
+    print("images: " + str(summary["images"]) +
+          ", errors: " + str(summary["errors"]) +
+          ", read: {:.2f} MB, written: {:.2f} MB, pixels: {:.1f} MP".format(
+              summary["bytes_read"] / 1e6, summary["bytes_written"] / 1e6,
+              summary["pixels"] / 1e6))
+    print("-" * 70)
+    print("slowest images")
+    for record in summary["slowest"]:
+        stages = ", ".join("{}: {:.1f} ms".format(name, seconds * 1000)
+                           for name, seconds in record["stages"].items())
+        print(" {:.1f} ms  {} ({})".format(record["total"] * 1000,
+                                           record["image"], stages))
+
+
+# ----------------------------------------------------------------------
+# トレースを集計して表示する
+# 例: image-tools compress --trace trace.jsonl
+#     image-tools trace trace.jsonl --top 10
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインからトレースを集計して表示する(image-tools trace)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="summarize a per-stage trace")
+    parser.add_argument("trace_file")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true",
+                        help="print the summary as JSON")
+    args = parser.parse_args(args)
+    summary = summarize_trace(args.trace_file, args.top)
+    if args.json is True:
+        print(json.dumps(summary, ensure_ascii=False, indent=1))
+    else:
+        print_trace_summary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
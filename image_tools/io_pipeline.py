@@ -0,0 +1,297 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# io_pipeline.py
+# ファイルの読み込み・画像の処理・ファイルの書き込みを別々のスレッドで重ねて実行する
+# (ネットワーク上のストレージなど読み書きが遅い場合に，読み書きの待ち時間を処理の裏に隠す)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from collections import namedtuple
+import contextlib
+import io
+import os
+import queue
+import threading
+
+# 既定の先読みする枚数と書き込み待ちの枚数
+default_prefetch = 4
+default_write_depth = 4
+
+# パイプライン実行の設定(enable_pipelineで有効にする)
+_config = {"enabled": False, "prefetch": default_prefetch,
+           "write_depth": default_write_depth}
+
+# 処理中のスレッドごとの入出力(先読みしたバイト列と書き込み待ちのバイト列)
+_local = threading.local()
+
+# 1件の処理結果(args: 処理関数に渡した引数, value: 戻り値, error: エラー内容)
+PipelineResult = namedtuple("PipelineResult", ["args", "value", "error"])
+
+# 読み込みの終わりを表す印
+_end = object()
+
+
+class PrefetchedFile(io.BytesIO):
+    """PrefetchedFile 先読みしたバイト列を読むファイルオブジェクト(エラー表示用に元のパスを持つ)"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+    def __repr__(self):
+        return repr(self.name)
+
+
+def enable_pipeline(prefetch=default_prefetch,
+                    write_depth=default_write_depth):
+    """enable_pipeline 以降のrun_batchを読み込み・処理・書き込みのパイプラインで実行する
+
+    Args:
+        prefetch (int, optional): 先読みしておく画像ファイルの枚数，デフォルトは4.
+        write_depth (int, optional): 書き込みを待たせておける画像の枚数，デフォルトは4.
+    """
+    _config["enabled"] = True
+    _config["prefetch"] = max(1, prefetch)
+    _config["write_depth"] = max(1, write_depth)
+
+
+def disable_pipeline():
+    """disable_pipeline パイプライン実行を無効にする(プロセスプールでの実行に戻す)"""
+    _config["enabled"] = False
+
+
+def pipeline_enabled():
+    """pipeline_enabled パイプライン実行が有効かどうかを返す"""
+    return _config["enabled"]
+
+
+def pipelined():
+    """pipelined 現在のスレッドがパイプラインの処理スレッドとして動いているかどうかを返す"""
+    return getattr(_local, "inputs", None) is not None
+
+
+def read_bytes(path):
+    """read_bytes ファイルの中身を返す(先読み済みの場合はメモリ上のバイト列を返す)"""
+    inputs = getattr(_local, "inputs", None)
+    if inputs is not None and path in inputs:
+        return inputs[path]
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_source(path):
+    """read_source Image.openなどに渡す入力を返す
+
+    Returns:
+        str または PrefetchedFile: 先読み済みの場合はバイト列を読むファイルオブジェクト，
+                                   そうでない場合はpathそのもの
+    """
+    inputs = getattr(_local, "inputs", None)
+    if inputs is not None and path in inputs:
+        return PrefetchedFile(inputs[path], path)
+    return path
+
+
+def source_size(path):
+    """source_size 入力のファイルのバイト数を返す(先読み済みの場合はメモリ上のバイト列の長さ)"""
+    inputs = getattr(_local, "inputs", None)
+    if inputs is not None and path in inputs:
+        return len(inputs[path])
+    return os.path.getsize(path)
+
+
+def read_output(path):
+    """read_output 書き込んだファイルの中身を返す(書き込み待ちの場合はメモリ上のバイト列を返す)"""
+    for output_path, data in reversed(getattr(_local, "outputs", None) or []):
+        if output_path == path:
+            return data
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_output(data, path):
+    """write_output バイト列をファイルに書き込む(パイプラインの処理中は書き込みスレッドに任せる)
+
+    注意点:
+        パイプラインの処理中は，処理関数が例外を送出した場合は何も書き込まない
+    """
+    outputs = getattr(_local, "outputs", None)
+    if outputs is not None:
+        outputs.append((path, data))
+        return
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@contextlib.contextmanager
+def memory_io(inputs):
+    """memory_io このスレッドの処理中の入出力をメモリ上で行う
+
+    Args:
+        inputs (dict): パスと，そのパスのファイルの代わりに読むバイト列
+
+    Yields:
+        list: 処理中に書き込まれた(パス, バイト列)のリスト(ファイルには書き込まない)
+
+    注意点:
+        read_source/read_bytes/write_outputを使う処理関数は，
+        ファイルを読み書きせずにメモリ上のバイト列を読み書きする
+    """
+    outputs = []
+    _local.inputs, _local.outputs = inputs, outputs
+    try:
+        yield outputs
+    finally:
+        _local.inputs, _local.outputs = None, None
+
+
+def _read_stage(items, read_queue, slots, stop, workers, failure,
+                budget, estimate, costs):
+    """_read_stage 引数を順に取り出し，最初の引数のファイルを先読みして処理待ちの列に入れる"""
+    try:
+        for index, args in enumerate(items):
+            # 処理中・書き込み待ち・結果待ちの合計が上限に達していれば空くまで待つ
+            while slots.acquire(timeout=0.1) is False:
+                if stop.is_set():
+                    return
+            if stop.is_set():
+                return
+            # メモリの上限がある場合は見積もりの合計が上限に収まるまで待つ
+            if budget is not None:
+                costs[index] = estimate(args)
+                if budget.acquire(costs[index], stop) is False:
+                    return
+            inputs, error = {}, None
+            path = args[0] if len(args) > 0 else None
+            if isinstance(path, str):
+                try:
+                    with open(path, "rb") as f:
+                        inputs[path] = f.read()
+                except OSError as e:
+                    error = type(e).__name__ + ": " + str(e)
+            read_queue.put((index, args, inputs, error))
+    except Exception as e:
+        # 一覧の取得の失敗は呼び出し元で送出する
+        failure.append(e)
+    finally:
+        for _ in range(workers):
+            read_queue.put(_end)
+
+
+def _work_stage(func, read_queue, write_queue):
+    """_work_stage 先読みしたバイト列を使って処理し，書き込むバイト列を書き込み待ちの列に入れる"""
+    while True:
+        task = read_queue.get()
+        if task is _end:
+            write_queue.put(_end)
+            return
+        index, args, inputs, error = task
+        value, outputs = None, []
+        if error is None:
+            try:
+                with memory_io(inputs) as outputs:
+                    value = func(*args)
+            except Exception as e:
+                error = type(e).__name__ + ": " + str(e)
+        write_queue.put((index, args, value, error, outputs))
+
+
+def _write_stage(write_queue, workers, done, condition):
+    """_write_stage 書き込み待ちのバイト列をファイルに書き込み，結果を結果待ちに入れる"""
+    finished = 0
+    while finished < workers:
+        task = write_queue.get()
+        if task is _end:
+            finished += 1
+            continue
+        index, args, value, error, outputs = task
+        if error is None:
+            try:
+                for path, data in outputs:
+                    with open(path, "wb") as f:
+                        f.write(data)
+            except OSError as e:
+                error = type(e).__name__ + ": " + str(e)
+        with condition:
+            done[index] = PipelineResult(args, value, error)
+            condition.notify()
+    with condition:
+        done[None] = None
+        condition.notify()
+
+
+def run_pipelined(func, items, workers=None, prefetch=None,
+                  write_depth=None, budget=None, estimate=None):
+    """run_pipelined 読み込み・処理・書き込みを別々のスレッドで重ねて複数件の処理を実行する
+
+    Args:
+        func (function): 1件分の処理を行う関数(最初の引数が入力のファイル)
+        items (iterable): funcに渡す引数(tuple)を順に返すイテラブル
+        workers (int, optional): 処理を行うスレッド数，デフォルトはNone(CPU数).
+        prefetch (int, optional): 先読みしておく枚数，デフォルトはNone(enable_pipelineの設定).
+        write_depth (int, optional): 書き込みを待たせておける枚数
+                                     デフォルトはNone(enable_pipelineの設定).
+        budget (MemoryBudget, optional): 同時に扱う画像のメモリの上限，デフォルトはNone(無し).
+        estimate (function, optional): budgetを指定した場合に1件の引数から使うメモリを
+                                       見積もる関数
+
+    Yields:
+        PipelineResult: 1件の処理結果(itemsと同じ順番で，書き込みが終わってから返す)
+
+    注意点:
+        読み込み(1スレッド)→処理(workersスレッド)→書き込み(1スレッド)の間を
+        上限付きの列でつなぎ，同時に扱う枚数をprefetch+workers+write_depthまでに抑える
+        funcの中でread_source/read_bytes/write_outputを使った入出力がメモリ上で行われる
+        Pillowのデコードとエンコードは処理中にGILを解放するため，スレッドでも並列になる
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    workers = max(1, workers)
+    if prefetch is None:
+        prefetch = _config["prefetch"]
+    if write_depth is None:
+        write_depth = _config["write_depth"]
+    read_queue = queue.Queue(maxsize=prefetch)
+    write_queue = queue.Queue(maxsize=write_depth)
+    slots = threading.Semaphore(prefetch + workers + write_depth)
+    stop = threading.Event()
+    failure = []
+    costs = {}
+    done = {}
+    condition = threading.Condition()
+    threads = [threading.Thread(target=_read_stage, daemon=True,
+                                args=(items, read_queue, slots, stop,
+                                      workers, failure, budget, estimate,
+                                      costs))]
+    threads += [threading.Thread(target=_work_stage, daemon=True,
+                                 args=(func, read_queue, write_queue))
+                for _ in range(workers)]
+    threads.append(threading.Thread(target=_write_stage, daemon=True,
+                                    args=(write_queue, workers, done,
+                                          condition)))
+    for thread in threads:
+        thread.start()
+    # ------------------------------------------------------------------
+    # 書き込みが終わった結果を入力の順番に返す
+    # ------------------------------------------------------------------
+    index = 0
+    try:
+        while True:
+            with condition:
+                while index not in done and None not in done:
+                    condition.wait()
+                if index not in done:
+                    break
+                result = done.pop(index)
+            if budget is not None:
+                budget.release(costs.pop(index))
+            index += 1
+            slots.release()
+            yield result
+    finally:
+        # 途中で止められた場合は読み込みを止め，残りの処理を捨てる
+        stop.set()
+    for thread in threads:
+        thread.join()
+    if len(failure) > 0:
+        raise failure[0]
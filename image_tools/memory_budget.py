@@ -0,0 +1,106 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# memory_budget.py
+# 画像のヘッダから展開後の大きさを見積もり，同時に処理する画像の合計をメモリの上限以下に抑える
+# (大きな画像は1枚ずつ，小さな画像はまとめて並列に処理する)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import threading
+
+# 1画素あたりのバイト数(Pillowは複数チャンネルの画像を1画素4バイトで持つ)
+mode_bytes_per_pixel = {"1": 1, "L": 1, "P": 1, "I;16": 2, "I;16L": 2,
+                        "I;16B": 2, "I;16N": 2}
+
+# 既定の見積もりで数える画像のコピーの数(展開した画像と処理後の画像)
+default_copies = 2
+
+# 単位の接尾辞とバイト数
+byte_units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_bytes(text):
+    """parse_bytes "512M"や"4G"のような大きさの文字列をバイト数にする
+
+    Args:
+        text (str): 数値と単位(K，M，G，T，省略するとバイト)
+
+    Returns:
+        int: バイト数
+    """
+    text = text.strip().upper().rstrip("B")
+    if text[-1:] in byte_units:
+        return int(float(text[:-1]) * byte_units[text[-1]])
+    return int(text)
+
+
+def estimate_image_bytes(image_src, copies=default_copies):
+    """estimate_image_bytes 画像のヘッダだけを読み，処理中に使うメモリのバイト数を見積もる
+
+    Args:
+        image_src (str): 画像ファイル(相対パス・拡張子付き)
+        copies (int, optional): 同時に持つ画像のコピーの数，デフォルトは2.
+
+    Returns:
+        int: 見積もったバイト数(ヘッダを読めない場合は0)
+
+    注意点:
+        Image.openはヘッダしか読まないため，画素データの展開(デコード)はしない
+        読めない画像は処理の時点でエラーになるため，ここでは0として扱う
+    """
+    from PIL import Image
+    try:
+        with Image.open(image_src) as image_PIL:
+            w, h = image_PIL.size
+            mode = image_PIL.mode
+    except (OSError, ValueError):
+        return 0
+    return w * h * mode_bytes_per_pixel.get(mode, 4) * copies
+
+
+def estimate_args_bytes(args):
+    """estimate_args_bytes 処理関数の引数(最初が入力の画像ファイル)から使うメモリを見積もる"""
+    if len(args) == 0 or isinstance(args[0], str) is False:
+        return 0
+    return estimate_image_bytes(args[0])
+
+
+class MemoryBudget:
+    """MemoryBudget 処理中の画像の見積もりの合計がメモリの上限を超えないように受け付ける
+
+    注意点:
+        上限を超える1件は，他に処理中のものが無くなってから単独で受け付ける
+        (そのため処理できない画像は無く，大きな画像は1枚ずつ処理される)
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self.condition = threading.Condition()
+
+    def _admissible(self, cost):
+        return self.in_use == 0 or self.in_use + cost <= self.limit
+
+    def try_acquire(self, cost):
+        """try_acquire 上限以下に収まる場合だけcostを受け付けてTrueを返す(待たない)"""
+        with self.condition:
+            if self._admissible(cost) is False:
+                return False
+            self.in_use += cost
+            return True
+
+    def acquire(self, cost, stop=None):
+        """acquire costを受け付けられるまで待つ(stopが設定された場合はFalseを返す)"""
+        with self.condition:
+            while self._admissible(cost) is False:
+                if stop is not None and stop.is_set():
+                    return False
+                self.condition.wait(timeout=0.1)
+            self.in_use += cost
+            return True
+
+    def release(self, cost):
+        """release 処理が終わった分を上限から戻す"""
+        with self.condition:
+            self.in_use -= cost
+            self.condition.notify_all()
@@ -0,0 +1,602 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# print_coordinate_clicked_with_mouse.py
+# マウスで左クリックした箇所の画像内の座標を表示する
+#
+# 参考文献：
+# http://opencv.jp/opencv-2.2/py/highgui_user_interface.html
+# https://www.geeksforgeeks.org/python-opencv-cv2-puttext-method/
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+import argparse
+import csv
+import cv2
+import math
+import numpy as np
+import os
+import sys
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.scan_images import make_output_path
+
+# 白色のBGR(OpenCVはBGRを使うため)
+white_bgr = (255, 255, 255)
+# 黒色のBGR(OpenCVはBGRを使うため)
+black_bgr = (0, 0, 0)
+
+
+# ウィンドウに表示する領域(ビューポート)の最大の幅と高さ[px]
+max_viewport_size = (1280, 960)
+# 表示の倍率(元の画像の何ピクセルを表示の1ピクセルにするか)の最小値(拡大の上限)
+min_view_scale = 1 / 8
+# 表示を移動するキーと移動する向き(ビューポートの幅・高さの1/4ずつ移動する)
+pan_keys = {
+    ord("a"): (-1, 0), ord("h"): (-1, 0),
+    ord("d"): (1, 0), ord("l"): (1, 0),
+    ord("w"): (0, -1), ord("k"): (0, -1),
+    ord("s"): (0, 1), ord("j"): (0, 1),
+}
+# 拡大・縮小するキー
+zoom_in_keys = [ord("+"), ord("=")]
+zoom_out_keys = [ord("-"), ord("_")]
+
+
+def build_display_pyramid(im, viewport_size=max_viewport_size):
+    """build_display_pyramid 表示用に1/2ずつ縮小した画像(ピラミッド)を作る
+
+    Args:
+        im (numpy.ndarray): 元の解像度の画像(OpenCVのBGR)
+        viewport_size (tuple, optional): ビューポートの最大の幅と高さ[px]
+
+    Returns:
+        list: 元の画像を先頭に，1/2，1/4，...に縮小した画像を並べたリスト
+              (最後の画像はビューポートに収まる大きさ)
+    """
+    pyramid = [im]
+    while pyramid[-1].shape[1] > viewport_size[0] \
+            or pyramid[-1].shape[0] > viewport_size[1]:
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def init_view(param, im):
+    """init_view 表示用のピラミッドを作り，画像全体がビューポートに収まる表示にする
+
+    Args:
+        param (dict): マウスイベントのコールバック関数に渡す辞書
+        im (numpy.ndarray): 元の解像度の画像(OpenCVのBGR)
+    """
+    viewport_size = param.get("viewport size", max_viewport_size)
+    param["pyramid"] = build_display_pyramid(im, viewport_size)
+    height, width = im.shape[:2]
+    # 画像全体が収まる最も大きい表示(2の累乗の倍率)から始める
+    scale = float(2 ** (len(param["pyramid"]) - 1))
+    param["view scale"] = scale
+    param["view x"] = 0.0
+    param["view y"] = 0.0
+    param["viewport size"] = (min(viewport_size[0],
+                                  math.ceil(width / scale)),
+                              min(viewport_size[1],
+                                  math.ceil(height / scale)))
+    param["markers"] = []
+    param["dirty rect"] = None
+
+
+def _clamp_view(param):
+    """_clamp_view 表示する領域が画像の外に出すぎないように左上の座標を調整する"""
+    height, width = param["pyramid"][0].shape[:2]
+    viewport_width, viewport_height = param["viewport size"]
+    scale = param["view scale"]
+    param["view x"] = min(max(0.0, param["view x"]),
+                          max(0.0, width - viewport_width * scale))
+    param["view y"] = min(max(0.0, param["view y"]),
+                          max(0.0, height - viewport_height * scale))
+
+
+def view_to_image(param, x, y):
+    """view_to_image ウィンドウ上の座標を元の解像度の画像内の座標にする
+
+    Returns:
+        tuple: 元の画像内の座標(x, y)，画像の外の場合はNone
+    """
+    height, width = param["pyramid"][0].shape[:2]
+    image_x = int(param["view x"] + x * param["view scale"])
+    image_y = int(param["view y"] + y * param["view scale"])
+    if image_x < 0 or image_y < 0 or image_x >= width or image_y >= height:
+        return None
+    return (image_x, image_y)
+
+
+def image_to_view(param, image_x, image_y):
+    """image_to_view 元の解像度の画像内の座標をウィンドウ上の座標にする"""
+    return (int((image_x - param["view x"]) / param["view scale"]),
+            int((image_y - param["view y"]) / param["view scale"]))
+
+
+def render_view(param):
+    """render_view 表示倍率に合ったピラミッドの画像からビューポートの分だけ切り出して表示する
+
+    Args:
+        param (dict): マウスイベントのコールバック関数に渡す辞書
+
+    注意点:
+        コピーするのはビューポートの大きさの分だけで，元の解像度の画像全体はコピーしない
+        印(丸と座標の文字列)は背景(param["view base"])ではなく表示用の画像
+        (param["view frame"])に描き，元の画像には描かない
+    """
+    pyramid = param["pyramid"]
+    scale = param["view scale"]
+    viewport_width, viewport_height = param["viewport size"]
+    # 表示倍率以下で最も粗いピラミッドの画像を選ぶ
+    level = int(min(max(0, math.floor(math.log2(scale))), len(pyramid) - 1))
+    level_scale = 2 ** level
+    im_level = pyramid[level]
+    # 選んだ画像の1ピクセルを表示の何ピクセルにするか(拡大する場合だけ1より大きい)
+    zoom = level_scale / scale
+    x0 = int(param["view x"] / level_scale)
+    y0 = int(param["view y"] / level_scale)
+    region = im_level[y0:y0 + math.ceil(viewport_height / zoom),
+                      x0:x0 + math.ceil(viewport_width / zoom)]
+    if zoom != 1 and region.size > 0:
+        region = cv2.resize(region, (round(region.shape[1] * zoom),
+                                     round(region.shape[0] * zoom)),
+                            interpolation=cv2.INTER_NEAREST)
+    region = region[:viewport_height, :viewport_width]
+    # 画像の外の部分は黒色にした，ビューポートの大きさの背景を作る
+    base = np.zeros((viewport_height, viewport_width, 3), dtype=np.uint8)
+    base[:region.shape[0], :region.shape[1]] = region
+    param["view base"] = base
+    param["view frame"] = base.copy()
+    param["dirty rect"] = None
+    # ビューポート内にある印を描き直す
+    for image_x, image_y in param["markers"]:
+        x, y = image_to_view(param, image_x, image_y)
+        if 0 <= x < viewport_width and 0 <= y < viewport_height:
+            param["dirty rect"] = draw_coordinate(
+                param["view frame"], (x, y), (image_x, image_y), param)
+    cv2.imshow(param["window name"], param["view frame"])
+
+
+def zoom_view(param, factor, x=None, y=None):
+    """zoom_view ウィンドウ上の点(x, y)を中心に表示倍率をfactor倍にする(2で縮小，1/2で拡大)"""
+    viewport_width, viewport_height = param["viewport size"]
+    if x is None or y is None:
+        x, y = viewport_width // 2, viewport_height // 2
+    max_scale = float(2 ** (len(param["pyramid"]) - 1))
+    scale = min(max(param["view scale"] * factor, min_view_scale), max_scale)
+    # 拡大・縮小の前後でウィンドウ上の点(x, y)が指す画像内の座標を変えない
+    image_x = param["view x"] + x * param["view scale"]
+    image_y = param["view y"] + y * param["view scale"]
+    param["view scale"] = scale
+    param["view x"] = image_x - x * scale
+    param["view y"] = image_y - y * scale
+    _clamp_view(param)
+    render_view(param)
+
+
+def pan_view(param, dx, dy):
+    """pan_view 表示する領域をウィンドウ上で(dx, dy)[px]だけ移動する"""
+    param["view x"] += dx * param["view scale"]
+    param["view y"] += dy * param["view scale"]
+    _clamp_view(param)
+    render_view(param)
+
+
+def draw_coordinate(img, center, coordinate_xy, param):
+    """draw_coordinate 点centerに丸を描き，その右横に座標の文字列を描く
+
+    Args:
+        img (numpy.ndarray): 描く先の画像
+        center (tuple): 丸を描く画像内の座標
+        coordinate_xy (tuple): 文字列にする座標(元の解像度の画像内の座標)
+        param (dict): cv2.circle()とcv2.putText()の引数を格納した辞書
+
+    Returns:
+        tuple: 描いた範囲(左上x, 左上y, 右下x, 右下y)
+    """
+    x, y = center
+    # マウスで左クリックした座標に丸を描く
+    cv2.circle(img=img,
+               center=(x, y),
+               radius=param["circle radius"],
+               color=param["circle color"],
+               thickness=param["circle thickness"],
+               lineType=param["circle lineType"],
+               shift=param["circle shift"])
+    # 座標を見やすく表示する文字列
+    coordinate = "(x,y)=(" + str(coordinate_xy[0]) + "," + \
+        str(coordinate_xy[1]) + ")"
+    # 座標の文字列をウィンドウ上に表示
+    cv2.putText(img=img,
+                text=coordinate,
+                org=(x+10, y+10),
+                fontFace=param["putText fontFace"],
+                fontScale=param["putText fontScale"],
+                color=param["putText color"],
+                thickness=param["putText thickness"],
+                lineType=param["putText lineType"],
+                bottomLeftOrigin=param["putText bottomLeftOrigin"])
+    # 丸と文字列を囲む範囲(線の太さと文字の下にはみ出す分を含む)を求める
+    (text_width, text_height), baseline = cv2.getTextSize(
+        coordinate, param["putText fontFace"], param["putText fontScale"],
+        param["putText thickness"])
+    r = param["circle radius"] + max(param["circle thickness"], 1) + 1
+    margin = param["putText thickness"] + 1
+    if param["putText bottomLeftOrigin"] is True:
+        text_top, text_bottom = y + 10 - baseline, y + 10 + text_height
+    else:
+        text_top, text_bottom = y + 10 - text_height, y + 10 + baseline
+    return (min(x - r, x + 10 - margin), min(y - r, text_top - margin),
+            max(x + r, x + 10 + text_width + margin) + 1,
+            max(y + r, text_bottom + margin) + 1)
+
+
+def _restore_rect(frame, base, rect):
+    """_restore_rect 表示用の画像のうち印を描いた範囲だけを背景から戻す"""
+    height, width = frame.shape[:2]
+    x0, y0 = max(rect[0], 0), max(rect[1], 0)
+    x1, y1 = min(rect[2], width), min(rect[3], height)
+    if x0 < x1 and y0 < y1:
+        frame[y0:y1, x0:x1] = base[y0:y1, x0:x1]
+
+
+def set_default_mouse_callback_param(param):
+    """set_default_mouse_callback_param
+                マウスイベントのコールバック変数内に渡す引数を格納する辞書paramについて
+                設定されてない項目に適用される値を設定する
+
+    Args:
+        param (dict): マウスイベントのコールバック関数に渡す辞書
+                      (ヘッドレスで印を描く場合もcv2.circle()とcv2.putText()の引数に使う)
+
+    Returns:
+        dict: 既定の値を設定したparam(引数の辞書そのもの)
+    """
+    # 座標を1つずつ表示する(False)か複数を重ねて表示する(True)か
+    if "multiple coordinates" not in param.keys():
+        param["multiple coordinates"] = False
+    # ウィンドウの名前
+    if "window name" not in param.keys():
+        param["window name"] = "Print Coordinate Clicked with Mouse"
+    # ------------------------------------------------------------------
+    # マウスイベントのコールバック変数内に渡す引数を格納する辞書であるparamについて
+    # cv2.circle()の引数
+    # の値を設定
+    # ------------------------------------------------------------------
+    # radius: 円の半径[px(ピクセル)]
+    if "circle radius" not in param.keys():
+        param["circle radius"] = 10
+    # color: 円の色(ただしBGR形式)
+    if "circle color" not in param.keys():
+        param["circle color"] = white_bgr
+    # thickness: 線の太さ[px(ピクセル)]，負の数にすると塗りつぶし
+    if "circle thickness" not in param.keys():
+        param["circle thickness"] = -1
+    # lineType: 線の描画方法(OpenCV独自のものを3択から選ぶ)
+    # cv2.LINE_4 または cv2.LINE_8 または cv2.LINE_AA
+    if "circle lineType" not in param.keys():
+        param["circle lineType"] = cv2.LINE_8
+    # 座標の少数部分のビット数，デフォルトは0
+    if "circle shift" not in param.keys():
+        param["circle shift"] = 0
+    # ------------------------------------------------------------------
+    # マウスイベントのコールバック変数内に渡す引数を格納する辞書であるparamについて
+    # cv2.putText()の引数
+    # の値を設定
+    # ------------------------------------------------------------------
+    # fontFace: フォントの種類(OpenCV独自のものから選ぶ)
+    if "putText fontFace" not in param.keys():
+        param["putText fontFace"] = cv2.FONT_HERSHEY_PLAIN
+    # fontScale:文字の縮尺(1.0を基準にfloat型で指定)
+    if "putText fontScale" not in param.keys():
+        param["putText fontScale"] = 1.5
+    # color: 文字の色(ただし，BGR形式)
+    if "putText color" not in param.keys():
+        param["putText color"] = white_bgr
+    # thickness: 文字の太さ[px(ピクセル)]
+    if "putText thickness" not in param.keys():
+        param["putText thickness"] = 2
+    # lineType: 線の描画方法(OpenCV独自のものを3択から選ぶ)
+    # cv2.LINE_4 または cv2.LINE_8 または cv2.LINE_AA
+    if "putText lineType" not in param.keys():
+        param["putText lineType"] = cv2.LINE_8
+    # putText bottomLeftOrigin: 画像データの原点をどこに置くか
+    # Falseだと左上，Trueだと左下になる
+    if "putText bottomLeftOrigin" not in param.keys():
+        param["putText bottomLeftOrigin"] = False
+    return param
+
+
+def record_coordinate(record_file, image, coordinate_xy):
+    """record_coordinate クリックした座標を1行ずつcsvファイルに追記する
+
+    Args:
+        record_file (str): 記録するcsvファイル(無い場合は見出し"image,x,y"を付けて作る)
+        image (str): クリックした画像ファイル
+        coordinate_xy (tuple): 元の解像度の画像内の座標(x, y)
+    """
+    new_file = os.path.isfile(record_file) is False
+    with open(record_file, "a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if new_file is True:
+            writer.writerow(["image", "x", "y"])
+        writer.writerow([image, coordinate_xy[0], coordinate_xy[1]])
+
+
+def load_coordinates(record_file):
+    """load_coordinates record_coordinateで記録したcsvファイルを画像ごとの座標のリストにする
+
+    Args:
+        record_file (str): 座標を記録したcsvファイル(見出しは"image,x,y")
+
+    Returns:
+        dict: 画像ファイルをkey，座標(x, y)のリストをvalueとする辞書(記録した順)
+    """
+    coordinates = {}
+    with open(record_file, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            coordinates.setdefault(row["image"], []).append(
+                (int(row["x"]), int(row["y"])))
+    return coordinates
+
+
+def annotate_one_image(image_src, image_dst, coordinates, param):
+    """annotate_one_image 1枚の画像の各座標に，クリックしたときと同じ丸と座標の文字列を描いて保存する
+
+    Args:
+        image_src (str): 印を描く前の画像ファイル(相対パス・拡張子付き)
+        image_dst (str): 印を描いた画像ファイル(相対パス・拡張子付き)
+        coordinates (list): 元の解像度の画像内の座標(x, y)のリスト
+        param (dict): cv2.circle()とcv2.putText()の引数を格納した辞書
+
+    注意点:
+        ウィンドウを使わないため，ディスプレイ(Xサーバ)の無い環境でも動く
+    """
+    im = cv2.imread(image_src, cv2.IMREAD_COLOR)
+    if im is None:
+        raise OSError("cannot read image: " + image_src)
+    for coordinate_xy in coordinates:
+        draw_coordinate(im, coordinate_xy, coordinate_xy, param)
+    if cv2.imwrite(image_dst, im) is False:
+        raise OSError("cannot write image: " + image_dst)
+
+
+def _relative_image(image, indir):
+    """_relative_image 記録した画像ファイルをindirからの相対パスにする(indirの外ならそのまま)"""
+    image_norm = os.path.normpath(image)
+    indir_norm = os.path.normpath(indir)
+    if image_norm.startswith(indir_norm + os.sep):
+        return os.path.relpath(image_norm, indir_norm)
+    return image
+
+
+def annotate_images_with_coordinates(indir, outdir, record_file,
+                                     mouse_callback_param=None,
+                                     jobs=1, chunksize=1):
+    """annotate_images_with_coordinates
+                記録した座標に，クリックしたときと同じ丸と座標の文字列を(ウィンドウ無しで)まとめて描く
+
+    Args:
+        indir (str): 印を描く前の画像ファイルをまとめて置いているディレクトリ
+        outdir (str): 印を描いた画像ファイルをまとめて置くディレクトリ
+        record_file (str): 座標を記録したcsvファイル(見出しは"image,x,y"で，
+                           imageはindirからの相対パスまたはindirを含むパス)
+        mouse_callback_param (dict, optional): 丸と文字列の描き方
+                                               ("circle *"，"putText *")
+                                               デフォルトはNone
+                                               (クリックしたときと同じ既定の値).
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+
+    Returns:
+        list: 印を描くのに失敗した(画像ファイル, エラー内容)のリスト
+    """
+    # 丸と文字列の描き方だけを取り出す(プロセス間で渡すため画像などは含めない)
+    if mouse_callback_param is None:
+        mouse_callback_param = {}
+    param = set_default_mouse_callback_param(dict(mouse_callback_param))
+    param = {key: value for key, value in param.items()
+             if key.startswith("circle ") or key.startswith("putText ")}
+    # 印を描いた画像をまとめて格納する出力先ディレクトリが無い場合は作成
+    if os.path.isdir(outdir) is False:
+        os.makedirs(outdir)
+    # 画像1枚ずつに対する印を描く処理の引数(描く前・後の画像ファイルなど)を定義
+    coordinates = load_coordinates(record_file)
+    items = []
+    for image, coordinates_of_image in coordinates.items():
+        image = _relative_image(image, indir)
+        items.append((os.path.join(indir, image),
+                      make_output_path(outdir, image),
+                      coordinates_of_image, param))
+    # 画像1枚ずつに対して印を(並列に)描く
+    errors = []
+    for result in run_batch(annotate_one_image, items, jobs, chunksize):
+        image_src, image_dst = result.args[0], result.args[1]
+        if result.error is not None:
+            # 印を描くのに失敗した画像は記録しておき，残りの画像の処理は続ける
+            errors.append((image_src, result.error))
+            continue
+        # どの画像に印が描かれたのか表示
+        print("Annotate: ", image_src + " --> " + image_dst +
+              " (" + str(len(result.args[2])) + " points)")
+    # 印を描くのに失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    # 全ての画像について印を描き終えたことを報告する
+    print("Finished for all images")
+    return errors
+
+
+def mouse_callback_print_coordinate(event, x, y, flags, param=None):
+    """mouse_callback_print_coordinate マウスイベントのコールバック関数
+
+    Args: (以下の5つはOpenCV側で指定されたものである)
+        event (str): マウスイベント(マウスによる何らかの操作)
+        x : マウスイベントが発生したx座標
+        y : マウスイベントが発生したy座標
+        flags : マウスイベント発生時の動作
+        param (dict): setMouseCallback()の第3引数から
+                        本コールバック関数内に辞書にして引数を渡す
+    """
+    # ------------------------------------------------------------------
+    # マウスイベントのコールバック変数内に渡す引数を格納する辞書であるparamについて
+    # 設定されてない項目に適用される値を定義
+    # ------------------------------------------------------------------
+    # 辞書のkeyに"im_cv2"が無い場合は異常終了
+    if "im_cv2" not in param.keys():
+        print("Error: 関数print_coordinate_clicked_with_mouse")
+        print("の中でparam[\"im_cv2\"]の値を代入してから")
+        print("コールバック関数mouse_callback_print_coordinate")
+        print("に渡すようにしてください．")
+        sys.exit(1)
+    im = param["im_cv2"]
+    # 設定されてない項目に既定の値を設定
+    set_default_mouse_callback_param(param)
+    # ------------------------------------------------------------------
+    # 表示用のピラミッドがまだ無い場合は作る(画像全体がウィンドウに収まる表示にする)
+    # ------------------------------------------------------------------
+    if "pyramid" not in param.keys():
+        init_view(param, im)
+        render_view(param)
+    # ------------------------------------------------------------------
+    # マウスホイールで拡大・縮小し，右ドラッグで表示する領域を移動する
+    # ------------------------------------------------------------------
+    if event == cv2.EVENT_MOUSEWHEEL:
+        if flags > 0:
+            zoom_view(param, 0.5, x, y)
+        else:
+            zoom_view(param, 2.0, x, y)
+        return
+    if event == cv2.EVENT_RBUTTONDOWN:
+        param["drag from"] = (x, y)
+        return
+    if event == cv2.EVENT_MOUSEMOVE and "drag from" in param.keys() \
+            and flags & cv2.EVENT_FLAG_RBUTTON:
+        drag_x, drag_y = param["drag from"]
+        param["drag from"] = (x, y)
+        pan_view(param, drag_x - x, drag_y - y)
+        return
+    if event == cv2.EVENT_RBUTTONUP:
+        param.pop("drag from", None)
+        return
+    # ------------------------------------------------------------------
+    # マウスイベント左クリック(押下)したときに以下の動作をする
+    # 左クリックした点に丸を描き，その右横に(元の解像度の画像内の)座標の文字列を表示する
+    # ------------------------------------------------------------------
+    if event == cv2.EVENT_LBUTTONDOWN:
+        coordinate_xy = view_to_image(param, x, y)
+        if coordinate_xy is None:
+            return
+        # --------------------------------------------------------------
+        # 座標を1つずつ表示する場合(左クリックするたびに前の印が消える)
+        # 画像全体はコピーせず，前の印を描いた範囲だけを背景から戻す
+        # --------------------------------------------------------------
+        if param["multiple coordinates"] is False:
+            if param["dirty rect"] is not None:
+                _restore_rect(param["view frame"], param["view base"],
+                              param["dirty rect"])
+            param["markers"] = [coordinate_xy]
+        # --------------------------------------------------------------
+        # 座標を複数重ねて表示する場合
+        # --------------------------------------------------------------
+        elif param["multiple coordinates"] is True:
+            param["markers"].append(coordinate_xy)
+        # 記録するファイルが指定されている場合はクリックした座標を追記する
+        if param.get("record file") is not None:
+            record_coordinate(param["record file"], param.get("image", ""),
+                              coordinate_xy)
+        # マウスで左クリックした座標に印を描き，画像をwindow上に表示する
+        param["dirty rect"] = draw_coordinate(param["view frame"], (x, y),
+                                              coordinate_xy, param)
+        cv2.imshow(param["window name"], param["view frame"])
+
+
+def print_coordinate_clicked_with_mouse(image, mouse_callback_param=None,
+                                        record_file=None):
+    """print_coordinate_clicked_with_mouse
+                マウスで左クリックした箇所の画像内の座標を表示する
+
+    Args:
+        image (str): 座標を表示したい画像ファイル名
+        mouse_callback_param (dict, optional): デフォルトはNone.
+        record_file (str, optional): クリックした座標を追記するcsvファイル
+                                     デフォルトはNone(記録しない).
+    """
+    # 画像ファイルをOpenCVで読み込み
+    im = cv2.imread(image, cv2.IMREAD_COLOR)
+    # マウスで画像をクリックするのに使う，後に起動させるウィンドウの名前
+    window_name = "Print Coordinate Clicked with Mouse"
+    # 第1引数ウィンドウ(window_name)上で
+    # マウスイベント(マウスによる何らかの操作)が発生したとき
+    # 第2引数コールバック関数(print_coordinate)を呼び出す
+    # 第3引数paramでコールバック変数内で操作するための引数を渡す
+    if mouse_callback_param is None:
+        mouse_callback_param = {}
+    mouse_callback_param["im_cv2"] = im  # これが無いと画像をコールバック関数で扱えない
+    mouse_callback_param["window name"] = window_name
+    mouse_callback_param["image"] = image
+    mouse_callback_param["record file"] = record_file
+    # 縮小した画像(ピラミッド)を作り，画像全体がウィンドウに収まる大きさで表示する
+    init_view(mouse_callback_param, im)
+    cv2.namedWindow(window_name, cv2.WINDOW_AUTOSIZE)
+    # 設定されてない項目に既定の値を設定
+    set_default_mouse_callback_param(mouse_callback_param)
+    render_view(mouse_callback_param)
+    cv2.setMouseCallback(window_name,
+                         mouse_callback_print_coordinate,
+                         mouse_callback_param)
+    # 表示の移動・拡大・縮小のキー以外のなんらかのキーを押すとウィンドウが閉じる
+    # (w/a/s/dまたはk/h/j/l: 移動，+/-: 拡大・縮小，マウスホイール: 拡大・縮小，
+    #  右ドラッグ: 移動)
+    while True:
+        key = cv2.waitKey(0) & 0xFF
+        viewport_width, viewport_height = mouse_callback_param["viewport size"]
+        if key in pan_keys:
+            dx, dy = pan_keys[key]
+            pan_view(mouse_callback_param, dx * viewport_width // 4,
+                     dy * viewport_height // 4)
+        elif key in zoom_in_keys:
+            zoom_view(mouse_callback_param, 0.5)
+        elif key in zoom_out_keys:
+            zoom_view(mouse_callback_param, 2.0)
+        else:
+            break
+    # 開いているすべてのウィンドウを閉じる
+    cv2.destroyAllWindows()
+
+
+# ----------------------------------------------------------------------
+# マウスで左クリックした箇所の画像内の座標を表示する
+# "--record csvファイル"を付けると，クリックした座標をcsvファイルに追記する
+# "--annotate csvファイル"を付けると，ウィンドウを使わずに記録した座標に印を描く
+# (indir/画像 --> outdir/画像)
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから座標の表示・記録・描画を実行する(image-tools coordinate)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="print (and record) clicked coordinates")
+    parser.add_argument("image", nargs="?", default="./src_images/2.png",
+                        help="image to click on (default: ./src_images/2.png)")
+    parser.add_argument("--record", default=None,
+                        help="append clicked coordinates to this CSV file")
+    parser.add_argument("--annotate", default=None,
+                        help="draw the coordinates in this CSV file "
+                             "headlessly")
+    parser.add_argument("--indir", default="./src_images/",
+                        help="with --annotate, directory of the images")
+    parser.add_argument("--outdir", default="./ant_images/",
+                        help="with --annotate, directory of the output")
+    args = parse_batch_args(args, parser, scan=False)
+    if args.annotate is not None:
+        errors = annotate_images_with_coordinates(args.indir, args.outdir,
+                                                  args.annotate,
+                                                  jobs=args.jobs,
+                                                  chunksize=args.chunksize)
+        return 1 if len(errors) > 0 else 0
+    print_coordinate_clicked_with_mouse(args.image, record_file=args.record)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
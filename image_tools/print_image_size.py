@@ -0,0 +1,333 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# print_image_size.py
+# 複数枚の画像サイズ(幅と高さ)とファイルサイズをターミナル上に表示する
+#
+# Created on 2024/01/21, author: L3onSW
+# ======================================================================
+import argparse
+import csv
+import json
+import os
+import sys
+from image_tools.batch_executor import parse_batch_args
+from image_tools.batch_executor import print_batch_errors
+from image_tools.batch_executor import run_batch
+from image_tools.instrumentation import trace_image
+from image_tools.instrumentation import trace_listing
+from image_tools.io_pipeline import read_source
+from image_tools.io_pipeline import source_size
+from image_tools.scan_images import scan_images
+
+
+def read_image_size(image_src):
+    """read_image_size 1枚の画像サイズ(幅と高さ)とファイルサイズを取得する
+
+    Args:
+        image_src (str): サイズを取得したい画像ファイル(相対パス・拡張子付き)
+
+    Returns:
+        tuple: (幅, 高さ, ファイルサイズ(Byte))
+    """
+    from PIL import Image
+    with trace_image("print_image_size", image_src) as trace:
+        # 画像ファイル(相対パス・拡張子付き)をPillow(PIL)で読み込み(ヘッダだけを解析)
+        with trace.stage("decode"):
+            image_PIL = Image.open(read_source(image_src))
+            w, h = image_PIL.size
+    # 画像ファイルのファイルサイズ(Byte)を取得(メモリ上のバイト列の場合はその長さ)
+    image_file_size_byte = source_size(image_src)
+    return w, h, image_file_size_byte
+
+
+def print_image_size(indir, extension="png", unit="MB", jobs=1, chunksize=1,
+                     recursive=False, sniff=False):
+    """crop_image_byhand 複数枚の画像サイズ(幅と高さ)とファイルサイズを表示する
+
+    Args:
+        indir (str): サイズを表示したい画像ファイルをまとめて置いているディレクトリ
+        extension (str または list, optional): 変換前の拡張子(デフォルトは"png")
+        unit (str, optional): 表示するファイルサイズの単位(デフォルトは"MB")
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+
+    Returns:
+        list: サイズの取得に失敗した(画像ファイル, エラー内容)のリスト
+    """
+    # 変換前(元の拡張子)の画像ファイルを(indirからの相対パス・拡張子付きで)少しずつ取得
+    images = trace_listing("print_image_size",
+                           scan_images(indir, extension, recursive, sniff))
+    # 画像1枚ずつに対するサイズ取得の引数(画像ファイル(相対パス・拡張子付き))を定義
+    items = ((os.path.join(indir, image),) for image in images)
+    # 画像1枚ずつに対してサイズを(並列に)取得して表示
+    errors = []
+    for result in run_batch(read_image_size, items, jobs, chunksize):
+        # 結果を見やすくするための区切り線の表示
+        print("-" * 70)
+        image_src = result.args[0]
+        print(image_src)
+        if result.error is not None:
+            # サイズの取得に失敗した画像は記録しておき，残りの画像の処理は続ける
+            errors.append((image_src, result.error))
+            continue
+        w, h, image_file_size_byte = result.value
+        print(" width:", w, end=", ")
+        print(" height:", h)
+        if unit == "B":
+            # 単位B(Byte)で表示
+            print(f" {image_file_size_byte} B")
+        elif unit == "KB":
+            # 単位B(Byte)をKBに変換(小数点以下2位で四捨五入)してから表示
+            image_file_size_KB = round(image_file_size_byte / 1024, 2)
+            print(f" {image_file_size_KB} KB")
+        elif unit == "MB":
+            # 単位B(Byte)をMBに変換(小数点以下2位で四捨五入)してから表示
+            image_file_size_MB = round(image_file_size_byte / (1024**2), 2)
+            print(f" {image_file_size_MB} MB")
+        elif unit == "GB":
+            # 単位B(Byte)をGBに変換(小数点以下2位で四捨五入)してから表示
+            image_file_size_GB = round(image_file_size_byte / (1024**3), 2)
+            print(f" {image_file_size_GB} GB")
+        else:
+            # 変数unitの指定が間違っている場合は異常終了
+            print(" Please set the variable ", end="")
+            print("\"unit\" to \"B\", \"KB\", \"MB\", or \"GB\".")
+            sys.exit(1)
+    # サイズの取得に失敗した画像があれば一覧を表示する
+    print_batch_errors(errors)
+    return errors
+
+
+def read_image_header(image_src):
+    """read_image_header 1枚の画像のヘッダだけを読み込み，サイズなどの情報を取得する
+
+    Args:
+        image_src (str): 情報を取得したい画像ファイル(相対パス・拡張子付き)
+
+    Returns:
+        tuple: (幅, 高さ, モード, 画像形式)
+
+    注意点:
+        Image.openはヘッダしか読まないため，画素データの展開(デコード)はしない
+    """
+    from PIL import Image
+    with Image.open(read_source(image_src)) as image_PIL:
+        w, h = image_PIL.size
+        return w, h, image_PIL.mode, image_PIL.format
+
+
+def index_path_of(indir):
+    """index_path_of ディレクトリに対応するインデックス(SQLite)のファイルを定義する
+
+    Args:
+        indir (str): 画像ファイルをまとめて置いているディレクトリ(例: "./src_images/")
+
+    Returns:
+        str: インデックスのファイル(例: "./src_images.index.sqlite3")
+    """
+    return os.path.normpath(indir) + ".index.sqlite3"
+
+
+def _connect_index(index_path):
+    """_connect_index インデックス(SQLite)に接続し，無ければテーブルを作成する"""
+    # sqlite3は--indexで使う場合だけ読み込む
+    import sqlite3
+    connection = sqlite3.connect(index_path)
+    connection.execute("CREATE TABLE IF NOT EXISTS images ("
+                       " path TEXT PRIMARY KEY,"
+                       " width INTEGER, height INTEGER,"
+                       " mode TEXT, format TEXT,"
+                       " size INTEGER, mtime_ns INTEGER)")
+    return connection
+
+
+def index_image_size(indir, index_path=None, extension="png",
+                     recursive=False, sniff=False, jobs=1, chunksize=1):
+    """index_image_size 複数枚の画像のサイズなどをインデックス(SQLite)に記録する
+
+    Args:
+        indir (str): サイズを記録したい画像ファイルをまとめて置いているディレクトリ
+        index_path (str, optional): インデックスのファイル
+                                    (デフォルトはNoneで，indirの隣の"ディレクトリ名.index.sqlite3")
+        extension (str または list, optional): 対象の拡張子(デフォルトは"png")
+        recursive (bool, optional): サブディレクトリも探索するかどうか(デフォルトはFalse)
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像を判定するかどうか
+                                (デフォルトはFalse)
+        jobs (int, optional): 並列に動かすプロセス数(デフォルトは1，NoneだとCPU数)
+        chunksize (int, optional): 1つのプロセスにまとめて渡す枚数(デフォルトは1)
+
+    Returns:
+        dict: 記録した枚数("indexed")，記録済みで変更の無い枚数("unchanged")，
+              インデックスから削除した枚数("removed")，失敗した画像の一覧("errors")
+
+    注意点:
+        記録済みの画像はファイルサイズと更新時刻が変わったものだけヘッダを読み直す
+        indirに無くなった画像と，読み直して失敗した画像はインデックスから削除する
+    """
+    if index_path is None:
+        index_path = index_path_of(indir)
+    connection = _connect_index(index_path)
+    # 記録済みの画像のファイルサイズと更新時刻を読み込む
+    indexed = {}
+    for path, size, mtime_ns in \
+            connection.execute("SELECT path, size, mtime_ns FROM images"):
+        indexed[path] = (size, mtime_ns)
+    # ファイルサイズか更新時刻が変わった(または新しい)画像だけヘッダを読む対象にする
+    seen = set()
+    pending = {}
+    stats = {"indexed": 0, "unchanged": 0, "removed": 0, "errors": []}
+
+    def stale_items():
+        for image in scan_images(indir, extension, recursive, sniff):
+            seen.add(image)
+            image_src = os.path.join(indir, image)
+            try:
+                stat = os.stat(image_src)
+            except OSError:
+                continue
+            if indexed.get(image) == (stat.st_size, stat.st_mtime_ns):
+                stats["unchanged"] += 1
+                continue
+            pending[image_src] = (image, stat.st_size, stat.st_mtime_ns)
+            yield (image_src,)
+
+    # ヘッダを(並列に)読み込み，インデックスに記録する
+    rows = []
+    for result in run_batch(read_image_header, stale_items(), jobs, chunksize):
+        image_src = result.args[0]
+        image, size, mtime_ns = pending.pop(image_src)
+        if result.error is not None:
+            # 読めなくなった画像の古い記録は残さない(集計に古いサイズが混ざるため)
+            if image in indexed:
+                connection.execute("DELETE FROM images WHERE path = ?",
+                                   (image,))
+            stats["errors"].append((image_src, result.error))
+            continue
+        w, h, mode, image_format = result.value
+        rows.append((image, w, h, mode, image_format, size, mtime_ns))
+        # まとめて書き込む(1枚ずつ書き込むと遅いため)
+        if len(rows) >= 1000:
+            connection.executemany("INSERT OR REPLACE INTO images"
+                                   " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            connection.commit()
+            stats["indexed"] += len(rows)
+            rows = []
+    connection.executemany("INSERT OR REPLACE INTO images"
+                           " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    stats["indexed"] += len(rows)
+    # indirに無くなった画像をインデックスから削除する
+    # (別の拡張子やrecursiveで記録した画像は，ファイルが残っていれば削除しない)
+    removed = [(path,) for path in indexed if path not in seen
+               and not os.path.exists(os.path.join(indir, path))]
+    connection.executemany("DELETE FROM images WHERE path = ?", removed)
+    stats["removed"] = len(removed)
+    connection.commit()
+    connection.close()
+    return stats
+
+
+# インデックスに対する問い合わせ(クエリ)の名前とSQL
+index_queries = {
+    # 全ての画像
+    "files": "SELECT path, width, height, mode, format, size FROM images"
+             " ORDER BY path",
+    # 枚数・合計のファイルサイズ(Byte)・合計の画素数
+    "totals": "SELECT COUNT(*) AS count, COALESCE(SUM(size), 0) AS size,"
+              " COALESCE(SUM(width * height), 0) AS pixels FROM images",
+    # ファイルサイズが大きい順にn枚
+    "largest": "SELECT path, width, height, mode, format, size FROM images"
+               " ORDER BY size DESC, path LIMIT :n",
+    # 画像サイズ(幅と高さ)ごとの枚数
+    "dimensions": "SELECT width, height, COUNT(*) AS count FROM images"
+                  " GROUP BY width, height ORDER BY count DESC, width, height",
+}
+
+
+def query_image_size_index(index_path, query="totals", n=10):
+    """query_image_size_index インデックス(SQLite)に記録した画像の情報を集計する
+
+    Args:
+        index_path (str): インデックスのファイル
+        query (str, optional): "files"(全ての画像)，"totals"(枚数と合計)，
+                               "largest"(ファイルサイズが大きい順にn枚)，
+                               "dimensions"(画像サイズごとの枚数)のいずれか.
+                               デフォルトは"totals".
+        n (int, optional): query="largest"の場合の枚数，デフォルトは10.
+
+    Returns:
+        list: 集計結果(1行ずつの辞書)のリスト
+    """
+    if query not in index_queries:
+        raise ValueError("query must be one of " + ", ".join(index_queries))
+    connection = _connect_index(index_path)
+    import sqlite3
+    connection.row_factory = sqlite3.Row
+    records = [dict(row) for row in
+               connection.execute(index_queries[query], {"n": n})]
+    connection.close()
+    return records
+
+
+def write_records(records, output_format="json", f=None):
+    """write_records 集計結果をjsonまたはcsvで書き出す
+
+    Args:
+        records (list): 集計結果(1行ずつの辞書)のリスト
+        output_format (str, optional): "json"または"csv"，デフォルトは"json".
+        f (file, optional): 書き出し先，デフォルトは標準出力.
+    """
+    if f is None:
+        f = sys.stdout
+    if output_format == "json":
+        json.dump(records, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+    elif output_format == "csv":
+        if len(records) == 0:
+            return
+        writer = csv.DictWriter(f, fieldnames=list(records[0].keys()))
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        raise ValueError("output_format must be \"json\" or \"csv\"")
+
+
+# ----------------------------------------------------------------------
+# 複数枚の画像サイズ(幅と高さ)とファイルサイズをターミナル上に表示する
+# "--index"を付けるとインデックスに記録してから集計結果を書き出す
+# 例: image-tools size --index --query largest -n 20 --format csv
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインから画像サイズの表示を実行する(image-tools size)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="print image and file sizes")
+    parser.add_argument("indir", nargs="?", default="./src_images/")
+    parser.add_argument("--extension", nargs="+", default=["png"])
+    parser.add_argument("--index", action="store_true",
+                        help="update the SQLite index and print a query")
+    parser.add_argument("--query", default="totals",
+                        choices=list(index_queries.keys()))
+    parser.add_argument("-n", type=int, default=10,
+                        help="number of files for --query largest")
+    parser.add_argument("--format", default="json", choices=["json", "csv"])
+    args = parse_batch_args(args, parser)
+    if args.index is True:
+        stats = index_image_size(args.indir, extension=args.extension,
+                                 recursive=args.recursive, sniff=args.sniff,
+                                 jobs=args.jobs, chunksize=args.chunksize)
+        records = query_image_size_index(index_path_of(args.indir),
+                                         args.query, args.n)
+        write_records(records, args.format)
+        # 標準出力のjson/csvが壊れないように，失敗した画像は標準エラー出力に表示する
+        print_batch_errors(stats["errors"], sys.stderr)
+        return 1 if len(stats["errors"]) > 0 else 0
+    errors = print_image_size(args.indir, args.extension, jobs=args.jobs,
+                              chunksize=args.chunksize,
+                              recursive=args.recursive, sniff=args.sniff)
+    return 1 if len(errors) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# result_cache.py
+# 処理前の画像の内容・処理の名前・パラメータをキーにして処理後の画像をディスクに保存しておき，
+# 同じ処理を再び行う場合はコピー(またはハードリンク)で済ませる
+# (複数のツール・複数のプロセスから同じキャッシュのディレクトリを共有できる)
+#
+# 実行例: image-tools cache ~/.cache/image-tools --max-bytes 10G
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from functools import partial
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from image_tools.io_pipeline import read_bytes
+from image_tools.io_pipeline import read_output
+from image_tools.io_pipeline import write_output
+from image_tools.memory_budget import parse_bytes
+
+# キャッシュの形式のバージョン(キーの作り方や索引の形式を変えたら増やす)
+cache_version = 2
+
+# 記録する統計の名前
+cache_stats = ["hits", "misses", "stores", "evictions"]
+
+# run_batchを使うツールでcache=Noneの場合に使うキャッシュ(set_default_cacheで設定する)
+_default_cache = {"cache": None}
+
+
+def set_default_cache(cache):
+    """set_default_cache 各ツールでcacheを指定しなかった場合に使うキャッシュを設定する"""
+    _default_cache["cache"] = cache
+
+
+def default_cache():
+    """default_cache 各ツールでcacheを指定しなかった場合に使うキャッシュを返す(無ければNone)"""
+    return _default_cache["cache"]
+
+
+class ResultCache:
+    """ResultCache 処理後の画像を内容のハッシュ値で管理するディスク上のキャッシュ
+
+    注意点:
+        索引はcache_dir/index.sqliteに置き，更新はsqliteのロックで排他する
+        オブジェクトは一時ファイルに書いてから置き換えるため，読み込み中に壊れたものは見えない
+        プロセス間で渡せるように，sqliteへの接続は操作ごとに開く
+    """
+
+    def __init__(self, cache_dir, max_bytes=None, hardlink=False):
+        """__init__ キャッシュのディレクトリを用意する
+
+        Args:
+            cache_dir (str): キャッシュを置くディレクトリ(無ければ作成する)
+            max_bytes (int, optional): オブジェクトの合計の上限[Byte]
+                                       デフォルトはNone(上限無し).
+            hardlink (bool, optional): ヒットした場合にコピーではなくハードリンクを作るかどうか
+                                       デフォルトはFalse.
+
+        注意点:
+            hardlink=Trueの場合，出力先のファイルをその場で書き換えるとキャッシュの中身も
+            変わるため，出力先を後から編集しない場合だけ使う
+            (各ツールはcached_callで書き込む前にハードリンクを外す)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hardlink = hardlink
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, "
+                "objects TEXT, size INTEGER, value TEXT, last_used REAL)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, "
+                "count INTEGER)")
+            connection.executemany(
+                "INSERT OR IGNORE INTO stats VALUES (?, 0)",
+                [(name,) for name in cache_stats])
+
+    def _connect(self):
+        """_connect 索引のデータベースに接続する(他のプロセスが更新中なら待つ)"""
+        # sqlite3はキャッシュを使う場合だけ読み込む(各ツールの起動を速くするため)
+        import sqlite3
+        return sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite"),
+                               timeout=60)
+
+    def _object_path(self, key, i, image_dst):
+        """_object_path キーとi番目の出力に対応するオブジェクトのファイル(拡張子は出力と同じ)"""
+        extension = os.path.splitext(image_dst)[1].lower()
+        return os.path.join("objects", key[:2],
+                            "%s.%d%s" % (key, i, extension))
+
+    def make_key(self, image_src, params):
+        """make_key 処理前の画像の内容のハッシュ値と処理のパラメータからキーを作る
+
+        Args:
+            image_src (str): 処理前の画像ファイル
+            params (dict): 処理の名前("operation")とパラメータ
+
+        Returns:
+            str: キー(SHA-256の16進数)
+        """
+        source = hashlib.sha256(read_bytes(image_src)).hexdigest()
+        text = json.dumps({"version": cache_version, "source": source,
+                           "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _count(self, connection, name, n=1):
+        connection.execute("UPDATE stats SET count = count + ? WHERE name = ?",
+                           (n, name))
+
+    def fetch(self, key, image_dsts):
+        """fetch キーの処理結果があれば出力先にコピー(またはハードリンク)する
+
+        Args:
+            key (str): make_keyで作ったキー
+            image_dsts (list): 出力先のファイルのリスト
+
+        Returns:
+            tuple: (ヒットしたかどうか, 処理関数の戻り値)
+
+        注意点:
+            オブジェクトのバイト数とハッシュ値が保存したときと違う(壊れている)場合は，
+            エントリを消して外れとして扱う
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT objects, value FROM entries WHERE key = ?",
+                (key,)).fetchone()
+            if row is None or len(json.loads(row[0])) != len(image_dsts):
+                self._count(connection, "misses")
+                return False, None
+            connection.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                (time.time(), key))
+        try:
+            objects = []
+            for path, size, digest in json.loads(row[0]):
+                object_path = os.path.join(self.cache_dir, path)
+                with open(object_path, "rb") as f:
+                    data = f.read()
+                if len(data) != size or \
+                        hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError("damaged cache object: " + path)
+                objects.append((object_path, data))
+        except (FileNotFoundError, ValueError) as e:
+            # 他のプロセスが追い出した直後や，壊れている場合は外れとして扱う
+            with self._connect() as connection:
+                if isinstance(e, ValueError):
+                    connection.execute("DELETE FROM entries WHERE key = ?",
+                                       (key,))
+                self._count(connection, "misses")
+            return False, None
+        for (object_path, data), image_dst in zip(objects, image_dsts):
+            self._materialize(object_path, data, image_dst)
+        with self._connect() as connection:
+            self._count(connection, "hits")
+        return True, json.loads(row[1])
+
+    def _materialize(self, object_path, data, image_dst):
+        """_materialize オブジェクトを出力先にハードリンクまたはコピーする"""
+        # 前回ハードリンクした出力先に書き込むとオブジェクトまで書き換わるため，先に外す
+        unlink_if_linked(image_dst)
+        if self.hardlink is True:
+            if os.path.lexists(image_dst):
+                os.remove(image_dst)
+            try:
+                os.link(object_path, image_dst)
+                return
+            except OSError:
+                # 別のファイルシステムなどでリンクできない場合はコピーする
+                pass
+        write_output(data, image_dst)
+
+    def store(self, key, image_dsts, value=None):
+        """store 処理後のファイルをキャッシュに保存し，上限を超えたら古いものから追い出す
+
+        Args:
+            key (str): make_keyで作ったキー
+            image_dsts (list): 処理後のファイルのリスト
+            value (optional): 処理関数の戻り値(jsonで保存できるもの)
+
+        注意点:
+            パイプライン実行で書き込み待ちのファイルはメモリ上のバイト列から保存する
+        """
+        objects, size = [], 0
+        for i, image_dst in enumerate(image_dsts):
+            data = read_output(image_dst)
+            path = self._object_path(key, i, image_dst)
+            object_path = os.path.join(self.cache_dir, path)
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            # 一時ファイルに書いてから置き換え，読み込み中の他のプロセスに途中の内容を見せない
+            fd, path_tmp = tempfile.mkstemp(dir=os.path.dirname(object_path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(path_tmp, object_path)
+            # 取り出すときに壊れていないか確かめるため，バイト数とハッシュ値も記録する
+            objects.append([path, len(data),
+                            hashlib.sha256(data).hexdigest()])
+            size += len(data)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(objects), size, json.dumps(value),
+                 time.time()))
+            self._count(connection, "stores")
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def evict(self, max_bytes):
+        """evict オブジェクトの合計がmax_bytes以下になるまで最後に使った時刻が古いものを消す
+
+        Returns:
+            int: 消したエントリの数
+        """
+        with self._connect() as connection:
+            # 合計の計算と削除の間に他のプロセスが割り込まないようにする
+            connection.execute("BEGIN IMMEDIATE")
+            total = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            removed = []
+            for key, objects, size in connection.execute(
+                    "SELECT key, objects, size FROM entries "
+                    "ORDER BY last_used"):
+                if total <= max_bytes:
+                    break
+                removed.append((key, objects))
+                total -= size
+            connection.executemany("DELETE FROM entries WHERE key = ?",
+                                   [(key,) for key, _ in removed])
+            self._count(connection, "evictions", len(removed))
+        # 索引から消した後にファイルを消す(ハードリンクした出力先はそのまま残る)
+        for _, objects in removed:
+            for entry in json.loads(objects):
+                # 以前の形式(cache_version=1)ではパスだけを記録している
+                path = entry if isinstance(entry, str) else entry[0]
+                try:
+                    os.remove(os.path.join(self.cache_dir, path))
+                except FileNotFoundError:
+                    pass
+        return len(removed)
+
+    def stats(self):
+        """stats 統計(ヒット・外れ・保存・追い出しの回数，エントリ数，合計のバイト数)を返す"""
+        with self._connect() as connection:
+            stats = dict(connection.execute("SELECT name, count FROM stats"))
+            stats["entries"], stats["bytes"] = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return stats
+
+    def clear(self):
+        """clear 全てのエントリとオブジェクトを消し，統計を0に戻す"""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entries")
+            connection.execute("UPDATE stats SET count = 0")
+        shutil.rmtree(os.path.join(self.cache_dir, "objects"))
+        os.makedirs(os.path.join(self.cache_dir, "objects"))
+
+
+def unlink_if_linked(path):
+    """unlink_if_linked ハードリンクされたファイル(リンク数が2以上)を出力先から外す
+
+    注意点:
+        キャッシュのオブジェクトにハードリンクした出力先をその場で書き換えると，
+        オブジェクトまで書き換わってしまうため，書き込む前に呼ぶ
+    """
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def with_cache(func, params, cache=None):
+    """with_cache 1件分の処理を行う関数を，キャッシュを使う関数にする
+
+    Args:
+        func (function): 1件分の処理を行う関数(func(image_src, image_dst, *args))
+        params (dict): 処理の名前("operation")とパラメータ(キーに使う)
+        cache (ResultCache, optional): キャッシュ，デフォルトはNone(set_default_cacheの設定).
+
+    Returns:
+        tuple: (run_batchに渡す関数, 使うキャッシュ(使わない場合はNone))
+    """
+    if cache is None:
+        cache = default_cache()
+    if cache is None:
+        return func, None
+    return partial(cached_call, cache, params, func), cache
+
+
+def print_cache_summary(cache, stats_before):
+    """print_cache_summary 1回の実行でのキャッシュのヒットと外れの回数を表示する
+
+    Args:
+        cache (ResultCache): キャッシュ
+        stats_before (dict): 実行前にcache.statsで取得した統計
+    """
+    stats = cache.stats()
+    hits = stats["hits"] - stats_before["hits"]
+    misses = stats["misses"] - stats_before["misses"]
+    print("Cache: ", "{} hits, {} misses ({:.2f} MB in {})".format(
+        hits, misses, stats["bytes"] / 1024 ** 2, cache.cache_dir))
+
+
+def cached_call(cache, params, func, image_src, image_dst, *args):
+    """cached_call キャッシュにあれば出力先にコピーし，無ければfuncで処理してから保存する
+
+    Args:
+        cache (ResultCache): キャッシュ
+        params (dict): 処理の名前("operation")とパラメータ(キーに使う)
+        func (function): 1件分の処理を行う関数(func(image_src, image_dst, *args))
+        image_src (str): 処理前の画像ファイル
+        image_dst (str または list): 処理後のファイル(複数の場合はリスト)
+        *args: funcに渡す残りの引数
+
+    Returns:
+        funcの戻り値(ヒットした場合は保存しておいた戻り値)
+
+    注意点:
+        run_batchにはfunctools.partial(cached_call, cache, params, func)として渡す
+    """
+    image_dsts = image_dst if isinstance(image_dst, (list, tuple)) \
+        else [image_dst]
+    # 出力の画像形式(拡張子)が違う場合は別の結果として扱う
+    extensions = [os.path.splitext(path)[1].lower() for path in image_dsts]
+    key = cache.make_key(image_src, dict(params, outputs=extensions))
+    hit, value = cache.fetch(key, image_dsts)
+    if hit is True:
+        return value
+    # ヒットしなかった場合は，前回ハードリンクした出力先を外してから処理する
+    for path in image_dsts:
+        unlink_if_linked(path)
+    value = func(image_src, image_dst, *args)
+    cache.store(key, image_dsts, value)
+    return value
+
+
+# ----------------------------------------------------------------------
+# キャッシュの統計を表示する("--clear"で空にする，"--max-bytes"で上限まで追い出す)
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインからキャッシュの統計を表示する(image-tools cache)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="show (and trim) a result cache")
+    parser.add_argument("cache_dir")
+    parser.add_argument("--max-bytes", type=parse_bytes, default=None,
+                        help="evict least recently used entries down to this")
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args(args)
+    cache = ResultCache(args.cache_dir)
+    if args.clear is True:
+        cache.clear()
+    if args.max_bytes is not None:
+        print("Evict: ", str(cache.evict(args.max_bytes)) + " entries")
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    print("entries: {}, size: {:.2f} MB".format(stats["entries"],
+                                                stats["bytes"] / 1024 ** 2))
+    print("hits: {}, misses: {}, hit rate: {:.1f} %".format(
+        stats["hits"], stats["misses"],
+        100 * stats["hits"] / lookups if lookups > 0 else 0.0))
+    print("stores: {}, evictions: {}".format(stats["stores"],
+                                             stats["evictions"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
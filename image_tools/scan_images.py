@@ -0,0 +1,158 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# scan_images.py
+# ディレクトリ内の画像ファイルを少しずつ(ストリーミングで)探索する
+# (ディレクトリ内の画像を1枚ずつ処理する各ツールで共通して使う)
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+import os
+
+# 同じ画像形式を表す拡張子の別名(拡張子は小文字・ドット無しで比較する)
+extension_aliases = {
+    "jpg": "jpeg",
+    "jpe": "jpeg",
+    "tif": "tiff",
+}
+
+# ファイル先頭のバイト列(マジックナンバー)と画像形式の対応
+magic_numbers = [
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+]
+
+
+def normalize_extensions(extension):
+    """normalize_extensions 拡張子の指定を比較しやすい形(小文字・ドット無し・別名統一)にする
+
+    Args:
+        extension (str または list): 拡張子(例: "png", ".PNG", ["jpg", "jpeg"])
+
+    Returns:
+        set: 比較用の拡張子の集合
+    """
+    if isinstance(extension, str):
+        extension = [extension]
+    extensions = set()
+    for ext in extension:
+        ext = ext.lower().lstrip(".")
+        extensions.add(extension_aliases.get(ext, ext))
+    return extensions
+
+
+def sniff_image_format(path):
+    """sniff_image_format ファイル先頭のバイト列から画像形式を判定する
+
+    Args:
+        path (str): 判定したいファイル
+
+    Returns:
+        str: 画像形式("png", "jpeg", ...)，判定できない場合はNone
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+    except OSError:
+        return None
+    for magic_number, image_format in magic_numbers:
+        if head.startswith(magic_number):
+            return image_format
+    # WebPは"RIFF"の後の4バイト(ファイルサイズ)を挟んで"WEBP"が続く
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def scan_images(indir, extension="png", recursive=False, sniff=False,
+                sort=True):
+    """scan_images ディレクトリ内の画像ファイルをos.scandirで少しずつ探索する
+
+    Args:
+        indir (str): 画像ファイルを探索するディレクトリ
+        extension (str または list, optional): 対象とする拡張子(大文字小文字は区別しない)
+                                               デフォルトは"png".
+        recursive (bool, optional): サブディレクトリも探索するかどうか，デフォルトはFalse.
+        sniff (bool, optional): 拡張子ではなくファイル先頭のバイト列で画像形式を判定するか
+                                どうか，デフォルトはFalse.
+        sort (bool, optional): ディレクトリごとにファイル名の順に並べるかどうか
+                               デフォルトはTrue.
+
+    Yields:
+        str: 見つかった画像ファイル(indirからの相対パス・拡張子付き)
+
+    注意点:
+        見つかった順に1つずつ返すため，探索が終わる前に処理を始められる
+        sort=Trueの場合でも並べ替えはディレクトリ1つ分ずつしか行わない
+        シンボリックリンクのディレクトリは(無限ループを避けるため)探索しない
+    """
+    extensions = normalize_extensions(extension)
+    # 探索中のディレクトリ(indirからの相対パス, エントリのイテレータ)を積むスタック
+    stack = [("", _iter_entries(indir, sort))]
+    while len(stack) > 0:
+        reldir, entries = stack[-1]
+        entry = next(entries, None)
+        # このディレクトリの探索が終わったら1つ上のディレクトリに戻る
+        if entry is None:
+            stack.pop()
+            continue
+        relpath = os.path.join(reldir, entry.name)
+        # サブディレクトリは(recursive=Trueの場合のみ)その場で探索する
+        if entry.is_dir(follow_symlinks=False):
+            if recursive is True:
+                stack.append((relpath, _iter_entries(entry.path, sort)))
+            continue
+        if entry.is_file() is False:
+            continue
+        # 拡張子またはファイル先頭のバイト列で画像形式を判定
+        if sniff is True:
+            image_format = sniff_image_format(entry.path)
+        else:
+            image_format = normalize_extensions(
+                os.path.splitext(entry.name)[1]).pop()
+        if image_format in extensions:
+            yield relpath
+
+
+def _iter_entries(path, sort):
+    """_iter_entries ディレクトリのエントリを(必要なら名前順に並べて)順に返す"""
+    with os.scandir(path) as it:
+        if sort is True:
+            entries = sorted(it, key=lambda entry: entry.name)
+        else:
+            entries = it
+        for entry in entries:
+            yield entry
+
+
+def make_output_path(outdir, image, sniff_dir=None):
+    """make_output_path 出力先の画像ファイルを定義し，必要なサブディレクトリを作成する
+
+    Args:
+        outdir (str): 出力先のディレクトリ
+        image (str): 画像ファイル(indirからの相対パス・拡張子付き)
+        sniff_dir (str, optional): sniff=Trueで探索した場合のindir
+                                   デフォルトはNone(拡張子をそのまま使う).
+
+    Returns:
+        str: 出力先の画像ファイル(相対パス・拡張子付き)
+
+    注意点:
+        サブディレクトリ内の画像はoutdirの下に同じ構成のサブディレクトリを作って置く
+        sniff_dirを指定した場合，ファイル先頭のバイト列で判定した形式が拡張子と合わなければ
+        その形式の拡張子を付け足す(例: "scan" --> "scan.png"，"a.dat" --> "a.dat.jpeg")
+    """
+    image_dst = os.path.join(outdir, image)
+    if sniff_dir is not None:
+        image_format = sniff_image_format(os.path.join(sniff_dir, image))
+        extensions = normalize_extensions(os.path.splitext(image)[1])
+        if image_format is not None and image_format not in extensions:
+            image_dst += "." + image_format
+    subdir = os.path.dirname(image)
+    if subdir != "":
+        os.makedirs(os.path.join(outdir, subdir), exist_ok=True)
+    return image_dst
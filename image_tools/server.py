@@ -0,0 +1,519 @@
+#!/opt/anaconda3/bin/python
+# ======================================================================
+# server.py
+# Pillow・img2pdfを読み込み済みのワーカープロセスを常駐させ，
+# Unixドメインソケット経由のJSONの要求で圧縮・切り抜き・余白の付加などを1枚ずつ実行する
+# (要求ごとにPythonを起動しないため，1枚あたりのオーバーヘッドがミリ秒程度で済む)
+#
+# 実行例: image-tools serve /tmp/image-tools.sock -j 4 --queue 16
+#         image-tools serve /tmp/image-tools.sock --stats
+#
+# プロトコル: 1行に1つのJSON(要求)を送ると，1行に1つのJSON(応答)が返る
+#   要求: {"id": 1, "op": "compress", "src": "/abs/1.png", "dst": "/abs/1.jpg",
+#          "params": {"shrink": 2, "quality": 80}}
+#         入力をファイルの代わりにバイト列で送る場合は"src"の代わりに"data"(base64)，
+#         出力をバイト列で受け取る場合は"dst"の代わりに"extension"(例: "jpg")を指定する
+#   応答: {"id": 1, "ok": true, "value": ..., "data": (出力のbase64), "ms": 3.2}
+#         混雑している場合は {"id": 1, "ok": false, "error": "busy", "retry": true}
+#   "op"が"ping"・"stats"の場合は疎通の確認・処理時間のパーセンタイルなどを返す
+#
+# Created on 2026/10/18, author: L3onSW
+# ======================================================================
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import base64
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from image_tools.image_pipeline import check_stages
+from image_tools.instrumentation import enable_trace
+from image_tools.instrumentation import percentile
+from image_tools.io_pipeline import memory_io
+
+# 実行できる処理の名前と(モジュール名, 関数名, 出力の画像ファイルがあるかどうか)
+# (関数は(入力, 出力, **params)の形で呼ぶ，出力が無い場合は(入力, **params))
+operations = {
+    "compress": ("compress_image", "compress_one_image", True),
+    "crop": ("crop_image_by_hand", "crop_one_image", True),
+    "trim": ("crop_image_by_hand", "trim_one_image", True),
+    "margin": ("add_margin_around_image", "add_margin_to_one_image", True),
+    "pdf": ("convert_image_to_pdf", "convert_one_image2pdf", True),
+    "pipeline": ("image_pipeline", "process_one_image", True),
+    "size": ("print_image_size", "read_image_size", False),
+}
+
+# 入力をバイト列で受け取った場合に使う(実在しない)ファイル名
+inline_name = "<inline>"
+
+# 処理ごとに記録しておく直近の処理時間の件数
+latency_window = 10000
+
+
+def _warm_up(trace_file=None):
+    """_warm_up ワーカープロセスの起動時に各処理のモジュール・Pillowのプラグイン・img2pdfを読み込む
+
+    Args:
+        trace_file (str, optional): トレースを書き出すファイル，デフォルトはNone(記録しない).
+    """
+    from PIL import Image
+    for module_name, _, _ in operations.values():
+        importlib.import_module("image_tools." + module_name)
+    try:
+        importlib.import_module("img2pdf")
+    except ImportError:
+        # img2pdfが無い場合はpdfの処理だけが失敗する
+        pass
+    # 全ての画像形式のプラグインを登録し，主なエンコーダを一度動かしておく
+    Image.init()
+    for image_format in ["PNG", "JPEG"]:
+        Image.new("RGB", (8, 8)).save(io.BytesIO(), format=image_format)
+    if trace_file is not None:
+        enable_trace(trace_file)
+    # Ctrl-Cはサーバー(親プロセス)だけが受け取り，ワーカーは親の終了処理で止める
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _ping(delay):
+    """_ping ワーカープロセスを起動させるための何もしない処理(プロセスIDを返す)"""
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _from_json(value):
+    """_from_json JSONの配列をtupleに変換する(切り抜く領域や色をPillowに渡せるようにする)"""
+    if isinstance(value, list):
+        return tuple(_from_json(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _from_json(v) for k, v in value.items()}
+    return value
+
+
+def _run_job(operation, params, image_src, image_dst, data, extension):
+    """_run_job ワーカープロセスで1件の処理を行う
+
+    Args:
+        operation (str): 処理の名前(operationsのキー)
+        params (dict): 処理の関数に渡す引数
+        image_src (str): 入力の画像ファイル(dataを指定した場合はNone)
+        image_dst (str): 出力のファイル(Noneの場合はバイト列で返す)
+        data (bytes): 入力の画像ファイルの中身(image_srcを指定した場合はNone)
+        extension (str): image_dstがNoneの場合の出力の拡張子(例: "jpg")
+
+    Returns:
+        tuple: (処理の関数の戻り値, 出力のバイト列(image_dstを指定した場合はNone),
+                ワーカーでの処理時間[s])
+
+    注意点:
+        入出力はio_pipelineのmemory_ioでメモリ上に置き，
+        出力先のファイルには処理が成功した場合だけ書き込む
+        戻り値の"output"で拡張子が変わった場合(WebPなど)は，その出力をバイト列で返す
+    """
+    start = time.perf_counter()
+    module_name, function_name, has_output = operations[operation]
+    func = getattr(importlib.import_module("image_tools." + module_name),
+                   function_name)
+    params = _from_json(params)
+    inputs = {}
+    if data is not None:
+        image_src = inline_name
+        inputs[image_src] = data
+    inline_dst = None
+    if has_output is True and image_dst is None:
+        image_dst = inline_dst = inline_name + "." + extension.lstrip(".")
+    with memory_io(inputs) as outputs:
+        if has_output is True:
+            value = func(image_src, image_dst, **params)
+        else:
+            value = func(image_src, **params)
+    # PNGの最適化でWebPが選ばれた場合などは，処理の関数が返した実際の出力先を使う
+    if inline_dst is not None and isinstance(value, dict) and \
+            value.get("output") is not None:
+        inline_dst = value["output"]
+    output = None
+    for path, output_data in outputs:
+        if path == inline_dst:
+            output = output_data
+        else:
+            with open(path, "wb") as f:
+                f.write(output_data)
+    return value, output, time.perf_counter() - start
+
+
+def _check_pipeline_params(params):
+    """_check_pipeline_params pipelineの要求のパラメータを確認し，処理の一覧を揃えて返す
+
+    Args:
+        params (dict): 要求の"params"
+
+    Returns:
+        dict: "stages"を(処理の名前, パラメータの辞書)のリストにしたパラメータ
+
+    注意点:
+        処理の名前が誤っている場合やpdfを含む場合はValueErrorを送出する
+    """
+    if not isinstance(params, dict):
+        raise ValueError("params must be an object")
+    try:
+        stages = check_stages(params.get("stages", ()))
+    except TypeError as e:
+        raise ValueError("invalid stages: " + str(e))
+    if any(name == "pdf" for name, _ in stages):
+        raise ValueError("use the pdf operation to convert into a PDF")
+    # ワーカーで_from_jsonがパラメータの中の配列まで変換できるようにリストで返す
+    return dict(params, stages=[[name, p] for name, p in stages])
+
+
+class ImageServer:
+    """ImageServer 常駐するワーカープロセスで要求を1件ずつ処理する
+
+    注意点:
+        同時に受け付ける要求はworkers+queue_size件までで，
+        それを超えた要求は待たせずに"busy"を返す(呼び出し側で少し待って再送する)
+    """
+
+    def __init__(self, workers=None, queue_size=None, trace_file=None):
+        """__init__ ワーカープロセスを起動し，読み込みが終わるまで待つ
+
+        Args:
+            workers (int, optional): ワーカープロセスの数，デフォルトはNone(CPU数).
+            queue_size (int, optional): 処理待ちにできる要求の数，
+                                        デフォルトはNone(ワーカープロセスの数の2倍).
+            trace_file (str, optional): ワーカーのトレースを書き出すファイル，デフォルトはNone.
+        """
+        self.workers = max(1, workers or os.cpu_count())
+        self.queue_size = 2 * self.workers if queue_size is None \
+            else max(0, queue_size)
+        self.trace_file = trace_file
+        self.slots = threading.BoundedSemaphore(self.workers
+                                                + self.queue_size)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counts = {"requests": 0, "busy": 0, "errors": 0,
+                       "in_flight": 0, "restarts": 0}
+        # 処理ごとの直近の(応答までの時間[ms], ワーカーでの処理時間[ms])
+        self.latencies = {}
+        self.pool = self._start_pool()
+
+    def _start_pool(self):
+        """_start_pool ワーカープロセスを全て起動して読み込みを済ませたプールを返す"""
+        # スレッドを持つサーバーからforkしないように，forkserver(無ければspawn)で起動する
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn")
+        pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                   initializer=_warm_up,
+                                   initargs=(self.trace_file,))
+        # 少し待つ処理をワーカーの数だけ投げ，全てのワーカーを起動させる
+        futures = [pool.submit(_ping, 0.05) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+        return pool
+
+    def _record(self, operation, total, service):
+        """_record 1件の応答までの時間とワーカーでの処理時間[s]を記録する"""
+        with self.lock:
+            if operation not in self.latencies:
+                self.latencies[operation] = deque(maxlen=latency_window)
+            self.latencies[operation].append((total * 1000, service * 1000))
+
+    def stats(self):
+        """stats 要求の件数と処理ごとの処理時間のパーセンタイルを返す
+
+        Returns:
+            dict: 件数("requests"，"busy"，"errors"，"in_flight"，"restarts")，
+                  "workers"，"queue_size"，"uptime"[s]，処理ごとの"operations"
+                  (件数，応答までの時間[ms]とワーカーでの処理時間[ms]のp50・p90・p99)
+        """
+        with self.lock:
+            stats = dict(self.counts)
+            latencies = {k: list(v) for k, v in self.latencies.items()}
+        stats.update({"workers": self.workers, "queue_size": self.queue_size,
+                      "uptime": time.time() - self.started, "operations": {}})
+        for operation, values in latencies.items():
+            total = sorted(v[0] for v in values)
+            service = sorted(v[1] for v in values)
+            stats["operations"][operation] = {
+                "count": len(values),
+                "p50": percentile(total, 50), "p90": percentile(total, 90),
+                "p99": percentile(total, 99),
+                "service_p50": percentile(service, 50),
+                "service_p99": percentile(service, 99)}
+        return stats
+
+    def handle(self, request):
+        """handle 1件の要求を処理して応答を返す
+
+        Args:
+            request (dict): 要求("op"，"params"，"src"または"data"，
+                            "dst"または"extension")
+
+        Returns:
+            dict: 応答("ok"，成功した場合は"value"と"data"と"ms"，失敗した場合は"error")
+        """
+        received = time.perf_counter()
+        response = {"id": request.get("id"), "ok": False}
+        operation = request.get("op")
+        if operation == "ping":
+            response.update({"ok": True, "value": "pong"})
+            return response
+        if operation == "stats":
+            response.update({"ok": True, "value": self.stats()})
+            return response
+        if operation not in operations:
+            response["error"] = "unknown operation: " + repr(operation)
+            return response
+        data = request.get("data")
+        if (request.get("src") is None) == (data is None):
+            response["error"] = "specify exactly one of 'src' and 'data'"
+            return response
+        if request.get("dst") is None and operations[operation][2] is True \
+                and request.get("extension") is None:
+            response["error"] = "specify 'dst' or 'extension'"
+            return response
+        # 一連の処理は，処理の名前と並びを要求を受け取った時点で確認する
+        params = request.get("params") or {}
+        if operation == "pipeline":
+            try:
+                params = _check_pipeline_params(params)
+            except ValueError as e:
+                response["error"] = "ValueError: " + str(e)
+                return response
+        # 処理中と処理待ちの合計が上限に達していれば待たせずに断る
+        if self.slots.acquire(blocking=False) is False:
+            with self.lock:
+                self.counts["busy"] += 1
+            response.update({"error": "busy", "retry": True})
+            return response
+        with self.lock:
+            self.counts["requests"] += 1
+            self.counts["in_flight"] += 1
+        try:
+            if data is not None:
+                data = base64.b64decode(data)
+            value, output, service = self._submit(
+                operation, params, request.get("src"),
+                request.get("dst"), data, request.get("extension"))
+            response.update({"ok": True, "value": value})
+            if output is not None:
+                response["data"] = base64.b64encode(output).decode("ascii")
+            total = time.perf_counter() - received
+            response["ms"] = total * 1000
+            self._record(operation, total, service)
+        except Exception as e:
+            with self.lock:
+                self.counts["errors"] += 1
+            response["error"] = type(e).__name__ + ": " + str(e)
+        finally:
+            with self.lock:
+                self.counts["in_flight"] -= 1
+            self.slots.release()
+        return response
+
+    def _submit(self, *args):
+        """_submit ワーカープロセスで_run_jobを実行する(ワーカーが落ちた場合はプールを作り直す)"""
+        pool = self.pool
+        try:
+            return pool.submit(_run_job, *args).result()
+        except BrokenProcessPool:
+            with self.lock:
+                if self.pool is pool:
+                    self.counts["restarts"] += 1
+                    self.pool = self._start_pool()
+            raise
+
+    def close(self):
+        """close ワーカープロセスを終了する"""
+        self.pool.shutdown()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """_RequestHandler 1つの接続で送られてくる要求を1行ずつ処理して応答する"""
+
+    def handle(self):
+        for line in self.rfile:
+            if len(line.strip()) == 0:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+            except ValueError as e:
+                response = {"id": None, "ok": False,
+                            "error": "bad request: " + str(e)}
+            else:
+                response = self.server.image_server.handle(request)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """_UnixServer 接続ごとにスレッドを立てるUnixドメインソケットのサーバー"""
+    daemon_threads = True
+
+
+def _remove_stale_socket(socket_path):
+    """_remove_stale_socket 前回のサーバーが残したソケットファイルを削除する
+
+    注意点:
+        接続できる(サーバーが動いている)場合はOSErrorを送出する
+    """
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+            return
+    raise OSError("a server is already listening on " + socket_path)
+
+
+def serve(socket_path, workers=None, queue_size=None, trace_file=None):
+    """serve ソケットで要求を受け付け，Ctrl-C(またはSIGTERM)で止めるまで処理し続ける
+
+    Args:
+        socket_path (str): Unixドメインソケットのパス
+        workers (int, optional): ワーカープロセスの数，デフォルトはNone(CPU数).
+        queue_size (int, optional): 処理待ちにできる要求の数，
+                                    デフォルトはNone(ワーカープロセスの数の2倍).
+        trace_file (str, optional): ワーカーのトレースを書き出すファイル，デフォルトはNone.
+
+    Returns:
+        dict: 止めた時点の統計(ImageServer.stats)
+    """
+    _remove_stale_socket(socket_path)
+    image_server = ImageServer(workers, queue_size, trace_file)
+    server = _UnixServer(socket_path, _RequestHandler)
+    server.image_server = image_server
+    print("Serve: ", socket_path, "(" + str(image_server.workers)
+          + " workers, queue " + str(image_server.queue_size) + ")")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+        image_server.close()
+    return image_server.stats()
+
+
+class ServerClient:
+    """ServerClient サーバーに接続して要求を送る(1つの接続を使い回す)
+
+    注意点:
+        1つの接続では要求を1件ずつ処理するため，並行に送る場合は接続を複数作る
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(socket_path)
+        self.file = self.socket.makefile("rb")
+        self.next_id = 0
+
+    def request(self, request):
+        """request 要求(dict)を送り，応答(dict)を返す"""
+        self.socket.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self.file.readline()
+        if len(line) == 0:
+            raise ConnectionError("the server closed the connection")
+        return json.loads(line)
+
+    def call(self, operation, image_src=None, image_dst=None, data=None,
+             extension=None, **params):
+        """call 処理を1件要求する
+
+        Args:
+            operation (str): 処理の名前(例: "compress")
+            image_src (str, optional): 入力の画像ファイル(サーバーから見たパス)
+            image_dst (str, optional): 出力のファイル(サーバーから見たパス)
+            data (bytes, optional): image_srcの代わりに送る画像ファイルの中身
+            extension (str, optional): image_dstの代わりに出力をバイト列で受け取る場合の拡張子
+            **params: 処理の関数に渡す引数(例: shrink=2, quality=80)
+
+        Returns:
+            dict: 応答(出力をバイト列で受け取る場合は"data"をbytesに戻したもの)
+        """
+        self.next_id += 1
+        request = {"id": self.next_id, "op": operation, "params": params,
+                   "src": image_src, "dst": image_dst, "extension": extension}
+        if data is not None:
+            request["data"] = base64.b64encode(data).decode("ascii")
+        response = self.request(request)
+        if "data" in response:
+            response["data"] = base64.b64decode(response["data"])
+        return response
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def print_server_stats(stats):
+    """print_server_stats サーバーの統計(件数と処理ごとの処理時間のパーセンタイル)を表示する"""
+    print("requests: {}, busy: {}, errors: {}, in flight: {}".format(
+        stats["requests"], stats["busy"], stats["errors"],
+        stats["in_flight"]))
+    print("{:10s}{:>8s}{:>10s}{:>10s}{:>10s}{:>14s}".format(
+        "operation", "count", "p50[ms]", "p90[ms]", "p99[ms]",
+        "service p50"))
+    for operation, row in sorted(stats["operations"].items()):
+        print("{:10s}{:8d}{:10.2f}{:10.2f}{:10.2f}{:14.2f}".format(
+            operation, row["count"], row["p50"], row["p90"], row["p99"],
+            row["service_p50"]))
+
+
+def _terminate(signum, frame):
+    """_terminate SIGTERMでもCtrl-Cと同じように終了処理を行う"""
+    raise KeyboardInterrupt
+
+
+# ----------------------------------------------------------------------
+# サーバーを起動する("--stats"の場合は動いているサーバーの統計を表示する)
+# ----------------------------------------------------------------------
+def main(args=None, prog=None):
+    """main コマンドラインからサーバーを起動する(image-tools serve)"""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="serve image operations over a Unix socket")
+    parser.add_argument("socket_path")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--queue", type=int, default=None,
+                        help="requests allowed to wait before answering "
+                             "busy (default: 2 x jobs)")
+    parser.add_argument("--trace", default=None,
+                        help="append per-stage timings to this JSON-lines "
+                             "file")
+    parser.add_argument("--stats", action="store_true",
+                        help="print the stats of a running server and exit")
+    args = parser.parse_args(args)
+    if args.stats is True:
+        with ServerClient(args.socket_path, timeout=10) as client:
+            print_server_stats(client.request({"op": "stats"})["value"])
+        return 0
+    signal.signal(signal.SIGTERM, _terminate)
+    stats = serve(args.socket_path, args.jobs, args.queue, args.trace)
+    print_server_stats(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())